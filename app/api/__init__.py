@@ -2,7 +2,7 @@
 from fastapi import APIRouter
 
 # Import routes
-from app.api.routes import youtube, pdf
+from app.api.routes import youtube, pdf, metrics
 
 router = APIRouter()
 
@@ -10,4 +10,5 @@ router = APIRouter()
 
 # Include routes
 router.include_router(youtube.router)
-router.include_router(pdf.router)
\ No newline at end of file
+router.include_router(pdf.router)
+router.include_router(metrics.router)
\ No newline at end of file
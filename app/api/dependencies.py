@@ -0,0 +1,18 @@
+# app/api/dependencies.py
+from fastapi import Request
+from app.services.container import ServiceContainer
+from app.services.youtube import YouTubeService
+from app.services.pdf import PDFService
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """The service container created by the application lifespan."""
+    return request.app.state.services
+
+
+def get_youtube_service(request: Request) -> YouTubeService:
+    return get_services(request).youtube_service
+
+
+def get_pdf_service(request: Request) -> PDFService:
+    return get_services(request).pdf_service
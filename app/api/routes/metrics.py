@@ -0,0 +1,25 @@
+# app/api/routes/metrics.py
+from fastapi import APIRouter, Query
+from typing import Dict, List, Optional
+from app.utils.metrics import metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/")
+async def get_metrics(
+    name: Optional[str] = Query(None, description="Only return metrics whose name starts with this prefix")
+) -> Dict[str, List[Dict]]:
+    """
+    Return in-process counters and percentile histograms.
+    
+    Model calls are labelled by operation (chunk_cleanup, simple, toc, json)
+    and model; histograms report count, mean, max and p50/p90/p95/p99 over
+    the most recent samples.
+    """
+    snapshot = metrics.snapshot()
+    if name:
+        snapshot = {
+            kind: [entry for entry in entries if entry["name"].startswith(name)]
+            for kind, entries in snapshot.items()
+        }
+    return snapshot
@@ -1,5 +1,6 @@
 # app/api/routes/pdf.py
-from fastapi import APIRouter, File, UploadFile, BackgroundTasks, HTTPException
+from fastapi import APIRouter, File, UploadFile, BackgroundTasks, Depends, HTTPException
+from app.api.dependencies import get_pdf_service
 from app.models.pdf import PDFMetadata, ProcessingResponse, ProcessingStatus
 from app.services.pdf import PDFService, ProcessingJob
 from app.core.settings import settings
@@ -10,8 +11,6 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/pdf", tags=["pdf"])
 
-pdf_service = PDFService()
-
 @router.post("/upload/", response_model=ProcessingResponse)
 async def upload_pdf(file: UploadFile = File(...)):
     if not file.filename.endswith('.pdf'):
@@ -34,15 +33,19 @@ async def upload_pdf(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/metadata/{filename}", response_model=PDFMetadata)
-async def get_metadata(filename: str):
+async def get_metadata(filename: str, pdf_service: PDFService = Depends(get_pdf_service)):
     file_path = os.path.join(settings.UPLOAD_DIR, filename)
     metadata = pdf_service.get_pdf_metadata(file_path)
     return PDFMetadata(**metadata)
 
 @router.post("/process/{filename}", response_model=ProcessingResponse)
-async def process_pdf(filename: str, background_tasks: BackgroundTasks):
+async def process_pdf(
+    filename: str,
+    background_tasks: BackgroundTasks,
+    pdf_service: PDFService = Depends(get_pdf_service)
+):
     job_id = f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
-    job = ProcessingJob(job_id, filename)
+    job = ProcessingJob(job_id, filename, pdf_service)
     
     async def process_wrapper():
         await job.process()
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from app.api.dependencies import get_youtube_service
 from app.services.youtube import (
     YouTubeService,
     YouTubeProcessingJob,
@@ -8,7 +9,10 @@ from app.services.youtube import (
 from app.models.youtube import (
     YouTubeProcessingResponse,
     YouTubeProcessingStatus,
-    YouTubeResult
+    YouTubePartialResult,
+    YouTubeResult,
+    YouTubeBatchRequest,
+    YouTubeBatchResponse
 )
 from datetime import datetime
 import logging
@@ -17,8 +21,6 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/youtube", tags=["youtube"])
 
-youtube_service = YouTubeService()
-
 @router.post("/process/{video_id}")
 async def process_youtube_video(
     video_id: str,
@@ -30,7 +32,8 @@ async def process_youtube_video(
     chapter_source: ChapterSource = Query(
         ChapterSource.AUTO,
         description="Source for chapters: auto (generated) or description (from video description)"
-    )
+    ),
+    youtube_service: YouTubeService = Depends(get_youtube_service)
 ):
     """
     Start processing a YouTube video with specified mode and chapter source.
@@ -41,7 +44,13 @@ async def process_youtube_video(
         chapter_source: Source for chapters (auto or description)
     """
     job_id = f"yt_job_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{video_id}"
-    job = YouTubeProcessingJob(job_id, video_id, mode, chapter_source)
+    job = YouTubeProcessingJob(
+        job_id,
+        video_id,
+        mode,
+        chapter_source,
+        youtube_service=youtube_service
+    )
     
     background_tasks.add_task(job.process)
     
@@ -53,6 +62,48 @@ async def process_youtube_video(
         chapter_source=chapter_source
     )
 
+@router.post("/batch", response_model=YouTubeBatchResponse)
+async def process_youtube_batch(
+    request: YouTubeBatchRequest,
+    background_tasks: BackgroundTasks,
+    youtube_service: YouTubeService = Depends(get_youtube_service)
+):
+    """
+    Submit one or many videos for offline batch processing.
+    
+    All transcript chunks go into a single batch; one job per video collects
+    its results once the batch completes.
+    """
+    try:
+        batch_id = await youtube_service.submit_batch(request.video_ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to submit batch: {str(e)}"
+        )
+
+    jobs = []
+    for video_id in request.video_ids:
+        job_id = f"yt_job_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{video_id}"
+        job = YouTubeProcessingJob(
+            job_id,
+            video_id,
+            ProcessingMode.BATCH,
+            request.chapter_source,
+            batch_id,
+            youtube_service=youtube_service
+        )
+        background_tasks.add_task(job.process)
+        jobs.append(YouTubeProcessingResponse(
+            job_id=job_id,
+            video_id=video_id,
+            status="processing"
+        ))
+
+    return YouTubeBatchResponse(batch_id=batch_id, jobs=jobs)
+
 @router.get("/status/{job_id}", response_model=YouTubeProcessingStatus)
 async def get_processing_status(job_id: str):
     """Get the status of a processing job."""
@@ -74,6 +125,24 @@ async def get_processing_status(job_id: str):
             detail=f"Job not found: {str(e)}"
         )
 
+@router.get("/partial/{job_id}", response_model=YouTubePartialResult)
+async def get_partial_result(job_id: str):
+    """Get the paragraphs a job has finished so far, in transcript order."""
+    try:
+        job = YouTubeProcessingJob.load(job_id)
+        return YouTubePartialResult(
+            job_id=job_id,
+            video_id=job.video_id,
+            status=job.status,
+            progress=job.progress,
+            paragraphs=job.get_partial_paragraphs()
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job not found: {str(e)}"
+        )
+
 @router.get("/latest-status")
 async def get_latest_status(video_id: str):
     """Get the latest processing status for a video."""
@@ -105,10 +174,13 @@ async def get_latest_status(video_id: str):
         )
 
 @router.get("/result/{video_id}", response_model=YouTubeResult)
-async def get_video_result(video_id: str):
+async def get_video_result(
+    video_id: str,
+    youtube_service: YouTubeService = Depends(get_youtube_service)
+):
     """Get the processed result for a video."""
     try:
-        result = await YouTubeProcessingJob.get_completed_result(video_id)
+        result = await YouTubeProcessingJob.get_completed_result(video_id, youtube_service)
         return result
     except HTTPException:
         raise
@@ -119,7 +191,10 @@ async def get_video_result(video_id: str):
         )
 
 @router.get("/chapters/{video_id}")
-async def get_video_chapters(video_id: str):
+async def get_video_chapters(
+    video_id: str,
+    youtube_service: YouTubeService = Depends(get_youtube_service)
+):
     """Get chapters from video description if available."""
     try:
         chapters = await youtube_service.chapters_service.get_video_chapters(video_id)
@@ -8,4 +8,5 @@ class ChapterSource(str, Enum):
 class ProcessingMode(str, Enum):
     SIMPLE = "simple"
     DETAILED = "detailed"
-    DETAILED_WITH_SCREENSHOTS = "detailed_with_screenshots"
\ No newline at end of file
+    DETAILED_WITH_SCREENSHOTS = "detailed_with_screenshots"
+    BATCH = "batch"  # Detailed output via offline batch submission
\ No newline at end of file
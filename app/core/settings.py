@@ -39,11 +39,40 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     OUTPUT_DIR: str = "processed"
     SCREENSHOTS_DIR: str = "screenshots"
+    BATCH_DIR: str = "batches"
     
     # OpenAI settings
     MODEL: str = "gpt-4o-mini"
     MAX_TOKENS: int = 4000
     TEMPERATURE: float = 0.7
+    LLM_BACKEND: str = "openai"  # "openai", "local" (CPU inference) or "mock" (stand-in for load tests)
+    OPENAI_RPM_LIMIT: int = 500  # Requests per minute shared by all jobs
+    OPENAI_TPM_LIMIT: int = 200000  # Tokens per minute shared by all jobs
+    CASCADE_MODELS: List[str] = []  # e.g. ["gpt-4o-mini", "gpt-4o"]; chunk cleanup escalates in order
+    CASCADE_MIN_CONTENT_RATIO: float = 0.5  # Output/input words below this escalates
+    CASCADE_MAX_CONTENT_RATIO: float = 1.5
+    CASCADE_MAX_PARAGRAPH_WORDS: int = 400
+    
+    # Local LLM backend settings
+    LOCAL_LLM_MODEL: str = "Qwen/Qwen2.5-0.5B-Instruct"
+    LOCAL_LLM_WORKERS: int = 2  # Worker processes, each holding a copy of the model
+    LOCAL_LLM_THREADS_PER_WORKER: int = 2
+    LOCAL_LLM_BATCH_SIZE: int = 4  # Requests generated together in one batch
+    LOCAL_LLM_BATCH_WAIT: float = 0.05  # Seconds to wait for a batch to fill
+    
+    # Shared HTTP connection pool (kept alive across jobs)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP_TIMEOUT: float = 120.0
+    
+    # Mock LLM backend settings
+    MOCK_LLM_LATENCY_MEDIAN: float = 1.0  # Median seconds to first token
+    MOCK_LLM_LATENCY_SIGMA: float = 0.5  # Log-normal spread of first-token latency
+    MOCK_LLM_TOKENS_PER_SECOND: float = 150.0
+    MOCK_LLM_ERROR_RATE: float = 0.0  # Fraction of requests failing with 500
+    MOCK_LLM_RATE_LIMIT_RATE: float = 0.0  # Fraction of requests failing with 429
     
     # Token prices (per 1M tokens)
     TOKEN_PRICES: Dict[str, Dict[str, float]] = {
@@ -63,9 +92,40 @@ class Settings(BaseSettings):
     
     # Processing settings
     MAX_CHARS: int = 100000
-    CHUNK_SIZE: int = 1000
+    CHUNK_SIZE: int = 1000  # Legacy character-based chunk size
+    CHUNK_TOKEN_BUDGET: int = 2000  # Input tokens packed into each model request
+    OUTPUT_TOKEN_RATIO: float = 1.25  # max_tokens per input token for cleanup requests
+    OUTPUT_TOKEN_MARGIN: int = 64
+    MAX_CONCURRENT_CHUNKS: int = 5  # Chunk requests in flight per transcript
+    PARTIAL_SAVE_INTERVAL: float = 1.0  # Min seconds between job saves for streamed paragraphs
+    HEDGE_ENABLED: bool = False  # Duplicate slow chunk requests, first response wins
+    HEDGE_PERCENTILE: float = 95  # Observed latency percentile after which a request is hedged
+    HEDGE_MIN_SAMPLES: int = 20  # Calls to observe before hedging starts
+    HEDGE_TOKEN_BUDGET: int = 20000  # Extra tokens hedging may spend per job
     DEFAULT_SCREENSHOT_INTERVAL: int = 60
     MAX_SCREENSHOTS_PER_VIDEO: int = 50
+    SCREENSHOT_SELECTION: str = "interval"  # "interval" (every DEFAULT_SCREENSHOT_INTERVAL) or "scene"
+    SCENE_SAMPLE_FPS: float = 1.0  # Frames per second scanned for scene changes
+    SCENE_CHANGE_THRESHOLD: float = 0.2  # Min difference score (0-1) counted as a scene change
+    SCENE_MIN_GAP_SECONDS: float = 3.0  # Min time between scene change screenshots
+    SCENE_KEYFRAME_MAX_GAP_SECONDS: float = 2.5  # Scan only keyframes when they are this close together (0 disables)
+    SCREENSHOT_DEDUP_ENABLED: bool = True  # Drop screenshots that look like an earlier one
+    SCREENSHOT_DEDUP_THRESHOLD: int = 6  # Max differing bits (of 64) between duplicate hashes
+    VIDEO_DOWNLOAD_MODE: str = "full"  # "full" or "segments" (only a few seconds around each screenshot)
+    SEGMENT_DOWNLOAD_SECONDS: float = 2.0  # Length of each section fetched in segments mode
+    FRAME_EXTRACT_WORKERS: int = 2  # Processes decoding video frames
+    FRAME_SNAP_TOLERANCE: float = 2.0  # Max seconds a screenshot may move to land on a keyframe (0 disables)
+    FRAME_SEEK_GAP_SECONDS: float = 1.0  # Without keyframe info, gaps longer than this are seeked over instead of decoded
+    
+    # Table of contents settings
+    TOC_DIRECT_TOKEN_LIMIT: int = 12000  # Above this, TOC is generated map-reduce style
+    TOC_WINDOW_TOKENS: int = 6000  # Max input tokens per TOC request
+    TOC_MAX_OUTPUT_TOKENS: int = 1000
+    
+    # Batch processing settings
+    BATCH_BACKEND: str = "openai"  # "openai" or "local" (file-based stand-in)
+    BATCH_POLL_INTERVAL: int = 60
+    BATCH_PRICE_FACTOR: float = 0.5  # Batch API discount on token prices
     
     # Available modes and sources
     PROCESSING_MODES: List[str] = [mode.value for mode in ProcessingMode]
@@ -75,10 +135,32 @@ class Settings(BaseSettings):
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 1
     RETRY_BACKOFF: float = 1.5
+    RETRY_MAX_DELAY: float = 30.0
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive failures before failing fast
+    CIRCUIT_BREAKER_RESET_SECONDS: float = 30.0
     
     # Cache settings
     CACHE_RETENTION_DAYS: int = 7
     MAX_CACHE_SIZE_MB: int = 1000
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_SIZE_MB: int = 200  # LRU-evicted store of model responses
+    
+    # Transcript fetching (blocking HTTP calls run on a bounded thread pool)
+    TRANSCRIPT_FETCH_WORKERS: int = 8
+    TRANSCRIPT_FETCH_TIMEOUT: float = 30.0
+    TRANSCRIPT_CACHE_ENABLED: bool = True
+    TRANSCRIPT_CACHE_TTL_DAYS: float = 30
+    TRANSCRIPT_CACHE_MAX_SIZE_MB: int = 100
+    
+    # Speech-to-text for videos without captions
+    TRANSCRIPTION_ENGINE: str = "auto"  # "replicate", "local" or "auto" (Replicate, local Whisper as fallback)
+    WHISPER_MODEL_SIZE: str = "base"  # tiny, base, small, medium, large-v3
+    WHISPER_WORKERS: int = 1  # Worker processes, each holding a copy of the model
+    WHISPER_THREADS: int = 4  # Torch threads per worker
+    WHISPER_BATCH_SIZE: int = 8  # 30 second windows decoded together
+    TRANSCRIPTION_SEGMENT_MINUTES: float = 10  # Long audio is split into segments of about this length
+    TRANSCRIPTION_SPLIT_SEARCH_SECONDS: float = 30  # Window around each target cut searched for silence
+    TRANSCRIPTION_SEGMENT_CONCURRENCY: int = 4  # Segments transcribed at once
     
     # Download settings
     MAX_VIDEO_LENGTH_MINUTES: int = 180
@@ -95,6 +177,11 @@ class Settings(BaseSettings):
     LOG_FILE_MAX_BYTES: int = 1024 * 1024
     LOG_FILE_BACKUP_COUNT: int = 5
     
+    # Telemetry
+    METRICS_MAX_SAMPLES: int = 2000  # Recent samples kept per histogram for percentiles
+    LOOP_LAG_INTERVAL: float = 0.5  # Seconds between event loop lag samples
+    LOOP_LAG_WARN_SECONDS: float = 0.25
+    
     # API Rate Limiting
     RATE_LIMIT_CALLS: int = 100
     RATE_LIMIT_PERIOD: int = 3600  # 1 hour in seconds
@@ -166,7 +253,8 @@ class Settings(BaseSettings):
             self.DOWNLOAD_DIR,
             self.UPLOAD_DIR,
             self.OUTPUT_DIR,
-            self.SCREENSHOTS_DIR
+            self.SCREENSHOTS_DIR,
+            self.BATCH_DIR
         ]
 
     def get_cors_origins(self) -> List[str]:
@@ -187,7 +275,7 @@ class Settings(BaseSettings):
 
     def validate(self):
         """Validate settings and environment."""
-        if not self.has_openai_key:
+        if not self.has_openai_key and self.LLM_BACKEND == "openai":
             raise ValueError("OpenAI API key is required")
         
         if not self.has_replicate_token and "replicate" in self.MODEL.lower():
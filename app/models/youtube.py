@@ -2,6 +2,7 @@
 from typing import List, Dict, Optional
 from pydantic import BaseModel, field_validator, ConfigDict
 from app.models.base import BaseProcessingResponse, BaseProcessingStatus
+from app.core.enums import ChapterSource
 
 
 
@@ -63,10 +64,32 @@ class Chapter(BaseModel):
             raise ValueError("Time values cannot be negative")
         return v
 
+class ModelRouteStats(BaseModel):
+    requests: int = 0
+    accepted: int = 0
+    escalated: int = 0
+    failed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    price: float = 0.0
+    total_seconds: float = 0.0
+
+    model_config = ConfigDict(strict=True)
+
 class ProcessingStats(BaseModel):
     total_input_tokens: int
     total_output_tokens: int
     total_price: float
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_saved_tokens: int = 0
+    cache_saved_seconds: float = 0.0
+    hedged_requests: int = 0
+    hedge_wins: int = 0
+    hedge_tokens: int = 0
+    model_routes: Dict[str, ModelRouteStats] = {}
+    screenshots_removed: int = 0
+    screenshot_bytes_saved: int = 0
     
     model_config = ConfigDict(strict=True)
 
@@ -141,4 +164,31 @@ class YouTubeProcessingStatus(BaseProcessingStatus):
         d = super().model_dump(*args, **kwargs)
         if d['result'] and 'stats' in d['result']:
             d['result']['stats']['total_price'] = float(d['result']['stats']['total_price'])
-        return d
\ No newline at end of file
+        return d
+
+class PartialParagraph(BaseModel):
+    paragraph_text: str
+    start_time: float
+
+class YouTubePartialResult(BaseModel):
+    job_id: str
+    video_id: str
+    status: str
+    progress: float
+    paragraphs: List[PartialParagraph]
+
+class YouTubeBatchRequest(BaseModel):
+    video_ids: List[str]
+    chapter_source: ChapterSource = ChapterSource.AUTO
+
+    @field_validator('video_ids')
+    @classmethod
+    def validate_video_ids(cls, v: List[str]) -> List[str]:
+        v = [video_id.strip() for video_id in v if video_id.strip()]
+        if not v:
+            raise ValueError("video_ids cannot be empty")
+        return list(dict.fromkeys(v))
+
+class YouTubeBatchResponse(BaseModel):
+    batch_id: str
+    jobs: List[YouTubeProcessingResponse]
@@ -0,0 +1,125 @@
+# app/services/audio_segments.py
+import os
+import logging
+import subprocess
+from typing import Iterator, List, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+def decode_pcm(path: str, block_samples: int, sample_rate: int = SAMPLE_RATE) -> Iterator[np.ndarray]:
+    """Decode audio with ffmpeg and yield mono float32 samples ``block_samples`` at a time.
+
+    Only one block is held in memory, however long the audio is.
+    """
+    decoder = subprocess.Popen(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-i", path,
+            "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"
+        ],
+        stdout=subprocess.PIPE
+    )
+    try:
+        while True:
+            raw = decoder.stdout.read(block_samples * 2)  # 16-bit samples
+            if not raw:
+                break
+            raw = raw[:len(raw) - len(raw) % 2]
+            yield np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    finally:
+        decoder.stdout.close()
+        if decoder.wait() != 0:
+            raise RuntimeError(f"ffmpeg could not decode {path}")
+
+
+def frame_rms(samples: np.ndarray, frame_size: int) -> np.ndarray:
+    """Root mean square energy of consecutive frames (a trailing partial frame is dropped)."""
+    frames = samples[:len(samples) - len(samples) % frame_size].reshape(-1, frame_size)
+    return np.sqrt(np.mean(np.square(frames), axis=1))
+
+
+def rms_envelope(path: str, frame_seconds: float = 0.1, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Energy of every ``frame_seconds`` of the audio at ``path``."""
+    frame_size = int(frame_seconds * sample_rate)
+    # Blocks are a whole number of frames so frames never straddle blocks
+    block_samples = frame_size * 600
+    return np.concatenate(
+        [frame_rms(block, frame_size) for block in decode_pcm(path, block_samples, sample_rate)]
+        or [np.zeros(0, dtype=np.float32)]
+    )
+
+
+def find_split_points(
+    envelope: np.ndarray,
+    frame_seconds: float,
+    segment_seconds: float,
+    search_seconds: float,
+    smooth_seconds: float = 0.5
+) -> List[float]:
+    """Pick cut times (in seconds) roughly every ``segment_seconds`` at the quietest moment.
+
+    Each cut is placed at the minimum of the smoothed energy within
+    ``search_seconds`` of its target, so segments break in pauses rather than
+    mid-word. No cut is made that would leave a final segment shorter than
+    half a segment.
+    """
+    total_seconds = len(envelope) * frame_seconds
+    if total_seconds < segment_seconds * 1.5:
+        return []
+    # Cuts past this frame would leave a final segment shorter than half a segment
+    last_allowed = int((total_seconds - segment_seconds / 2) / frame_seconds)
+    smooth_frames = max(1, int(smooth_seconds / frame_seconds))
+    smoothed = np.convolve(envelope, np.ones(smooth_frames) / smooth_frames, mode="same")
+
+    points = []
+    last_frame = 0
+    target = segment_seconds
+    while target < total_seconds - segment_seconds / 2:
+        low = max(int((target - search_seconds) / frame_seconds), last_frame + 1)
+        high = min(int((target + search_seconds) / frame_seconds), last_allowed + 1)
+        if low >= high:
+            break
+        last_frame = low + int(np.argmin(smoothed[low:high]))
+        points.append(last_frame * frame_seconds)
+        target = points[-1] + segment_seconds
+    return points
+
+
+def cut_segment(path: str, start: float, duration: float, output_path: str):
+    """Re-encode ``[start, start + duration)`` of ``path`` as 16 kHz mono FLAC (``duration`` <= 0 means to the end)."""
+    command = ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", "-ss", f"{start:.3f}", "-i", path]
+    if duration > 0:
+        command += ["-t", f"{duration:.3f}"]
+    command += ["-ac", "1", "-ar", str(SAMPLE_RATE), "-c:a", "flac", output_path]
+    subprocess.run(command, check=True)
+
+
+def split_audio(
+    path: str,
+    output_dir: str,
+    segment_seconds: float,
+    search_seconds: float
+) -> List[Tuple[float, str]]:
+    """Split audio at low-energy points into roughly ``segment_seconds`` long files.
+
+    Returns ``(offset_seconds, segment_path)`` pairs in order. Audio too short
+    to split is returned as the single pair ``(0.0, path)``.
+    """
+    frame_seconds = 0.1
+    points = find_split_points(rms_envelope(path, frame_seconds), frame_seconds, segment_seconds, search_seconds)
+    if not points:
+        return [(0.0, path)]
+
+    boundaries = [0.0] + points
+    segments = []
+    for i, start in enumerate(boundaries):
+        duration = boundaries[i + 1] - start if i + 1 < len(boundaries) else 0
+        segment_path = os.path.join(output_dir, f"segment_{i:03d}.flac")
+        cut_segment(path, start, duration, segment_path)
+        segments.append((start, segment_path))
+
+    logger.info(f"Split audio into {len(segments)} segments at {[round(p, 1) for p in points]}")
+    return segments
@@ -0,0 +1,265 @@
+# app/services/batch.py
+import os
+import json
+import time
+import shutil
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+from app.core.settings import settings
+from app.services.openai import OpenAIService
+from app.services.chunking import chunk_transcript, count_tokens
+
+logger = logging.getLogger(__name__)
+
+FINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def parse_batch_output(content: str) -> Dict[str, Optional[Dict]]:
+    """Parse a batch output JSONL into ``custom_id -> response body`` (None on error)."""
+    results = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response")
+        if record.get("error") or not response or response.get("status_code") != 200:
+            logger.warning(f"Batch request {record.get('custom_id')} failed: {record.get('error')}")
+            results[record["custom_id"]] = None
+        else:
+            results[record["custom_id"]] = response["body"]
+    return results
+
+
+class BatchBackend(ABC):
+    """Interface for services that run a JSONL file of chat completion requests offline."""
+
+    @abstractmethod
+    async def submit(self, input_path: str) -> str:
+        """Submit a batch input file and return the batch id."""
+
+    @abstractmethod
+    async def get_status(self, batch_id: str) -> str:
+        """Return the batch status, e.g. ``in_progress`` or ``completed``."""
+
+    @abstractmethod
+    async def get_results(self, batch_id: str) -> Dict[str, Optional[Dict]]:
+        """Return completion bodies keyed by request ``custom_id``."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Runs batches through the OpenAI Batch API."""
+
+    def __init__(self, client: AsyncOpenAI):
+        self.client = client
+
+    async def submit(self, input_path: str) -> str:
+        with open(input_path, "rb") as f:
+            batch_file = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    async def get_status(self, batch_id: str) -> str:
+        batch = await self.client.batches.retrieve(batch_id)
+        return batch.status
+
+    async def get_results(self, batch_id: str) -> Dict[str, Optional[Dict]]:
+        batch = await self.client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            return {}
+        content = await self.client.files.content(batch.output_file_id)
+        return parse_batch_output(content.text)
+
+
+class LocalBatchBackend(BatchBackend):
+    """File-based stand-in for the Batch API.
+
+    Batches complete on the first status poll; every request is answered by
+    echoing its user message, with token usage counted locally. File work
+    runs in a thread so polling never blocks the event loop.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(settings.BATCH_DIR, "local")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, batch_id: str, name: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}_{name}")
+
+    async def submit(self, input_path: str) -> str:
+        batch_id = f"local_batch_{uuid4().hex[:12]}"
+        await asyncio.to_thread(self._submit, batch_id, input_path)
+        return batch_id
+
+    def _submit(self, batch_id: str, input_path: str):
+        shutil.copyfile(input_path, self._path(batch_id, "input.jsonl"))
+        with open(self._path(batch_id, "status"), "w") as f:
+            f.write("in_progress")
+
+    async def get_status(self, batch_id: str) -> str:
+        return await asyncio.to_thread(self._get_status, batch_id)
+
+    def _get_status(self, batch_id: str) -> str:
+        status_path = self._path(batch_id, "status")
+        if not os.path.exists(status_path):
+            raise ValueError(f"Unknown local batch {batch_id}")
+
+        with open(status_path) as f:
+            status = f.read().strip()
+
+        if status == "in_progress":
+            self._run(batch_id)
+            status = "completed"
+            with open(status_path, "w") as f:
+                f.write(status)
+        return status
+
+    def _run(self, batch_id: str):
+        """Answer every request in the batch and write the output file."""
+        with open(self._path(batch_id, "input.jsonl")) as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+
+        with open(self._path(batch_id, "output.jsonl"), "w") as f:
+            for i, request in enumerate(requests):
+                body = request["body"]
+                content = body["messages"][-1]["content"]
+                prompt_tokens = sum(count_tokens(m["content"]) for m in body["messages"])
+                completion_tokens = count_tokens(content)
+                f.write(json.dumps({
+                    "id": f"batch_req_{i}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "id": f"chatcmpl-{batch_id}-{i}",
+                            "object": "chat.completion",
+                            "created": int(time.time()),
+                            "model": body["model"],
+                            "choices": [{
+                                "index": 0,
+                                "finish_reason": "stop",
+                                "message": {"role": "assistant", "content": content}
+                            }],
+                            "usage": {
+                                "prompt_tokens": prompt_tokens,
+                                "completion_tokens": completion_tokens,
+                                "total_tokens": prompt_tokens + completion_tokens
+                            }
+                        }
+                    },
+                    "error": None
+                }) + "\n")
+
+    async def get_results(self, batch_id: str) -> Dict[str, Optional[Dict]]:
+        return await asyncio.to_thread(self._get_results, batch_id)
+
+    def _get_results(self, batch_id: str) -> Dict[str, Optional[Dict]]:
+        output_path = self._path(batch_id, "output.jsonl")
+        if not os.path.exists(output_path):
+            return {}
+        with open(output_path) as f:
+            return parse_batch_output(f.read())
+
+
+class BatchService:
+    """Submits transcript chunk requests as offline batches and collects the results."""
+
+    def __init__(self, openai_service: OpenAIService, backend: Optional[BatchBackend] = None):
+        self.openai_service = openai_service
+        self.backend = backend or self._default_backend()
+        os.makedirs(settings.BATCH_DIR, exist_ok=True)
+
+    def _default_backend(self) -> BatchBackend:
+        if settings.BATCH_BACKEND == "local" or self.openai_service.client is None:
+            return LocalBatchBackend()
+        return OpenAIBatchBackend(self.openai_service.client)
+
+    @staticmethod
+    def _manifest_path(batch_id: str) -> str:
+        return os.path.join(settings.BATCH_DIR, f"{batch_id}_manifest.json")
+
+    async def submit_transcripts(self, transcripts: Dict[str, List[Dict]]) -> str:
+        """Write one JSONL request file for all videos' chunks and submit it.
+
+        A manifest with each video's chunk start times is stored next to the
+        batch so results can be reassembled by any job, even after a restart.
+        """
+        input_path = os.path.join(
+            settings.BATCH_DIR,
+            f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:8]}.jsonl"
+        )
+        # Tokenizing and writing every chunk is blocking work
+        manifest = await asyncio.to_thread(self._write_requests, input_path, transcripts)
+
+        batch_id = await self.backend.submit(input_path)
+        await asyncio.to_thread(self._write_manifest, batch_id, manifest)
+
+        total_requests = sum(len(chunks) for chunks in manifest.values())
+        logger.info(f"Submitted batch {batch_id} with {total_requests} requests for {len(manifest)} videos")
+        return batch_id
+
+    def _write_requests(self, input_path: str, transcripts: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Write the JSONL request file and return each video's chunk start times."""
+        manifest = {}
+        with open(input_path, "w", encoding="utf-8") as f:
+            for video_id, transcript in transcripts.items():
+                text_chunks = chunk_transcript(transcript)
+                manifest[video_id] = [{"start_time": chunk["start_time"]} for chunk in text_chunks]
+                for i, chunk in enumerate(text_chunks):
+                    f.write(json.dumps({
+                        "custom_id": f"{video_id}:{i}",
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": self.openai_service.build_chunk_request(chunk)
+                    }, ensure_ascii=False) + "\n")
+        return manifest
+
+    def _write_manifest(self, batch_id: str, manifest: Dict[str, List[Dict]]):
+        with open(self._manifest_path(batch_id), "w") as f:
+            json.dump(manifest, f)
+
+    def _read_manifest(self, batch_id: str) -> Dict[str, List[Dict]]:
+        with open(self._manifest_path(batch_id)) as f:
+            return json.load(f)
+
+    async def wait_for_completion(self, batch_id: str):
+        """Poll the backend until the batch reaches a final status."""
+        while True:
+            status = await self.backend.get_status(batch_id)
+            if status == "completed":
+                return
+            if status in FINAL_BATCH_STATUSES:
+                raise ValueError(f"Batch {batch_id} ended with status {status}")
+            logger.debug(f"Batch {batch_id} status: {status}")
+            await asyncio.sleep(settings.BATCH_POLL_INTERVAL)
+
+    async def get_paragraphs(self, batch_id: str, video_id: str) -> Tuple[List[Dict], int, int, float]:
+        """Reassemble one video's paragraphs from a completed batch."""
+        manifest = await asyncio.to_thread(self._read_manifest, batch_id)
+        if video_id not in manifest:
+            raise ValueError(f"Video {video_id} is not part of batch {batch_id}")
+
+        text_chunks = manifest[video_id]
+        outputs = await self.backend.get_results(batch_id)
+
+        results = []
+        for i in range(len(text_chunks)):
+            body = outputs.get(f"{video_id}:{i}")
+            if body is None:
+                results.append(None)
+                continue
+            results.append(self.openai_service.parse_chunk_response(
+                ChatCompletion.model_validate(body),
+                price_factor=settings.BATCH_PRICE_FACTOR
+            ))
+
+        return self.openai_service.assemble_paragraphs(text_chunks, results)
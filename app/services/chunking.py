@@ -0,0 +1,119 @@
+# app/services/chunking.py
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
+from app.core.settings import settings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tokenizer is optional
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """Return the tokenizer for a model, or None if tiktoken is unavailable."""
+    if tiktoken is None:
+        logger.warning("tiktoken not installed, estimating token counts from text length")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use, which fails on offline hosts
+        logger.warning(f"Could not load tokenizer for {model}, estimating token counts from text length: {str(e)}")
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count the tokens ``text`` occupies for the given model."""
+    encoding = _get_encoding(model or settings.MODEL)
+    if encoding is None:
+        return max(1, len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def output_token_budget(input_tokens: int) -> int:
+    """Derive a tight ``max_tokens`` for a cleanup request of ``input_tokens``.
+
+    Cleaned-up text is roughly as long as its input, so reserve a fixed ratio
+    plus a small margin instead of a multiple of the character count.
+    """
+    budget = int(input_tokens * settings.OUTPUT_TOKEN_RATIO) + settings.OUTPUT_TOKEN_MARGIN
+    return min(budget, settings.MAX_TOKENS)
+
+
+def chunk_text(text: str, token_budget: Optional[int] = None) -> List[Dict]:
+    """Split text into word-bounded chunks of at most ``token_budget`` tokens.
+
+    Returns dicts with ``text`` and ``tokens`` keys.
+    """
+    token_budget = token_budget or settings.CHUNK_TOKEN_BUDGET
+    chunks = []
+    current_words: List[str] = []
+    current_tokens = 0
+
+    for word in text.split():
+        # Leading space matches how the word is tokenized mid-sentence
+        word_tokens = count_tokens(" " + word)
+        if current_words and current_tokens + word_tokens > token_budget:
+            chunks.append({"text": " ".join(current_words), "tokens": current_tokens})
+            current_words = []
+            current_tokens = 0
+        current_words.append(word)
+        current_tokens += word_tokens
+
+    if current_words:
+        chunks.append({"text": " ".join(current_words), "tokens": current_tokens})
+
+    return chunks
+
+
+def chunk_transcript(transcript: List[Dict], token_budget: Optional[int] = None) -> List[Dict]:
+    """Pack transcript segments into chunks of at most ``token_budget`` tokens.
+
+    Returns dicts with ``text``, ``start_time`` and ``tokens`` keys, where
+    ``start_time`` is the start of the first segment in the chunk. Segments
+    larger than the budget on their own are split on word boundaries.
+    """
+    token_budget = token_budget or settings.CHUNK_TOKEN_BUDGET
+    chunks = []
+    current_chunk = None
+
+    for segment in transcript:
+        text = segment["text"].strip()
+        if not text:
+            continue
+
+        start_time = float(segment["start"])
+        segment_tokens = count_tokens(" " + text)
+
+        if segment_tokens > token_budget:
+            if current_chunk:
+                chunks.append(current_chunk)
+                current_chunk = None
+            for piece in chunk_text(text, token_budget):
+                chunks.append({**piece, "start_time": start_time})
+            continue
+
+        if current_chunk and current_chunk["tokens"] + segment_tokens > token_budget:
+            chunks.append(current_chunk)
+            current_chunk = None
+
+        if current_chunk is None:
+            current_chunk = {"text": text, "start_time": start_time, "tokens": segment_tokens}
+        else:
+            current_chunk["text"] += " " + text
+            current_chunk["tokens"] += segment_tokens
+
+    if current_chunk:
+        chunks.append(current_chunk)
+
+    return chunks
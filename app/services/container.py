@@ -0,0 +1,58 @@
+# app/services/container.py
+import logging
+from typing import Optional
+import httpx
+from app.core.settings import settings
+from app.services.llm_backends import OpenAIBackend, build_openai_client, get_llm_backend, set_llm_backend
+from app.services.openai import OpenAIService
+from app.services.youtube import YouTubeService
+from app.services.pdf import PDFService
+from app.utils.metrics import EventLoopLagMonitor
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Process-wide service singletons sharing one keep-alive HTTP connection pool.
+
+    Created and closed by the application lifespan; routes receive the
+    services through the dependencies in ``app.api.dependencies`` and pass
+    them on to the jobs they start.
+    """
+
+    def __init__(self):
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.openai_service: Optional[OpenAIService] = None
+        self.youtube_service: Optional[YouTubeService] = None
+        self.pdf_service: Optional[PDFService] = None
+        self.loop_monitor = EventLoopLagMonitor()
+
+    async def start(self):
+        """Create the connection pool and the services that use it."""
+        if settings.LLM_BACKEND == "openai":
+            self.http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+            )
+            set_llm_backend(OpenAIBackend(build_openai_client(self.http_client)))
+
+        self.openai_service = OpenAIService()
+        self.youtube_service = YouTubeService(openai_service=self.openai_service)
+        self.pdf_service = PDFService(openai_service=self.openai_service)
+        self.loop_monitor.start()
+        logger.info(f"Services started with {get_llm_backend().name} LLM backend")
+
+    async def close(self):
+        """Release worker pools and pooled connections."""
+        await self.loop_monitor.stop()
+        if self.youtube_service:
+            self.youtube_service.close()
+        get_llm_backend().close()
+        if self.http_client:
+            await self.http_client.aclose()
+            self.http_client = None
+        logger.info("Services closed")
@@ -0,0 +1,420 @@
+# app/services/frames.py
+import os
+import asyncio
+import logging
+import subprocess
+import multiprocessing
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.core.settings import settings
+from app.services.job_stats import get_job_stats
+
+logger = logging.getLogger(__name__)
+
+# Size sampled frames are reduced to before scene change scoring
+SCENE_FRAME_SIZE = (160, 90)
+SCENE_HISTOGRAM_BINS = 32
+# Grey level change for a pixel to count as changed
+SCENE_PIXEL_DELTA = 25
+
+
+def keyframe_times(path: str) -> List[float]:
+    """Presentation times of the video keyframes, read from packet flags without decoding."""
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path
+        ],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    times = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags and pts_time not in ("", "N/A"):
+            times.append(float(pts_time))
+    return sorted(times)
+
+
+def snap_to_keyframes(timestamps: List[float], keyframes: List[float], tolerance: float) -> List[float]:
+    """Move each timestamp to the nearest keyframe within ``tolerance`` seconds."""
+    snapped = []
+    for timestamp in timestamps:
+        i = bisect_left(keyframes, timestamp)
+        nearby = [keyframes[j] for j in (i - 1, i) if 0 <= j < len(keyframes)]
+        nearest = min(nearby, key=lambda k: abs(k - timestamp), default=None)
+        if nearest is not None and abs(nearest - timestamp) <= tolerance:
+            snapped.append(nearest)
+        else:
+            snapped.append(timestamp)
+    return snapped
+
+
+def extract_frames(
+    video_path: str,
+    targets: List[Tuple[float, str]],
+    snap_tolerance: float = 0.0,
+    seek_gap_seconds: float = 1.0
+) -> List[Tuple[float, str]]:
+    """Write the frames at ``(timestamp, output_path)`` targets as JPEGs in one forward pass.
+
+    Targets are visited in time order. ``grab()`` still decodes every frame
+    it skips, while a seek decodes from the keyframe before the target, so
+    a gap is only crossed with ``grab()`` when no keyframe lies inside it;
+    otherwise the decoder seeks. Seeks are cheapest when the target has
+    been snapped to a keyframe (``snap_tolerance`` > 0). If the keyframes
+    cannot be read, gaps longer than ``seek_gap_seconds`` are seeked over.
+    Returns the targets that were written. Runs in a worker process.
+    """
+    import cv2
+
+    targets = sorted(targets)
+    try:
+        keyframes = keyframe_times(video_path)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"Could not read keyframes of {video_path}: {str(e)}")
+        keyframes = []
+    if snap_tolerance > 0 and keyframes:
+        snapped = snap_to_keyframes([t for t, _ in targets], keyframes, snap_tolerance)
+        targets = [(frame_time, path) for frame_time, (_, path) in zip(snapped, targets)]
+
+    cap = cv2.VideoCapture(video_path)
+    written = []
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video file: {video_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        keyframe_numbers = [int(round(k * fps)) for k in keyframes]
+
+        def should_seek(position: int, frame_number: int) -> bool:
+            if not keyframe_numbers:
+                return frame_number - position > seek_gap_seconds * fps
+            # Is there a keyframe in (position, frame_number]?
+            i = bisect_left(keyframe_numbers, position + 1)
+            return i < len(keyframe_numbers) and keyframe_numbers[i] <= frame_number
+
+        position = 0  # index of the next frame the decoder returns
+        last_frame = None
+        last_frame_number = -1
+        for timestamp, output_path in targets:
+            frame_number = int(round(timestamp * fps))
+            if frame_number != last_frame_number:
+                gap = frame_number - position
+                if gap > 0 and should_seek(position, frame_number):
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                else:
+                    for _ in range(max(gap, 0)):
+                        if not cap.grab():
+                            break
+                ret, frame = cap.read()
+                position = frame_number + 1
+                if not ret:
+                    logger.warning(f"Failed to capture frame at timestamp {timestamp}")
+                    continue
+                last_frame, last_frame_number = frame, frame_number
+
+            # Targets snapped onto the same frame reuse it instead of decoding again
+            cv2.imwrite(output_path, last_frame)
+            written.append((timestamp, output_path))
+    finally:
+        cap.release()
+    return written
+
+
+def extract_section_frames(sections: List[Tuple[str, str]]) -> List[str]:
+    """Write the first frame of each ``(section_path, output_path)`` video section (runs in a worker process)."""
+    written = []
+    for section_path, output_path in sections:
+        if extract_frames(section_path, [(0.0, output_path)]):
+            written.append(output_path)
+    return written
+
+
+def seek_per_frame(video_path: str, targets: List[Tuple[float, str]]) -> List[Tuple[float, str]]:
+    """Reference implementation seeking the decoder to every timestamp (used by benchmarks)."""
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    written = []
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        for timestamp, output_path in targets:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(timestamp * fps))
+            ret, frame = cap.read()
+            if ret:
+                cv2.imwrite(output_path, frame)
+                written.append((timestamp, output_path))
+    finally:
+        cap.release()
+    return written
+
+
+def scene_change_scores(frames: np.ndarray, previous: Optional[np.ndarray] = None) -> np.ndarray:
+    """Score how much each grayscale frame differs from the one before it, in ``[0, 1]``.
+
+    ``frames`` is an ``(n, height, width)`` uint8 batch and ``previous`` the
+    frame preceding it (the first frame scores 1.0 without one). The score
+    is the larger of the histogram distance, which catches cuts between
+    differently lit scenes, and the fraction of changed pixels, which
+    catches slide changes with the same overall brightness.
+    """
+    count = len(frames)
+    if previous is not None:
+        frames = np.concatenate([previous[np.newaxis], frames])
+    flat = frames.reshape(len(frames), -1)
+
+    # All histograms in one bincount by giving every frame its own range of bins
+    bins = flat // (256 // SCENE_HISTOGRAM_BINS)
+    bins = bins.astype(np.int64) + np.arange(len(frames))[:, np.newaxis] * SCENE_HISTOGRAM_BINS
+    histograms = np.bincount(bins.ravel(), minlength=len(frames) * SCENE_HISTOGRAM_BINS)
+    histograms = histograms.reshape(len(frames), SCENE_HISTOGRAM_BINS) / flat.shape[1]
+    histogram_distance = 0.5 * np.abs(np.diff(histograms, axis=0)).sum(axis=1)
+
+    pixel_delta = np.abs(np.diff(flat.astype(np.int16), axis=0))
+    changed_fraction = (pixel_delta > SCENE_PIXEL_DELTA).mean(axis=1)
+
+    scores = np.maximum(histogram_distance, changed_fraction)
+    if previous is None:
+        scores = np.concatenate([[1.0], scores])
+    return scores[-count:]
+
+
+def select_scene_changes(
+    times: np.ndarray,
+    scores: np.ndarray,
+    threshold: float,
+    min_gap: float,
+    max_count: int
+) -> List[float]:
+    """Pick the strongest changes above ``threshold``, at least ``min_gap`` seconds apart.
+
+    A fade or animated transition scores high on several consecutive
+    samples; only the strongest of them is kept.
+    """
+    selected: List[float] = []
+    for i in np.argsort(-scores, kind="stable"):
+        if scores[i] < threshold or len(selected) >= max_count:
+            break
+        if all(abs(times[i] - t) >= min_gap for t in selected):
+            selected.append(float(times[i]))
+    return sorted(selected)
+
+
+def sample_gray_frames(
+    video_path: str,
+    sample_fps: float,
+    keyframes_only: bool,
+    batch_size: int
+) -> Iterator[np.ndarray]:
+    """Decode sampled frames with ffmpeg as ``SCENE_FRAME_SIZE`` grayscale, ``batch_size`` at a time.
+
+    Yields ``(n, height, width)`` uint8 batches: one frame per keyframe with
+    ``keyframes_only`` (other frames are not decoded at all), else
+    ``sample_fps`` frames per second.
+    """
+    width, height = SCENE_FRAME_SIZE
+    frame_bytes = width * height
+    filters = [f"scale={width}:{height}:flags=area", "format=gray"]
+    if keyframes_only:
+        input_args = ["-skip_frame", "nokey"]
+    else:
+        input_args = []
+        filters.insert(0, f"fps={sample_fps}")
+    decoder = subprocess.Popen(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", *input_args, "-i", video_path, "-an", "-sn",
+            "-vf", ",".join(filters), "-fps_mode", "passthrough", "-f", "rawvideo", "pipe:1"
+        ],
+        stdout=subprocess.PIPE
+    )
+    try:
+        while True:
+            raw = decoder.stdout.read(frame_bytes * batch_size)
+            count = len(raw) // frame_bytes
+            if not count:
+                break
+            yield np.frombuffer(raw[:count * frame_bytes], dtype=np.uint8).reshape(count, height, width)
+    finally:
+        decoder.stdout.close()
+        if decoder.wait() != 0:
+            raise ValueError(f"Failed to decode video file: {video_path}")
+
+
+def detect_scene_changes(
+    video_path: str,
+    sample_fps: float,
+    threshold: float,
+    min_gap: float,
+    max_count: int,
+    keyframe_max_gap: float = 0.0,
+    batch_size: int = 256
+) -> List[float]:
+    """Timestamps of the scene changes in a video (runs in a worker process).
+
+    Decoding dominates the cost, so when the video's keyframes are at most
+    ``keyframe_max_gap`` seconds apart (typically about 2 seconds on
+    YouTube) only the keyframes are decoded and scored. Otherwise every
+    frame is decoded and ffmpeg keeps ``sample_fps`` of them per second.
+    Sampled frames are shrunk to small grayscale images and scored
+    ``batch_size`` at a time. The first frame always counts as a scene
+    change so the opening shot is captured.
+    """
+    keyframes = keyframe_times(video_path) if keyframe_max_gap > 0 else []
+    if len(keyframes) < 2 or np.median(np.diff(keyframes)) > keyframe_max_gap:
+        keyframes = []
+
+    scores: List[np.ndarray] = []
+    previous = None
+    for batch in sample_gray_frames(video_path, sample_fps, bool(keyframes), batch_size):
+        scores.append(scene_change_scores(batch, previous))
+        previous = batch[-1]
+
+    if not scores:
+        return []
+    scores = np.concatenate(scores)
+    if keyframes:
+        # One decoded frame per keyframe; guard against a trailing keyframe ffmpeg could not decode
+        count = min(len(scores), len(keyframes))
+        times, scores = np.array(keyframes[:count]), scores[:count]
+    else:
+        times = np.arange(len(scores)) / sample_fps
+    return select_scene_changes(times, scores, threshold, min_gap, max_count)
+
+
+def difference_hashes(images: np.ndarray) -> np.ndarray:
+    """64-bit dHash of each ``(n, 8, 9)`` grayscale thumbnail, as uint64.
+
+    Each bit records whether a pixel is brighter than its right-hand
+    neighbour, so the hash survives recompression and small shifts.
+    """
+    bits = (images[:, :, 1:] > images[:, :, :-1]).reshape(len(images), 64)
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def hamming_distances(hashes: np.ndarray, value: np.uint64) -> np.ndarray:
+    """Number of differing bits between ``value`` and each of ``hashes``."""
+    xor = np.bitwise_xor(hashes, value)
+    return np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def dedupe_images(paths: List[str], threshold: int) -> Tuple[Dict[str, str], int]:
+    """Delete images that look like an earlier one (runs in a worker process).
+
+    Images are compared in order against every image kept so far, so a
+    shot the video returns to is still recognised. Returns a map from each
+    input path to the path of the image kept in its place, and the number
+    of bytes deleted.
+    """
+    import cv2
+
+    thumbnails = []
+    readable = []
+    for path in paths:
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            logger.warning(f"Could not read screenshot {path}, keeping it")
+            continue
+        thumbnails.append(cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA))
+        readable.append(path)
+
+    mapping = {path: path for path in paths}
+    if not readable:
+        return mapping, 0
+    hashes = difference_hashes(np.stack(thumbnails))
+
+    kept: List[int] = []
+    bytes_saved = 0
+    for i, path in enumerate(readable):
+        if kept:
+            distances = hamming_distances(hashes[kept], hashes[i])
+            nearest = int(np.argmin(distances))
+            if distances[nearest] <= threshold:
+                mapping[path] = readable[kept[nearest]]
+                bytes_saved += os.path.getsize(path)
+                os.remove(path)
+                continue
+        kept.append(i)
+    return mapping, bytes_saved
+
+
+class FrameExtractor:
+    """Extracts video frames in worker processes so decoding never blocks the event loop."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        snap_tolerance: Optional[float] = None,
+        seek_gap_seconds: Optional[float] = None
+    ):
+        self.snap_tolerance = settings.FRAME_SNAP_TOLERANCE if snap_tolerance is None else snap_tolerance
+        self.seek_gap_seconds = seek_gap_seconds or settings.FRAME_SEEK_GAP_SECONDS
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers or settings.FRAME_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def extract(self, video_path: str, video_id: str, timestamps: List[float]) -> List[str]:
+        """Capture a JPEG per timestamp into ``SCREENSHOTS_DIR``, returned in timestamp order.
+
+        Files are named after the requested timestamp even when the frame
+        was snapped to a nearby keyframe.
+        """
+        targets = [
+            (timestamp, os.path.join(settings.SCREENSHOTS_DIR, f"{video_id}_{int(timestamp)}.jpg"))
+            for timestamp in timestamps
+        ]
+        loop = asyncio.get_running_loop()
+        written = await loop.run_in_executor(
+            self.executor,
+            extract_frames,
+            video_path,
+            targets,
+            self.snap_tolerance,
+            self.seek_gap_seconds
+        )
+        return [path for _, path in written]
+
+    async def extract_sections(self, video_id: str, sections: List[Tuple[float, str]]) -> List[str]:
+        """Capture a JPEG per downloaded ``(timestamp, section_path)`` section, named like ``extract``."""
+        targets = [
+            (section, os.path.join(settings.SCREENSHOTS_DIR, f"{video_id}_{int(timestamp)}.jpg"))
+            for timestamp, section in sections
+        ]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, extract_section_frames, targets)
+
+    async def detect_scenes(self, video_path: str, max_count: int) -> List[float]:
+        """Timestamps of up to ``max_count`` scene changes, in time order."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            detect_scene_changes,
+            video_path,
+            settings.SCENE_SAMPLE_FPS,
+            settings.SCENE_CHANGE_THRESHOLD,
+            settings.SCENE_MIN_GAP_SECONDS,
+            max_count,
+            settings.SCENE_KEYFRAME_MAX_GAP_SECONDS
+        )
+
+    async def dedupe(self, paths: List[str]) -> Dict[str, str]:
+        """Remove near-duplicate screenshots, returning which kept file replaces each path."""
+        loop = asyncio.get_running_loop()
+        mapping, bytes_saved = await loop.run_in_executor(
+            self.executor,
+            dedupe_images,
+            paths,
+            settings.SCREENSHOT_DEDUP_THRESHOLD
+        )
+        removed = sum(1 for path, kept in mapping.items() if path != kept)
+        logger.info(f"Removed {removed} of {len(paths)} duplicate screenshots, saving {bytes_saved / 1024:.0f} KB")
+        job_stats = get_job_stats()
+        if job_stats:
+            job_stats.screenshots.record(removed, bytes_saved)
+        return mapping
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,34 @@
+# app/services/hedging.py
+import logging
+from typing import Optional
+from app.core.settings import settings
+from app.services.job_stats import HedgeBudget, get_job_stats
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def get_hedge_budget() -> Optional[HedgeBudget]:
+    """Return the current job's budget if hedging is enabled.
+
+    Hedging only happens inside a job started with ``begin_job_stats`` and
+    only when ``settings.HEDGE_ENABLED`` is set.
+    """
+    job_stats = get_job_stats()
+    if not settings.HEDGE_ENABLED or job_stats is None:
+        return None
+    return job_stats.hedging
+
+
+def hedge_delay(operation: str, model: str) -> Optional[float]:
+    """Seconds to wait before hedging a call, from its observed latency percentile.
+
+    Returns None until enough calls have been observed to trust the estimate.
+    """
+    labels = {"operation": operation, "model": model}
+    if metrics.sample_count("llm_latency_seconds", **labels) < settings.HEDGE_MIN_SAMPLES:
+        return None
+    latency = metrics.percentile("llm_latency_seconds", settings.HEDGE_PERCENTILE, **labels)
+    queue_wait = metrics.percentile("llm_queue_wait_seconds", settings.HEDGE_PERCENTILE, **labels) or 0.0
+    # The hedge timer also covers time spent in the rate limiter queue
+    return latency + queue_wait
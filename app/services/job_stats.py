@@ -0,0 +1,146 @@
+# app/services/job_stats.py
+from contextvars import ContextVar
+from typing import Dict, Optional
+from app.core.settings import settings
+from app.models.youtube import ModelRouteStats
+from app.utils.metrics import metrics
+
+
+class CacheStats:
+    """Hit/miss counters for the LLM cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.saved_input_tokens = 0
+        self.saved_output_tokens = 0
+        self.saved_seconds = 0.0
+
+    def record_hit(self, entry: Dict):
+        self.hits += 1
+        self.saved_input_tokens += entry["prompt_tokens"]
+        self.saved_output_tokens += entry["completion_tokens"]
+        self.saved_seconds += entry["latency_seconds"]
+
+    def record_miss(self):
+        self.misses += 1
+
+    def as_dict(self) -> Dict:
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_saved_tokens": self.saved_input_tokens + self.saved_output_tokens,
+            "cache_saved_seconds": round(self.saved_seconds, 3)
+        }
+
+
+class HedgeBudget:
+    """Caps the extra tokens one job may spend on hedged (duplicate) requests."""
+
+    def __init__(self, max_tokens: Optional[int] = None):
+        self.max_tokens = settings.HEDGE_TOKEN_BUDGET if max_tokens is None else max_tokens
+        self.spent_tokens = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    def reserve(self, estimated_tokens: int) -> bool:
+        """Charge a hedge's estimated tokens, or return False if the budget is spent."""
+        if self.spent_tokens + estimated_tokens > self.max_tokens:
+            return False
+        self.spent_tokens += estimated_tokens
+        self.hedged_requests += 1
+        return True
+
+    def record_win(self):
+        self.hedge_wins += 1
+
+    def as_dict(self) -> Dict:
+        return {
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+            "hedge_tokens": self.spent_tokens
+        }
+
+
+class RouteStats:
+    """Per-model request counts, usage and escalations."""
+
+    def __init__(self):
+        self.routes: Dict[str, ModelRouteStats] = {}
+
+    def record(
+        self,
+        model: str,
+        outcome: str,
+        input_tokens: int,
+        output_tokens: int,
+        price: float,
+        seconds: float
+    ):
+        route = self.routes.setdefault(model, ModelRouteStats())
+        route.requests += 1
+        # outcome is "accepted", "escalated" or "failed"
+        setattr(route, outcome, getattr(route, outcome) + 1)
+        route.input_tokens += input_tokens
+        route.output_tokens += output_tokens
+        route.price = round(route.price + price, 6)
+        route.total_seconds = round(route.total_seconds + seconds, 3)
+
+    def as_dict(self) -> Dict:
+        return {"model_routes": dict(self.routes)}
+
+
+class ScreenshotStats:
+    """Screenshot deduplication counts."""
+
+    def __init__(self):
+        self.screenshots_removed = 0
+        self.screenshot_bytes_saved = 0
+
+    def record(self, removed: int, bytes_saved: int):
+        self.screenshots_removed += removed
+        self.screenshot_bytes_saved += bytes_saved
+        metrics.increment("screenshots_deduplicated_total", removed)
+        metrics.increment("screenshot_bytes_saved_total", bytes_saved)
+
+    def as_dict(self) -> Dict:
+        return {
+            "screenshots_removed": self.screenshots_removed,
+            "screenshot_bytes_saved": self.screenshot_bytes_saved
+        }
+
+
+class JobStats:
+    """Statistics collected while one processing job runs, one section per service.
+
+    ``as_dict`` flattens every section into the fields of ``ProcessingStats``.
+    """
+
+    def __init__(self):
+        self.cache = CacheStats()
+        self.hedging = HedgeBudget()
+        self.routes = RouteStats()
+        self.screenshots = ScreenshotStats()
+
+    def as_dict(self) -> Dict:
+        return {
+            **self.cache.as_dict(),
+            **self.hedging.as_dict(),
+            **self.routes.as_dict(),
+            **self.screenshots.as_dict()
+        }
+
+
+# Stats of the job running in the current task context, if any
+_current_stats: ContextVar[Optional[JobStats]] = ContextVar("job_stats", default=None)
+
+
+def begin_job_stats() -> JobStats:
+    """Start collecting statistics for the job in the current task context."""
+    stats = JobStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def get_job_stats() -> Optional[JobStats]:
+    return _current_stats.get()
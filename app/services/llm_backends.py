@@ -0,0 +1,436 @@
+# app/services/llm_backends.py
+import re
+import json
+import time
+import random
+import asyncio
+import logging
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Set, Tuple
+from uuid import uuid4
+import httpx
+from openai import AsyncOpenAI, InternalServerError, RateLimitError
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from app.core.settings import settings
+from app.services.chunking import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class LLMBackend(ABC):
+    """Interface for services that answer chat completion requests.
+
+    ``create`` takes the request body (model, messages, temperature, ...) and
+    returns the response together with its HTTP headers. With ``stream=True``
+    the response is an async iterator of ``ChatCompletionChunk`` events whose
+    last event carries usage.
+    """
+
+    name = "base"
+    # Whether tokens cost money; unbilled backends report a price of zero
+    billable = True
+    # Whether calls count against the RPM/TPM quota enforced by the rate limiter
+    rate_limited = True
+
+    @abstractmethod
+    async def create(self, request: Dict, stream: bool = False) -> Tuple[Any, Mapping[str, str]]:
+        """Answer one chat completion request."""
+
+    def close(self):
+        """Release resources held by the backend."""
+
+
+class OpenAIBackend(LLMBackend):
+    """Sends requests to the OpenAI API."""
+
+    name = "openai"
+
+    def __init__(self, client: AsyncOpenAI):
+        self.client = client
+
+    async def create(self, request: Dict, stream: bool = False) -> Tuple[Any, Mapping[str, str]]:
+        extra_args = {}
+        if stream:
+            extra_args["stream"] = True
+            extra_args["stream_options"] = {"include_usage": True}
+        raw_response = await self.client.chat.completions.with_raw_response.create(**request, **extra_args)
+        return raw_response.parse(), raw_response.headers
+
+
+def build_openai_client(http_client: Optional[httpx.AsyncClient] = None) -> AsyncOpenAI:
+    """Create the API client; retries are left to RetryPolicy so they are not multiplied."""
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=http_client,
+        max_retries=0
+    )
+
+
+class MockLLMBackend(LLMBackend):
+    """In-process, OpenAI-compatible stand-in for load testing without network.
+
+    Time to first token follows a log-normal distribution around
+    ``latency_median`` seconds, output is generated at ``tokens_per_second``,
+    and a fraction of requests fail with 429s or 500s. Cleanup requests echo
+    the user text back as paragraphs; JSON requests return a minimal table of
+    contents. Token usage is counted with the local tokenizer.
+    """
+
+    name = "mock"
+
+    def __init__(
+        self,
+        latency_median: Optional[float] = None,
+        latency_sigma: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        rate_limit_rate: Optional[float] = None,
+        seed: Optional[int] = None
+    ):
+        self.latency_median = settings.MOCK_LLM_LATENCY_MEDIAN if latency_median is None else latency_median
+        self.latency_sigma = settings.MOCK_LLM_LATENCY_SIGMA if latency_sigma is None else latency_sigma
+        self.tokens_per_second = tokens_per_second or settings.MOCK_LLM_TOKENS_PER_SECOND
+        self.error_rate = settings.MOCK_LLM_ERROR_RATE if error_rate is None else error_rate
+        self.rate_limit_rate = settings.MOCK_LLM_RATE_LIMIT_RATE if rate_limit_rate is None else rate_limit_rate
+        self._random = random.Random(seed)
+
+        self.requests = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "x-ratelimit-limit-requests": str(settings.OPENAI_RPM_LIMIT),
+            "x-ratelimit-limit-tokens": str(settings.OPENAI_TPM_LIMIT)
+        }
+
+    def _raise_random_error(self):
+        roll = self._random.random()
+        request = httpx.Request("POST", "http://mock-llm/v1/chat/completions")
+        if roll < self.rate_limit_rate:
+            self.failures += 1
+            response = httpx.Response(429, headers={"retry-after": "1"}, request=request)
+            raise RateLimitError("Mock rate limit", response=response, body=None)
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.failures += 1
+            response = httpx.Response(500, request=request)
+            raise InternalServerError("Mock server error", response=response, body=None)
+
+    @staticmethod
+    def _answer(request: Dict) -> str:
+        """Produce deterministic output for a request."""
+        text = request["messages"][-1]["content"]
+        if request.get("response_format", {}).get("type") == "json_object":
+            numbers = [int(n) for n in re.findall(r"^\[(\d+)\]", text, re.MULTILINE)]
+            start = numbers[0] if numbers else 0
+            return json.dumps({"chapters": [
+                {"start_paragraph_number": start, "title": f"Section {start}", "summary": text[:80]}
+            ]})
+
+        # Echo the text back, split into paragraphs of a few sentences
+        sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+        return "\n\n".join(" ".join(sentences[i:i + 4]) for i in range(0, len(sentences), 4))
+
+    def _usage(self, request: Dict, content: str) -> Dict[str, int]:
+        prompt_tokens = sum(count_tokens(m["content"]) for m in request["messages"])
+        completion_tokens = min(count_tokens(content), request.get("max_tokens") or settings.MAX_TOKENS)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+    async def create(self, request: Dict, stream: bool = False) -> Tuple[Any, Mapping[str, str]]:
+        self.requests += 1
+        await asyncio.sleep(self._random.lognormvariate(0, self.latency_sigma) * self.latency_median)
+        self._raise_random_error()
+
+        content = self._answer(request)
+        usage = self._usage(request, content)
+        response_id = f"chatcmpl-mock-{uuid4().hex[:12]}"
+
+        if stream:
+            return self._stream(request, response_id, content, usage), self._headers()
+
+        await asyncio.sleep(usage["completion_tokens"] / self.tokens_per_second)
+        response = ChatCompletion.model_validate({
+            "id": response_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content}
+            }],
+            "usage": usage
+        })
+        return response, self._headers()
+
+    async def _stream(
+        self,
+        request: Dict,
+        response_id: str,
+        content: str,
+        usage: Dict[str, int]
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """Yield the content word by word at the configured token rate."""
+        created = int(time.time())
+        pieces = re.findall(r"\S+\s*", content)
+        delay = usage["completion_tokens"] / self.tokens_per_second / max(1, len(pieces))
+
+        for piece in pieces:
+            await asyncio.sleep(delay)
+            yield ChatCompletionChunk.model_validate({
+                "id": response_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": request["model"],
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+            })
+
+        yield ChatCompletionChunk.model_validate({
+            "id": response_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": request["model"],
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens
+        }
+
+
+# Model and tokenizer loaded once in each local inference worker process
+_worker_model = None
+_worker_tokenizer = None
+
+
+def _init_local_worker(model_name: str, threads: int):
+    """Load the local model in a worker process."""
+    global _worker_model, _worker_tokenizer
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    torch.set_num_threads(threads)
+    _worker_tokenizer = AutoTokenizer.from_pretrained(model_name, padding_side="left")
+    if _worker_tokenizer.pad_token is None:
+        _worker_tokenizer.pad_token = _worker_tokenizer.eos_token
+    _worker_model = AutoModelForCausalLM.from_pretrained(model_name, torch_dtype=torch.float32)
+    _worker_model.eval()
+
+
+def _generate_batch(requests: List[Dict]) -> List[Dict]:
+    """Generate completions for a batch of requests sharing one temperature.
+
+    Runs in a worker process. Returns content, finish reason and token counts
+    for each request, in order.
+    """
+    import torch
+
+    prompts = [
+        _worker_tokenizer.apply_chat_template(r["messages"], tokenize=False, add_generation_prompt=True)
+        for r in requests
+    ]
+    inputs = _worker_tokenizer(prompts, return_tensors="pt", padding=True)
+    max_tokens = [r.get("max_tokens") or settings.MAX_TOKENS for r in requests]
+    temperature = requests[0].get("temperature") or 0
+
+    generate_args = {"max_new_tokens": max(max_tokens), "pad_token_id": _worker_tokenizer.pad_token_id}
+    if temperature > 0:
+        generate_args.update(do_sample=True, temperature=temperature)
+    else:
+        generate_args["do_sample"] = False
+
+    with torch.inference_mode():
+        output = _worker_model.generate(**inputs, **generate_args)
+
+    prompt_length = inputs["input_ids"].shape[1]
+    stop_ids = {_worker_tokenizer.eos_token_id, _worker_tokenizer.pad_token_id}
+    results = []
+    for i, limit in enumerate(max_tokens):
+        tokens = []
+        finish_reason = "length"
+        for token in output[i, prompt_length:].tolist():
+            if token in stop_ids:
+                finish_reason = "stop"
+                break
+            tokens.append(token)
+        if len(tokens) >= limit:
+            tokens, finish_reason = tokens[:limit], "length"
+
+        results.append({
+            "content": _worker_tokenizer.decode(tokens, skip_special_tokens=True).strip(),
+            "finish_reason": finish_reason,
+            "prompt_tokens": int(inputs["attention_mask"][i].sum()),
+            "completion_tokens": len(tokens)
+        })
+    return results
+
+
+class LocalLLMBackend(LLMBackend):
+    """Runs a small instruction model on CPU in a pool of worker processes.
+
+    Concurrent requests are collected for up to ``batch_wait`` seconds (or
+    until ``batch_size`` are queued) and generated together in one padded
+    batch. The requested model name is ignored; every request is answered by
+    ``settings.LOCAL_LLM_MODEL``. Requires ``transformers`` and ``torch``.
+    """
+
+    name = "local"
+    billable = False
+    rate_limited = False
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_wait: Optional[float] = None
+    ):
+        self.model_name = model_name or settings.LOCAL_LLM_MODEL
+        self.batch_size = batch_size or settings.LOCAL_LLM_BATCH_SIZE
+        self.batch_wait = settings.LOCAL_LLM_BATCH_WAIT if batch_wait is None else batch_wait
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers or settings.LOCAL_LLM_WORKERS,
+            # Fresh interpreters: forking a process with torch and a running loop is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_local_worker,
+            initargs=(self.model_name, settings.LOCAL_LLM_THREADS_PER_WORKER)
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Running batches; the loop only keeps weak references to tasks
+        self._batches: Set[asyncio.Task] = set()
+
+    def _ensure_dispatcher(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._dispatcher is None or self._dispatcher.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        """Group queued requests into batches and hand them to the pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Sampling settings apply to a whole batch, so split by temperature
+            groups: Dict[float, List] = {}
+            for request, future in batch:
+                if not future.cancelled():
+                    groups.setdefault(request.get("temperature") or 0, []).append((request, future))
+            for group in groups.values():
+                task = loop.create_task(self._run_batch(group))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List):
+        loop = asyncio.get_running_loop()
+        try:
+            outputs = await loop.run_in_executor(self.executor, _generate_batch, [r for r, _ in batch])
+        except Exception as e:
+            logger.error(f"Local inference batch of {len(batch)} failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output)
+
+    async def create(self, request: Dict, stream: bool = False) -> Tuple[Any, Mapping[str, str]]:
+        self._ensure_dispatcher()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        output = await future
+
+        usage = {
+            "prompt_tokens": output["prompt_tokens"],
+            "completion_tokens": output["completion_tokens"],
+            "total_tokens": output["prompt_tokens"] + output["completion_tokens"]
+        }
+        response = ChatCompletion.model_validate({
+            "id": f"chatcmpl-local-{uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self.model_name,
+            "choices": [{
+                "index": 0,
+                "finish_reason": output["finish_reason"],
+                "message": {"role": "assistant", "content": output["content"]}
+            }],
+            "usage": usage
+        })
+        if stream:
+            return self._stream(response), {}
+        return response, {}
+
+    @staticmethod
+    async def _stream(response: ChatCompletion) -> AsyncIterator[ChatCompletionChunk]:
+        """Replay a finished completion as stream events (generation is batched, not incremental)."""
+        choice = response.choices[0]
+        for delta, finish_reason, usage in (
+            ({"content": choice.message.content}, None, None),
+            ({}, choice.finish_reason, response.usage.model_dump())
+        ):
+            yield ChatCompletionChunk.model_validate({
+                "id": response.id,
+                "object": "chat.completion.chunk",
+                "created": response.created,
+                "model": response.model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                "usage": usage
+            })
+
+    def close(self):
+        if self._dispatcher and not self._dispatcher.done():
+            self._dispatcher.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_backend: Optional[LLMBackend] = None
+
+
+def get_llm_backend() -> LLMBackend:
+    """Return the process-wide backend selected by ``settings.LLM_BACKEND``."""
+    global _backend
+    if _backend is None:
+        if settings.LLM_BACKEND == "mock":
+            logger.info("Using in-process mock LLM backend")
+            _backend = MockLLMBackend()
+        elif settings.LLM_BACKEND == "local":
+            logger.info(f"Using local LLM backend with {settings.LOCAL_LLM_MODEL}")
+            _backend = LocalLLMBackend()
+        else:
+            _backend = OpenAIBackend(build_openai_client())
+    return _backend
+
+
+def set_llm_backend(backend: LLMBackend):
+    """Replace the process-wide backend (e.g. with a tuned mock for a load test)."""
+    global _backend
+    _backend = backend
@@ -0,0 +1,158 @@
+# app/services/llm_cache.py
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from app.core.settings import settings
+from app.services.job_stats import get_job_stats
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """Persistent, content-addressed cache of chat completion responses.
+
+    Entries are keyed by a hash of model, system prompt, temperature and user
+    text and stored in SQLite. When the cache grows beyond ``max_size_mb`` the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size_mb: Optional[int] = None):
+        self.path = path or os.path.join(settings.CACHE_DIR, "llm", "responses.sqlite3")
+        self.max_size_bytes = (max_size_mb or settings.LLM_CACHE_MAX_SIZE_MB) * 1024 * 1024
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                prompt_tokens INTEGER NOT NULL,
+                completion_tokens INTEGER NOT NULL,
+                latency_seconds REAL NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, temperature: float, text: str) -> str:
+        """Build the content address for a request."""
+        payload = json.dumps(
+            {
+                "model": model,
+                "system_prompt": system_prompt,
+                "temperature": temperature,
+                "text": text
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for ``key`` and update the job's counters."""
+        job_stats = get_job_stats()
+        stats = job_stats.cache if job_stats else None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, prompt_tokens, completion_tokens, latency_seconds "
+                    "FROM responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE responses SET last_access = ? WHERE key = ?",
+                        (time.time(), key)
+                    )
+                    self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading LLM cache: {str(e)}")
+            row = None
+
+        if not row:
+            if stats:
+                stats.record_miss()
+            return None
+
+        entry = {
+            "response": row[0],
+            "prompt_tokens": row[1],
+            "completion_tokens": row[2],
+            "latency_seconds": row[3]
+        }
+        if stats:
+            stats.record_hit(entry)
+        return entry
+
+    def put(
+        self,
+        key: str,
+        response: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_seconds: float
+    ):
+        """Store a serialized response and evict old entries if over budget."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, response, prompt_tokens, completion_tokens, latency_seconds, size, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        response,
+                        prompt_tokens,
+                        completion_tokens,
+                        latency_seconds,
+                        len(response.encode("utf-8")),
+                        time.time()
+                    )
+                )
+                self._evict()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing LLM cache: {str(e)}")
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its size budget."""
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total_size -= size
+            evicted += 1
+
+        logger.info(f"Evicted {evicted} entries from LLM cache")
+
+
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Return the process-wide LLM cache, or None if caching is disabled."""
+    global _cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
@@ -1,141 +1,435 @@
 # app/services/openai.py
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Callable
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Callable
 import asyncio
-from openai import AsyncOpenAI
+import time
+from openai import RateLimitError
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
 from app.core.settings import settings
+from app.services.llm_cache import LLMCache, get_llm_cache
+from app.services.chunking import chunk_transcript, count_tokens, output_token_budget
+from app.services.rate_limiter import NoRateLimit, get_rate_limiter, parse_reset_duration
+from app.services.llm_backends import OpenAIBackend, get_llm_backend
+from app.utils.retry import RetryPolicy, get_circuit_breaker
+from app.utils.metrics import metrics
+from app.services.hedging import get_hedge_budget, hedge_delay
+from app.services.routing import cascade_models, check_cleanup_output
+from app.services.job_stats import get_job_stats
 
 logger = logging.getLogger(__name__)
 
+# Receives each finished paragraph of a streamed completion as it arrives
+ParagraphHandler = Callable[[str], Awaitable[None]]
+
+# Receives (chunk_index, paragraph_index, paragraph) for streamed transcript chunks.
+# Paragraph index 0 starts a new response for the chunk, replacing earlier
+# output; a None paragraph discards the chunk's output without replacing it.
+ParagraphCallback = Callable[[int, int, Optional[Dict]], Awaitable[None]]
+
+
+def split_paragraphs(content: str) -> List[str]:
+    """Split model output into paragraphs delimited by blank lines."""
+    return [p.strip() for p in content.strip().split("\n\n") if p.strip()]
+
+
+class _LeaderCancelled(Exception):
+    """The request other callers were waiting on was cancelled."""
+
+
 class OpenAIService:
+    # Futures of requests currently in flight, keyed by request fingerprint.
+    # Shared by every instance so identical requests from different jobs coalesce.
+    _in_flight: Dict[str, asyncio.Future] = {}
+
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.backend = get_llm_backend()
+        # Raw API client for non-chat endpoints (e.g. batches); None for other backends
+        self.client = self.backend.client if isinstance(self.backend, OpenAIBackend) else None
+        self.retry_policy = RetryPolicy()
         self.system_prompt = """Process this transcript into clean, well-structured paragraphs.
         Remove verbal tics, add proper punctuation, and organize the content logically.
         Maintain the original meaning and key information."""
-        
-        # Price rates for different models
-        self.price_rates = {
-            'gpt-4o': {'input': 5/1000000, 'output': 15/1000000},
-            'gpt-4o-2024-08-06': {'input': 2.5/1000000, 'output': 10/1000000},
-            'gpt-4o-mini-2024-07-18': {'input': 0.15/1000000, 'output': 0.6/1000000},
-            'gpt-4o-mini': {'input': 0.15/1000000, 'output': 0.6/1000000},
-            'llama3-8b-8192': {'input': 0.05/1000000, 'output': 0.08/1000000},
-            'llama3-70b-8192': {'input': 0.59/1000000, 'output': 0.79/1000000},
-            'claude-3-5-sonnet-20240620': {'input': 3/1000000, 'output': 15/1000000},
-            'claude-3-haiku-20240307': {'input': 0.25/1000000, 'output': 1.25/1000000},
-        }
-        self.default_rates = {'input': 0.0001, 'output': 0.0002}
 
-    def calculate_price(self, input_tokens: int, output_tokens: int) -> float:
-        """Calculate price based on token usage."""
-        model = settings.MODEL
-        rates = self.price_rates.get(model, self.default_rates)
+    def calculate_price(self, input_tokens: int, output_tokens: int, model: Optional[str] = None) -> float:
+        """Calculate price based on token usage (for ``settings.MODEL`` unless given)."""
+        if not self.backend.billable:
+            return 0.0
+        model = model or settings.MODEL
+        rates = settings.get_token_price(model)
         total_price = (
             input_tokens * rates['input'] +
             output_tokens * rates['output']
         )
         return round(total_price, 6)
 
-    async def process_chunk(self, text: str) -> Dict:
-        """Process a single chunk of text."""
+    async def _call_with_retry(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        operation: str,
+        description: str,
+        model: Optional[str] = None
+    ) -> Any:
+        """Run a model call under the retry policy and circuit breaker, counting retries.
+
+        Each model has its own breaker, so failures of the cheap cascade
+        model cannot block escalation to the strong one.
+        """
+        model = model or settings.MODEL
+
+        def on_retry(error: BaseException):
+            metrics.increment(
+                "llm_retries_total",
+                operation=operation,
+                model=model,
+                error=type(error).__name__
+            )
+
+        return await self.retry_policy.call(
+            func,
+            breaker=get_circuit_breaker(f"openai:{model}"),
+            description=description,
+            on_retry=on_retry
+        )
+
+    def _record_call(
+        self,
+        operation: str,
+        model: str,
+        response: ChatCompletion,
+        queue_wait: float,
+        latency: float,
+        time_to_first_token: Optional[float]
+    ):
+        """Record telemetry for one completed backend call."""
+        labels = {"operation": operation, "model": model}
+        prompt_tokens = response.usage.prompt_tokens
+        completion_tokens = response.usage.completion_tokens
+        price = self.calculate_price(prompt_tokens, completion_tokens, model)
+
+        metrics.increment("llm_calls_total", **labels)
+        metrics.observe("llm_queue_wait_seconds", queue_wait, **labels)
+        metrics.observe("llm_latency_seconds", latency, **labels)
+        if time_to_first_token is not None:
+            metrics.observe("llm_time_to_first_token_seconds", time_to_first_token, **labels)
+        metrics.observe("llm_prompt_tokens", prompt_tokens, **labels)
+        metrics.observe("llm_completion_tokens", completion_tokens, **labels)
+        metrics.increment("llm_prompt_tokens_total", prompt_tokens, **labels)
+        metrics.increment("llm_completion_tokens_total", completion_tokens, **labels)
+        metrics.increment("llm_price_total", price, **labels)
+
+    @staticmethod
+    async def _replay(response: ChatCompletion, on_paragraph: Optional[ParagraphHandler]) -> ChatCompletion:
+        """Hand out an answer this caller did not pay for (cached or coalesced)."""
+        response = response.model_copy(deep=True)
+        response.usage = CompletionUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+        if on_paragraph:
+            for paragraph in split_paragraphs(response.choices[0].message.content):
+                await on_paragraph(paragraph)
+        return response
+
+    async def _create_completion(
+        self,
+        system_prompt: str,
+        text: str,
+        max_tokens: int,
+        temperature: float = 0.7,
+        response_format: Optional[Dict] = None,
+        on_paragraph: Optional[ParagraphHandler] = None,
+        operation: str = "chunk_cleanup",
+        coalesce: bool = True,
+        model: Optional[str] = None
+    ) -> ChatCompletion:
+        """Create a chat completion, serving repeated requests from the LLM cache.
+
+        Identical requests already in flight (from any job) are coalesced: the
+        caller awaits the first request's result instead of sending its own.
+        ``coalesce=False`` always sends a fresh request (used for hedging);
+        its response is still cached, so a winning hedge serves later repeats.
+        When ``on_paragraph`` is given the completion is streamed and each
+        paragraph is handed to it as soon as its closing blank line arrives.
+        ``operation`` labels the call's telemetry; ``model`` defaults to
+        ``settings.MODEL``.
+        """
+        model = model or settings.MODEL
+        fingerprint = LLMCache.make_key(model, system_prompt, temperature, text)
+
+        cache = get_llm_cache()
+        if cache:
+            # SQLite reads and commits would otherwise block every job on the loop
+            entry = await asyncio.to_thread(cache.get, fingerprint)
+            if entry:
+                metrics.increment("llm_cache_hits_total", operation=operation, model=model)
+                return await self._replay(
+                    ChatCompletion.model_validate_json(entry["response"]),
+                    on_paragraph
+                )
+
+        future = None
+        if coalesce:
+            while fingerprint in self._in_flight:
+                try:
+                    shared = await asyncio.shield(self._in_flight[fingerprint])
+                except _LeaderCancelled:
+                    # The original caller gave up; try again, possibly as the leader
+                    continue
+                logger.debug("Coalesced identical in-flight model request")
+                metrics.increment("llm_coalesced_total", operation=operation, model=model)
+                return await self._replay(shared, on_paragraph)
+
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight[fingerprint] = future
+
+        started = time.monotonic()
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.MODEL,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": text}
-                ],
-                temperature=0.7,
-                max_tokens=int(len(text) * 1.5)
+            response = await self._send_request(
+                system_prompt,
+                text,
+                max_tokens,
+                temperature,
+                response_format,
+                on_paragraph,
+                operation,
+                model
+            )
+        except asyncio.CancelledError:
+            if future:
+                future.set_exception(_LeaderCancelled())
+                future.exception()  # Mark retrieved; there may be no followers
+            raise
+        except Exception as e:
+            if future:
+                future.set_exception(e)
+                future.exception()
+            raise
+        else:
+            if future:
+                future.set_result(response)
+        finally:
+            if future and self._in_flight.get(fingerprint) is future:
+                del self._in_flight[fingerprint]
+
+        if cache:
+            await asyncio.to_thread(
+                cache.put,
+                fingerprint,
+                response.model_dump_json(),
+                response.usage.prompt_tokens,
+                response.usage.completion_tokens,
+                time.monotonic() - started
+            )
+        return response
+
+    async def _send_request(
+        self,
+        system_prompt: str,
+        text: str,
+        max_tokens: int,
+        temperature: float,
+        response_format: Optional[Dict],
+        on_paragraph: Optional[ParagraphHandler],
+        operation: str,
+        model: str
+    ) -> ChatCompletion:
+        """Send one request to the backend (through the shared rate limiter) and record its telemetry."""
+        request = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if response_format:
+            request["response_format"] = response_format
+
+        # Every call to a quota-limited backend goes through the process-wide
+        # limiter; max_tokens counts against the TPM limit as well as the prompt
+        limiter = get_rate_limiter() if self.backend.rate_limited else NoRateLimit()
+        estimated_tokens = count_tokens(system_prompt) + count_tokens(text) + max_tokens
+        queue_wait = await limiter.acquire(estimated_tokens)
+
+        started = time.monotonic()
+        time_to_first_token = None
+        try:
+            response, headers = await self.backend.create(request, stream=bool(on_paragraph))
+            limiter.update_from_headers(headers)
+            if on_paragraph:
+                response, first_token_at = await self._collect_stream(response, on_paragraph)
+                if first_token_at is not None:
+                    time_to_first_token = first_token_at - started
+        except RateLimitError as e:
+            metrics.increment("llm_errors_total", operation=operation, model=model, error="RateLimitError")
+            limiter.record_usage(estimated_tokens, 0)
+            headers = e.response.headers
+            retry_after = (
+                parse_reset_duration(headers.get("retry-after"))
+                or parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+                or settings.RETRY_DELAY
+            )
+            limiter.back_off(retry_after)
+            raise
+        except Exception as e:
+            limiter.record_usage(estimated_tokens, 0)
+            metrics.increment("llm_errors_total", operation=operation, model=model, error=type(e).__name__)
+            raise
+        except BaseException:
+            limiter.record_usage(estimated_tokens, 0)
+            raise
+
+        limiter.record_usage(estimated_tokens, response.usage.total_tokens)
+        self._record_call(operation, model, response, queue_wait, time.monotonic() - started, time_to_first_token)
+        return response
+
+    @staticmethod
+    async def _collect_stream(
+        stream,
+        on_paragraph: ParagraphHandler
+    ) -> Tuple[ChatCompletion, Optional[float]]:
+        """Consume a streamed completion, emitting paragraphs as they complete.
+
+        Returns the rebuilt completion and the monotonic time the first content
+        arrived (None if there was none).
+        """
+        parts = []
+        first_token_at = None
+        pending = ""
+        usage = None
+        finish_reason = None
+        response_id = ""
+        created = int(time.time())
+        model = settings.MODEL
+
+        async for event in stream:
+            response_id, created, model = event.id, event.created, event.model
+            if event.usage:
+                usage = event.usage
+            if not event.choices:
+                continue
+
+            choice = event.choices[0]
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            if not choice.delta.content:
+                continue
+
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+            parts.append(choice.delta.content)
+            pending += choice.delta.content
+            while "\n\n" in pending:
+                paragraph, pending = pending.split("\n\n", 1)
+                if paragraph.strip():
+                    await on_paragraph(paragraph.strip())
+
+        if pending.strip():
+            await on_paragraph(pending.strip())
+
+        # Rebuild a regular completion so callers and the cache see one shape
+        completion = ChatCompletion(
+            id=response_id,
+            object="chat.completion",
+            created=created,
+            model=model,
+            choices=[Choice(
+                index=0,
+                finish_reason=finish_reason or "stop",
+                message=ChatCompletionMessage(role="assistant", content="".join(parts))
+            )],
+            usage=usage or CompletionUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+        )
+        return completion, first_token_at
+
+    async def process_chunk(
+        self,
+        text: str,
+        on_paragraph: Optional[ParagraphHandler] = None,
+        operation: str = "chunk_cleanup"
+    ) -> ChatCompletion:
+        """Process a single chunk of text, streaming paragraphs to ``on_paragraph`` if given."""
+        try:
+            return await self._call_with_retry(
+                lambda: self._create_completion(
+                    self.system_prompt,
+                    text,
+                    max_tokens=output_token_budget(count_tokens(text)),
+                    on_paragraph=on_paragraph,
+                    operation=operation
+                ),
+                operation,
+                "Chunk request"
             )
-            return response
         except Exception as e:
             logger.error(f"Error processing chunk: {str(e)}")
             raise
 
-    async def transcript_to_paragraphs(
+    def build_chunk_request(self, chunk: Dict) -> Dict:
+        """Build the chat completion request body for one transcript chunk."""
+        return {
+            "model": settings.MODEL,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": chunk["text"]}
+            ],
+            "temperature": 0.7,
+            "max_tokens": output_token_budget(chunk["tokens"])
+        }
+
+    def parse_chunk_response(
         self,
-        transcript: List[Dict],
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        response: ChatCompletion,
+        price_factor: float = 1.0,
+        model: Optional[str] = None
+    ) -> Tuple[List[str], int, int, float]:
+        """Split a chunk response into paragraphs and return them with its usage and price."""
+        return (
+            split_paragraphs(response.choices[0].message.content),
+            response.usage.prompt_tokens,
+            response.usage.completion_tokens,
+            self.calculate_price(
+                response.usage.prompt_tokens,
+                response.usage.completion_tokens,
+                model
+            ) * price_factor
+        )
+
+    @staticmethod
+    def assemble_paragraphs(
+        text_chunks: List[Dict],
+        results: List[Optional[Tuple[List[str], int, int, float]]]
     ) -> Tuple[List[Dict], int, int, float]:
-        """Process transcript into paragraphs with progress tracking."""
+        """Reassemble per-chunk results into numbered paragraphs in chunk order.
+
+        ``results`` holds the parsed response for each chunk, or None for chunks
+        that failed. Raises ValueError if fewer than half the chunks succeeded.
+        """
         total_input_tokens = 0
         total_output_tokens = 0
         total_price = 0
         paragraphs = []
         successful_chunks = 0
-        
-        # Combine transcript text while keeping track of start times
-        text_chunks = []
-        current_chunk = {"text": "", "start_time": None}
-        current_length = 0
-        
-        for segment in transcript:
-            text = segment["text"].strip()
-            if not text:
-                continue
-                
-            # Start new chunk if needed
-            if current_length + len(text) > settings.CHUNK_SIZE or not current_chunk["text"]:
-                if current_chunk["text"]:
-                    text_chunks.append(current_chunk)
-                current_chunk = {"text": text, "start_time": float(segment["start"])}
-                current_length = len(text)
-            else:
-                current_chunk["text"] += " " + text
-                current_length += len(text) + 1
-                
-        # Add final chunk if not empty
-        if current_chunk["text"]:
-            text_chunks.append(current_chunk)
-        
         total_chunks = len(text_chunks)
         
-        for i, chunk in enumerate(text_chunks):
-            if progress_callback:
-                progress = (i + 1) / total_chunks * 0.5
-                await progress_callback(progress, "Processing transcript chunks")
+        for chunk, result in zip(text_chunks, results):
+            if result is None:
+                continue
             
-            for attempt in range(settings.MAX_RETRIES):
-                try:
-                    response = await self.client.chat.completions.create(
-                        model=settings.MODEL,
-                        messages=[
-                            {"role": "system", "content": self.system_prompt},
-                            {"role": "user", "content": chunk["text"]}
-                        ],
-                        temperature=0.7,
-                        max_tokens=int(len(chunk["text"]) * 1.5)
-                    )
-                    
-                    # Update tokens and price
-                    total_input_tokens += response.usage.prompt_tokens
-                    total_output_tokens += response.usage.completion_tokens
-                    total_price += self.calculate_price(
-                        response.usage.prompt_tokens,
-                        response.usage.completion_tokens
-                    )
-                    
-                    # Process the response into paragraphs
-                    chunk_paragraphs = [p.strip() for p in response.choices[0].message.content.strip().split("\n\n") if p.strip()]
-                    
-                    if chunk_paragraphs:
-                        for j, p in enumerate(chunk_paragraphs):
-                            paragraphs.append({
-                                "paragraph_number": len(paragraphs),
-                                "paragraph_text": p,
-                                "start_time": chunk["start_time"]  # Add timestamp from chunk
-                            })
-                        successful_chunks += 1
-                    break  # Break retry loop if successful
-                    
-                except Exception as e:
-                    logger.error(f"Error processing chunk {i} (attempt {attempt + 1}): {str(e)}")
-                    if attempt == settings.MAX_RETRIES - 1:
-                        logger.warning(f"Failed to process chunk {i} after {settings.MAX_RETRIES} attempts")
-                    await asyncio.sleep(settings.RETRY_DELAY)
+            chunk_paragraphs, input_tokens, output_tokens, price = result
+            total_input_tokens += input_tokens
+            total_output_tokens += output_tokens
+            total_price += price
+            
+            if chunk_paragraphs:
+                for p in chunk_paragraphs:
+                    paragraphs.append({
+                        "paragraph_number": len(paragraphs),
+                        "paragraph_text": p,
+                        "start_time": chunk["start_time"]  # Add timestamp from chunk
+                    })
+                successful_chunks += 1
         
         # Check if we have enough successful chunks
         if successful_chunks < total_chunks * 0.5:  # At least 50% success rate
@@ -148,6 +442,286 @@ class OpenAIService:
         logger.info(f"Successfully processed {successful_chunks}/{total_chunks} chunks")
         return paragraphs, total_input_tokens, total_output_tokens, total_price
 
+    async def _hedged_completion(
+        self,
+        system_prompt: str,
+        text: str,
+        max_tokens: int,
+        make_handler: Callable[[], Optional[ParagraphHandler]],
+        operation: str,
+        model: Optional[str] = None
+    ) -> ChatCompletion:
+        """Create a completion, duplicating it if it is slower than usual.
+
+        If the request has not finished within the observed latency percentile
+        for ``operation`` and the job's hedge budget allows, an identical
+        request is sent; the first successful response wins and the other is
+        cancelled. The hedge is not streamed; if it wins, its paragraphs are
+        replayed through a fresh handler from ``make_handler``.
+        """
+        model = model or settings.MODEL
+        primary = asyncio.create_task(self._create_completion(
+            system_prompt,
+            text,
+            max_tokens=max_tokens,
+            on_paragraph=make_handler(),
+            operation=operation,
+            model=model
+        ))
+        budget = get_hedge_budget()
+        delay = hedge_delay(operation, model) if budget else None
+        if delay is None:
+            return await primary
+
+        contenders = {primary}
+        try:
+            done, _ = await asyncio.wait(contenders, timeout=delay)
+            estimated_tokens = count_tokens(system_prompt) + count_tokens(text) + max_tokens
+            if done or not budget.reserve(estimated_tokens):
+                return await primary
+
+            logger.debug(f"Hedging {operation} request after {delay:.2f}s")
+            metrics.increment("llm_hedges_total", operation=operation, model=model)
+            hedge = asyncio.create_task(self._create_completion(
+                system_prompt,
+                text,
+                max_tokens=max_tokens,
+                operation=operation,
+                coalesce=False,
+                model=model
+            ))
+            contenders.add(hedge)
+
+            while contenders:
+                done, contenders = await asyncio.wait(contenders, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is None:
+                    continue
+                if winner is hedge:
+                    budget.record_win()
+                    metrics.increment("llm_hedge_wins_total", operation=operation, model=model)
+                    on_paragraph = make_handler()
+                    if on_paragraph:
+                        for paragraph in split_paragraphs(winner.result().choices[0].message.content):
+                            await on_paragraph(paragraph)
+                return winner.result()
+
+            # Both requests failed; surface the original error to the retry policy
+            return primary.result()
+        finally:
+            for task in contenders:
+                task.cancel()
+
+    async def _process_transcript_chunk(
+        self,
+        index: int,
+        chunk: Dict,
+        paragraph_callback: Optional[ParagraphCallback] = None
+    ) -> Optional[Tuple[List[str], int, int, float]]:
+        """Process one transcript chunk with retries and model cascading.
+
+        The chunk goes to the first of ``cascade_models()``; if the response
+        fails the cheap output checks (or every attempt errors) it is sent to
+        the next, stronger model. The last model's output is always accepted.
+        Returns the chunk's paragraphs with the token usage and price of every
+        model tried, or None if no model produced a response.
+        """
+        def make_handler() -> Optional[ParagraphHandler]:
+            if not paragraph_callback:
+                return None
+            # Positions restart for each response; the first paragraph of a
+            # retry, winning hedge or escalation replaces earlier partial output
+            position = 0
+
+            async def on_paragraph(text: str):
+                nonlocal position
+                await paragraph_callback(
+                    index,
+                    position,
+                    {"paragraph_text": text, "start_time": chunk["start_time"]}
+                )
+                position += 1
+
+            return on_paragraph
+
+        models = cascade_models()
+        job_stats = get_job_stats()
+        route_stats = job_stats.routes if job_stats else None
+        total_input_tokens = 0
+        total_output_tokens = 0
+        total_price = 0
+
+        for level, model in enumerate(models):
+            is_last = level == len(models) - 1
+            started = time.monotonic()
+            try:
+                response = await self._call_with_retry(
+                    lambda: self._hedged_completion(
+                        self.system_prompt,
+                        chunk["text"],
+                        output_token_budget(chunk["tokens"]),
+                        make_handler,
+                        "chunk_cleanup",
+                        model
+                    ),
+                    "chunk_cleanup",
+                    f"Chunk {index} ({model})",
+                    model
+                )
+            except Exception as e:
+                logger.warning(f"Failed to process chunk {index} with {model}: {str(e)}")
+                if route_stats:
+                    route_stats.record(
+                        model,
+                        "failed",
+                        0, 0, 0,
+                        time.monotonic() - started
+                    )
+                if is_last:
+                    if paragraph_callback:
+                        await paragraph_callback(index, 0, None)
+                    return None
+                continue
+
+            paragraphs, input_tokens, output_tokens, price = self.parse_chunk_response(response, model=model)
+            total_input_tokens += input_tokens
+            total_output_tokens += output_tokens
+            total_price += price
+
+            rejection = None
+            if not is_last:
+                rejection = check_cleanup_output(
+                    chunk["text"],
+                    paragraphs,
+                    response.choices[0].finish_reason
+                )
+            if route_stats:
+                route_stats.record(
+                    model,
+                    "accepted" if rejection is None else "escalated",
+                    input_tokens,
+                    output_tokens,
+                    price,
+                    time.monotonic() - started
+                )
+            if rejection is None:
+                return paragraphs, total_input_tokens, total_output_tokens, total_price
+
+            logger.info(f"Escalating chunk {index} from {model}: {rejection}")
+            if paragraph_callback:
+                # Rejected output must not stay visible while the next model runs
+                await paragraph_callback(index, 0, None)
+            metrics.increment("llm_escalations_total", operation="chunk_cleanup", model=model)
+
+    async def transcript_to_paragraphs(
+        self,
+        transcript: List[Dict],
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        max_concurrency: Optional[int] = None,
+        paragraph_callback: Optional[ParagraphCallback] = None
+    ) -> Tuple[List[Dict], int, int, float]:
+        """Process transcript into paragraphs with progress tracking.
+
+        Up to ``max_concurrency`` chunks (default ``settings.MAX_CONCURRENT_CHUNKS``)
+        are in flight at once; paragraphs are reassembled in chunk order. With
+        ``paragraph_callback`` completions are streamed and every paragraph is
+        reported with its chunk index and position as soon as it is finished.
+        """
+        text_chunks = chunk_transcript(transcript)
+        total_chunks = len(text_chunks)
+        
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.MAX_CONCURRENT_CHUNKS))
+        
+        async def _run(i: int, chunk: Dict):
+            async with semaphore:
+                return i, await self._process_transcript_chunk(i, chunk, paragraph_callback)
+        
+        tasks = [asyncio.create_task(_run(i, chunk)) for i, chunk in enumerate(text_chunks)]
+        results: List[Optional[Tuple[List[str], int, int, float]]] = [None] * total_chunks
+        completed_chunks = 0
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                i, result = await next_done
+                results[i] = result
+                completed_chunks += 1
+                
+                if progress_callback:
+                    progress = completed_chunks / total_chunks * 0.5
+                    await progress_callback(progress, "Processing transcript chunks")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        return self.assemble_paragraphs(text_chunks, results)
+
+    async def complete_json(
+        self,
+        system_prompt: str,
+        text: str,
+        max_tokens: int,
+        operation: str = "json"
+    ) -> Tuple[Dict, int, int, float]:
+        """Request a JSON object response; returns the parsed object (empty if invalid) with usage and price."""
+        response = await self._call_with_retry(
+            lambda: self._create_completion(
+                system_prompt,
+                text,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"},
+                operation=operation
+            ),
+            operation,
+            "JSON request"
+        )
+        try:
+            data = json.loads(response.choices[0].message.content)
+        except json.JSONDecodeError:
+            logger.error("Failed to parse JSON response")
+            data = {}
+        return (
+            data if isinstance(data, dict) else {},
+            response.usage.prompt_tokens,
+            response.usage.completion_tokens,
+            self.calculate_price(
+                response.usage.prompt_tokens,
+                response.usage.completion_tokens
+            )
+        )
+
+    @staticmethod
+    def validate_toc_chapters(chapters: List[Dict], total_paragraphs: int) -> List[Dict]:
+        """Keep titled chapters with in-range, strictly increasing start paragraphs."""
+        valid_chapters = []
+        last_valid_point = -1
+        
+        for chapter in chapters:
+            if not isinstance(chapter, dict):
+                continue
+            start_point = chapter.get("start_paragraph_number")
+            title = str(chapter.get("title") or "").strip()
+            
+            if not title:
+                continue
+                
+            if (not isinstance(start_point, int) or
+                start_point >= total_paragraphs or 
+                start_point <= last_valid_point):
+                logger.warning(f"Skipping invalid TOC entry: {chapter}")
+                continue
+            
+            valid_chapter = {
+                "start_paragraph_number": start_point,
+                "title": title
+            }
+            if chapter.get("summary"):
+                valid_chapter["summary"] = str(chapter["summary"]).strip()
+            valid_chapters.append(valid_chapter)
+            last_valid_point = start_point
+        
+        return valid_chapters
+
     async def generate_toc(
         self,
         paragraphs: List[Dict]
@@ -183,15 +757,16 @@ class OpenAIService:
             - The first chapter should always start at paragraph 0
             """
 
-            response = await self.client.chat.completions.create(
-                model=settings.MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text}
-                ],
-                temperature=0.7,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
+            response = await self._call_with_retry(
+                lambda: self._create_completion(
+                    system_prompt,
+                    text,
+                    max_tokens=1000,
+                    response_format={"type": "json_object"},
+                    operation="toc"
+                ),
+                "toc",
+                "TOC request"
             )
             
             # Extract and process the response
@@ -208,28 +783,7 @@ class OpenAIService:
                             response.usage.completion_tokens
                         ))
             
-            # Validate chapter data
-            valid_chapters = []
-            last_valid_point = -1
-            
-            for chapter in toc_data.get("chapters", []):
-                start_point = chapter.get("start_paragraph_number")
-                title = chapter.get("title", "").strip()
-                
-                if not title:
-                    continue
-                    
-                if (start_point is None or 
-                    start_point >= total_paragraphs or 
-                    start_point <= last_valid_point):
-                    logger.warning(f"Skipping invalid TOC entry: {chapter}")
-                    continue
-                
-                valid_chapters.append({
-                    "start_paragraph_number": start_point,
-                    "title": title
-                })
-                last_valid_point = start_point
+            valid_chapters = self.validate_toc_chapters(toc_data.get("chapters", []), total_paragraphs)
 
             # Ensure we have at least one chapter
             if not valid_chapters:
@@ -8,12 +8,14 @@ from typing import List, Optional
 import logging
 from app.core.settings import settings
 from app.services.openai import OpenAIService
+from app.services.chunking import chunk_text
+from app.services.job_stats import begin_job_stats
 
 logger = logging.getLogger(__name__)
 
 class PDFService:
-    def __init__(self):
-        self.openai_service = OpenAIService()
+    def __init__(self, openai_service: Optional[OpenAIService] = None):
+        self.openai_service = openai_service or OpenAIService()
 
     def validate_pdf(self, file_path: str) -> bool:
         if not os.path.exists(file_path):
@@ -76,36 +78,26 @@ class PDFService:
 
     @staticmethod
     def create_word_bounded_chunks(text: str) -> List[str]:
-        words = text.split()
-        chunks = []
-        current_chunk = []
-        current_length = 0
-        
-        for word in words:
-            word_length = len(word) + 1
-            if current_length + word_length > settings.CHUNK_SIZE and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [word]
-                current_length = word_length
-            else:
-                current_chunk.append(word)
-                current_length += word_length
-        
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-        
-        return chunks
+        return [chunk["text"] for chunk in chunk_text(text)]
 
 class ProcessingJob:
-    def __init__(self, job_id: str, filename: str):
+    def __init__(
+        self,
+        job_id: str,
+        filename: str,
+        pdf_service: Optional[PDFService],
+        save: bool = True
+    ):
         self.job_id = job_id
         self.filename = filename
         self.status = "pending"
         self.progress = 0.0
         self.result_path = None
         self.error = None
-        self.pdf_service = PDFService()
-        self._save_status()
+        # Loaded status snapshots (save=False) never process, so have no service
+        self.pdf_service = pdf_service
+        if save:
+            self._save_status()
 
     def _save_status(self):
         status_path = os.path.join(settings.CACHE_DIR, f"{self.job_id}.json")
@@ -128,7 +120,7 @@ class ProcessingJob:
             )
         with open(status_path) as f:
             data = json.load(f)
-            job = ProcessingJob(data["job_id"], "")
+            job = ProcessingJob(data["job_id"], "", None, save=False)
             job.status = data["status"]
             job.progress = data["progress"]
             job.result_path = data["result_path"]
@@ -139,6 +131,7 @@ class ProcessingJob:
         try:
             self.status = "processing"
             self._save_status()
+            job_stats = begin_job_stats()
             logger.info(f"Starting processing job {self.job_id}")
 
             input_path = os.path.join(settings.UPLOAD_DIR, self.filename)
@@ -162,7 +155,8 @@ class ProcessingJob:
             # Process chunks with progress tracking
             for i, chunk in enumerate(chunks):
                 try:
-                    processed_chunk = await self.pdf_service.openai_service.process_chunk(chunk)
+                    response = await self.pdf_service.openai_service.process_chunk(chunk)
+                    processed_chunk = response.choices[0].message.content
                     if processed_chunk:
                         processed_chunks.append(processed_chunk)
                     self.progress = (i + 1) / len(chunks)
@@ -187,7 +181,7 @@ class ProcessingJob:
             self.status = "completed"
             self.result_path = output_path
             self._save_status()
-            logger.info(f"Completed processing job {self.job_id}")
+            logger.info(f"Completed processing job {self.job_id} (LLM cache: {job_stats.cache.as_dict()})")
 
         except Exception as e:
             logger.error(f"Job {self.job_id} failed: {str(e)}")
@@ -0,0 +1,160 @@
+# app/services/rate_limiter.py
+import asyncio
+import logging
+import re
+import time
+from typing import Mapping, Optional
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse durations such as ``"1s"``, ``"6m0s"`` or ``"20ms"`` into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to ``per_minute`` units."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_limit(self, per_minute: float):
+        self._refill()
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = min(self.level, self.capacity)
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """Return units to the bucket; negative amounts charge extra usage."""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, remaining: float):
+        """Never believe we have more capacity than the server reports."""
+        self._refill()
+        self.level = min(self.level, remaining)
+
+
+class RateLimiter:
+    """Process-wide limiter for model calls based on RPM and TPM token buckets.
+
+    Callers queue on a FIFO lock, so requests are admitted in arrival order.
+    Limits shrink to whatever the API reports in its rate-limit headers, and a
+    429 pauses every caller until the advertised reset time.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+        self._blocked_until = 0.0
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        """Wait until a request of ``estimated_tokens`` may be sent.
+
+        Returns the number of seconds spent waiting.
+        """
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                delay = max(
+                    self._blocked_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(estimated_tokens)
+                )
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+
+        waited = time.monotonic() - started
+        if waited > 1:
+            logger.debug(f"Rate limiter held request for {waited:.2f}s")
+        return waited
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Reconcile the token estimate with the usage the API reported."""
+        self.tokens.refund(estimated_tokens - actual_tokens)
+
+    def back_off(self, seconds: float):
+        """Pause all callers for ``seconds`` (e.g. after a 429)."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        logger.warning(f"Rate limited by API, pausing model calls for {seconds:.2f}s")
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Adapt bucket sizes and levels from ``x-ratelimit-*`` response headers."""
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            try:
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                if limit and float(limit) < bucket.capacity:
+                    logger.info(f"Adjusting {kind} per minute limit to {limit} from API headers")
+                    bucket.set_limit(float(limit))
+
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is not None:
+                    bucket.sync(float(remaining))
+            except ValueError:
+                logger.debug(f"Ignoring malformed rate-limit headers for {kind}")
+
+
+class NoRateLimit:
+    """Stands in for ``RateLimiter`` when the backend has no request or token quota."""
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        return 0.0
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        pass
+
+    def back_off(self, seconds: float):
+        pass
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        pass
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the limiter shared by every OpenAIService in this process."""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(settings.OPENAI_RPM_LIMIT, settings.OPENAI_TPM_LIMIT)
+    return _limiter
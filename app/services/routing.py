@@ -0,0 +1,49 @@
+# app/services/routing.py
+import re
+import logging
+from typing import List, Optional
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Minimum input size for the length ratio checks to be meaningful
+MIN_WORDS_FOR_RATIO = 50
+
+# Chat-style preambles and markup that should never appear in cleaned transcript text
+MALFORMED_PARAGRAPH = re.compile(
+    r"^(#|```|here is|here's|sure[,!]|certainly[,!])",
+    re.IGNORECASE
+)
+
+
+def cascade_models() -> List[str]:
+    """Models to try for chunk cleanup, cheapest first."""
+    return settings.CASCADE_MODELS or [settings.MODEL]
+
+
+def check_cleanup_output(source_text: str, paragraphs: List[str], finish_reason: str) -> Optional[str]:
+    """Cheap sanity checks on a cleanup response.
+
+    Returns the reason the output should be escalated to a stronger model,
+    or None if it looks acceptable.
+    """
+    if finish_reason == "length":
+        return "output truncated"
+    if not paragraphs:
+        return "empty output"
+
+    input_words = len(source_text.split())
+    output_words = sum(len(p.split()) for p in paragraphs)
+    if input_words >= MIN_WORDS_FOR_RATIO:
+        ratio = output_words / input_words
+        if ratio < settings.CASCADE_MIN_CONTENT_RATIO:
+            return f"lost content ({ratio:.2f} of input words)"
+        if ratio > settings.CASCADE_MAX_CONTENT_RATIO:
+            return f"output longer than input ({ratio:.2f} of input words)"
+
+    for paragraph in paragraphs:
+        if len(paragraph.split()) > settings.CASCADE_MAX_PARAGRAPH_WORDS:
+            return "paragraph too long"
+        if MALFORMED_PARAGRAPH.match(paragraph):
+            return "malformed paragraph"
+    return None
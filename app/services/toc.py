@@ -0,0 +1,209 @@
+# app/services/toc.py
+import asyncio
+import logging
+from typing import Dict, List, Tuple
+from app.core.settings import settings
+from app.services.openai import OpenAIService
+from app.services.chunking import count_tokens
+
+logger = logging.getLogger(__name__)
+
+WINDOW_PROMPT = """You are given a window of numbered paragraphs from a longer transcript.
+Each paragraph starts with its number in square brackets.
+
+Identify where new topics start within this window and summarize each section.
+
+Format your response as a JSON object with this exact structure:
+{
+    "chapters": [
+        {"start_paragraph_number": N, "title": "Section Title", "summary": "One or two sentences."},
+        ...
+    ]
+}
+
+Rules:
+- start_paragraph_number must be one of the bracketed paragraph numbers
+- The first section must start at the first paragraph of the window
+- Propose between 1 and 4 sections, in chronological order
+"""
+
+MERGE_PROMPT = """You are given candidate sections of a long transcript, in order.
+Each line has the section's starting paragraph number in square brackets, its title and a summary.
+
+Merge them into {target} coherent chapters that follow natural topic transitions.
+
+Format your response as a JSON object with this exact structure:
+{{
+    "chapters": [
+        {{"start_paragraph_number": N, "title": "Chapter Title", "summary": "One or two sentences."}},
+        ...
+    ]
+}}
+
+Rules:
+- start_paragraph_number must be one of the bracketed numbers from the input
+- The first chapter must start at the first candidate's paragraph number
+- Chapters must be in chronological order with clear, descriptive titles
+"""
+
+
+class HierarchicalTOCGenerator:
+    """Map-reduce table of contents generation for content of any length.
+
+    Short content goes to ``OpenAIService.generate_toc`` in a single call.
+    Longer content is split into token-bounded windows that are summarized
+    into candidate sections in parallel; candidates are then merged level by
+    level until one small call picks the final chapters. Every prompt stays
+    within ``settings.TOC_WINDOW_TOKENS`` regardless of content length.
+    """
+
+    def __init__(self, openai_service: OpenAIService):
+        self.openai_service = openai_service
+
+    async def generate_toc(self, paragraphs: List[Dict]) -> Tuple[List[Dict], int, int, float]:
+        """Generate chapters with ``start_paragraph_number`` and ``title`` keys."""
+        total_tokens = sum(count_tokens(p["paragraph_text"]) for p in paragraphs)
+        if total_tokens <= settings.TOC_DIRECT_TOKEN_LIMIT:
+            return await self.openai_service.generate_toc(paragraphs)
+
+        usage = [0, 0, 0.0]
+        try:
+            candidates = await self._map_windows(paragraphs, usage)
+            chapters = await self._reduce(candidates, len(paragraphs), usage)
+        except Exception as e:
+            logger.error(f"Error generating hierarchical TOC: {str(e)}")
+            chapters = []
+
+        if not chapters:
+            chapters = [{"start_paragraph_number": 0, "title": "Complete Content"}]
+
+        # The first chapter always starts at the beginning
+        chapters[0]["start_paragraph_number"] = 0
+        chapters = [
+            {"start_paragraph_number": c["start_paragraph_number"], "title": c["title"]}
+            for c in chapters
+        ]
+
+        input_tokens, output_tokens, price = usage
+        logger.info(f"Generated {len(chapters)} chapters hierarchically from {len(paragraphs)} paragraphs")
+        return chapters, input_tokens, output_tokens, price
+
+    async def _call(self, system_prompt: str, text: str, usage: List) -> List[Dict]:
+        """Run one JSON request, add its usage to ``usage`` and return its raw ``chapters`` list."""
+        data, input_tokens, output_tokens, price = await self.openai_service.complete_json(
+            system_prompt,
+            text,
+            max_tokens=settings.TOC_MAX_OUTPUT_TOKENS,
+            operation="toc"
+        )
+        usage[0] += input_tokens
+        usage[1] += output_tokens
+        usage[2] += price
+        chapters = data.get("chapters", [])
+        return chapters if isinstance(chapters, list) else []
+
+    @staticmethod
+    def _windows(items: List[str], token_budget: int) -> List[List[int]]:
+        """Group item indices into consecutive windows of at most ``token_budget`` tokens."""
+        windows = []
+        current = []
+        current_tokens = 0
+        for i, item in enumerate(items):
+            item_tokens = count_tokens(item)
+            if current and current_tokens + item_tokens > token_budget:
+                windows.append(current)
+                current = []
+                current_tokens = 0
+            current.append(i)
+            current_tokens += item_tokens
+        if current:
+            windows.append(current)
+        return windows
+
+    async def _gather_bounded(self, calls) -> List:
+        """Run coroutines with at most MAX_CONCURRENT_CHUNKS in flight, keeping order."""
+        semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_CHUNKS)
+
+        async def _run(call):
+            async with semaphore:
+                try:
+                    return await call
+                except Exception as e:
+                    logger.warning(f"TOC window request failed: {str(e)}")
+                    return []
+
+        return await asyncio.gather(*[_run(call) for call in calls])
+
+    async def _map_windows(self, paragraphs: List[Dict], usage: List) -> List[Dict]:
+        """Summarize paragraph windows in parallel into candidate sections."""
+        # Cap each paragraph so a single huge one cannot blow the window budget
+        labelled = [
+            f"[{i}] {p['paragraph_text'][:settings.TOC_WINDOW_TOKENS * 2]}"
+            for i, p in enumerate(paragraphs)
+        ]
+        windows = self._windows(labelled, settings.TOC_WINDOW_TOKENS)
+
+        results = await self._gather_bounded([
+            self._call(WINDOW_PROMPT, "\n\n".join(labelled[i] for i in window), usage)
+            for window in windows
+        ])
+
+        candidates = []
+        for window, chapters in zip(windows, results):
+            window_chapters = [
+                c for c in OpenAIService.validate_toc_chapters(chapters, len(paragraphs))
+                if window[0] <= c["start_paragraph_number"] <= window[-1]
+            ]
+            if not window_chapters:
+                window_chapters = [{
+                    "start_paragraph_number": window[0],
+                    "title": f"Part {len(candidates) + 1}"
+                }]
+            candidates.extend(window_chapters)
+
+        logger.debug(f"Proposed {len(candidates)} candidate sections from {len(windows)} windows")
+        return candidates
+
+    @staticmethod
+    def _format_candidates(candidates: List[Dict]) -> List[str]:
+        return [
+            f"[{c['start_paragraph_number']}] {c['title']}: {c.get('summary', '')}".strip()
+            for c in candidates
+        ]
+
+    async def _reduce(self, candidates: List[Dict], total_paragraphs: int, usage: List) -> List[Dict]:
+        """Merge candidates level by level until they fit one final call."""
+        while True:
+            lines = self._format_candidates(candidates)
+            windows = self._windows(lines, settings.TOC_WINDOW_TOKENS)
+            if len(windows) == 1:
+                break
+
+            # Intermediate level: condense each group of candidates
+            results = await self._gather_bounded([
+                self._call(MERGE_PROMPT.format(target="2-5"), "\n".join(lines[i] for i in window), usage)
+                for window in windows
+            ])
+
+            merged = []
+            for window, chapters in zip(windows, results):
+                group = [candidates[i] for i in window]
+                allowed = {c["start_paragraph_number"] for c in group}
+                group_chapters = [
+                    c for c in OpenAIService.validate_toc_chapters(chapters, total_paragraphs)
+                    if c["start_paragraph_number"] in allowed
+                ]
+                # Guarantee progress even if the model returns nothing usable
+                merged.extend(group_chapters or group[:max(1, len(group) // 2)])
+
+            if len(merged) >= len(candidates):
+                merged = merged[::2]
+            candidates = merged
+
+        chapters = await self._call(MERGE_PROMPT.format(target="3-7"), "\n".join(lines), usage)
+        allowed = {c["start_paragraph_number"] for c in candidates}
+        final = [
+            c for c in OpenAIService.validate_toc_chapters(chapters, total_paragraphs)
+            if c["start_paragraph_number"] in allowed
+        ]
+        return final or candidates
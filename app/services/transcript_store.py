@@ -0,0 +1,161 @@
+# app/services/transcript_store.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_SOURCES = ("captions", "whisper")
+
+
+def encode_segments(segments: List[Dict]) -> bytes:
+    """Pack ``{start, text}`` segments as zlib-compressed ``[[start, text], ...]`` JSON."""
+    rows = [[round(float(s["start"]), 3), s["text"]] for s in segments]
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_segments(data: bytes) -> List[Dict]:
+    return [{"start": start, "text": text} for start, text in json.loads(zlib.decompress(data))]
+
+
+class TranscriptStore:
+    """Persistent store of raw transcripts keyed by video id and language.
+
+    Transcripts are kept compressed in SQLite together with where they came
+    from (``captions`` or ``whisper``). Entries older than ``ttl_days`` are
+    dropped; when the store grows beyond ``max_size_mb`` the least recently
+    used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_size_mb: Optional[int] = None,
+        ttl_days: Optional[float] = None
+    ):
+        self.path = path or os.path.join(settings.CACHE_DIR, "transcripts", "transcripts.sqlite3")
+        self.max_size_bytes = (max_size_mb or settings.TRANSCRIPT_CACHE_MAX_SIZE_MB) * 1024 * 1024
+        self.ttl_seconds = (ttl_days or settings.TRANSCRIPT_CACHE_TTL_DAYS) * 24 * 3600
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS transcripts (
+                video_id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                source TEXT NOT NULL,
+                segments BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (video_id, language)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transcripts_last_access ON transcripts (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def language_key(languages: List[str]) -> str:
+        """Requested languages in preference order, e.g. ``en,de``."""
+        return ",".join(languages)
+
+    def get(self, video_id: str, languages: List[str]) -> Optional[Tuple[List[Dict], str]]:
+        """Return the stored segments and their source, or None if missing or expired."""
+        language = self.language_key(languages)
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT segments, source, created_at FROM transcripts "
+                    "WHERE video_id = ? AND language = ?",
+                    (video_id, language)
+                ).fetchone()
+                if row and time.time() - row[2] > self.ttl_seconds:
+                    self._conn.execute(
+                        "DELETE FROM transcripts WHERE video_id = ? AND language = ?",
+                        (video_id, language)
+                    )
+                    row = None
+                elif row:
+                    self._conn.execute(
+                        "UPDATE transcripts SET last_access = ? WHERE video_id = ? AND language = ?",
+                        (time.time(), video_id, language)
+                    )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading transcript store: {str(e)}")
+            return None
+
+        if not row:
+            return None
+        return decode_segments(row[0]), row[1]
+
+    def put(self, video_id: str, languages: List[str], segments: List[Dict], source: str):
+        """Store a transcript and evict expired or old entries if over budget."""
+        if source not in TRANSCRIPT_SOURCES:
+            raise ValueError(f"Unknown transcript source: {source}")
+
+        data = encode_segments(segments)
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO transcripts "
+                    "(video_id, language, source, segments, size, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (video_id, self.language_key(languages), source, data, len(data), now, now)
+                )
+                self._evict()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing transcript store: {str(e)}")
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under the size budget."""
+        expired = self._conn.execute(
+            "DELETE FROM transcripts WHERE created_at < ?",
+            (time.time() - self.ttl_seconds,)
+        ).rowcount
+        if expired:
+            logger.info(f"Evicted {expired} expired transcripts")
+
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT video_id, language, size FROM transcripts ORDER BY last_access ASC"
+        ).fetchall()
+        for video_id, language, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            self._conn.execute(
+                "DELETE FROM transcripts WHERE video_id = ? AND language = ?",
+                (video_id, language)
+            )
+            total_size -= size
+            evicted += 1
+
+        logger.info(f"Evicted {evicted} transcripts from transcript store")
+
+
+_store: Optional[TranscriptStore] = None
+
+
+def get_transcript_store() -> Optional[TranscriptStore]:
+    """Return the process-wide transcript store, or None if it is disabled."""
+    global _store
+    if not settings.TRANSCRIPT_CACHE_ENABLED:
+        return None
+    if _store is None:
+        _store = TranscriptStore()
+    return _store
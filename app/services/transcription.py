@@ -1,49 +1,155 @@
 # app/services/transcription.py
-from io import BytesIO
 import time
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import tempfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import logging
 from pytube import YouTube
 import replicate
-from typing import Dict, List
+from typing import IO, Dict, List, Optional
 from fastapi import HTTPException
 import os
 from app.core.settings import settings
+from app.utils.retry import RetryPolicy, get_circuit_breaker
+from app.services.audio_segments import SAMPLE_RATE, decode_pcm, split_audio
 
 
 logger = logging.getLogger(__name__)
 
+# Speech recognition pipeline loaded once in each local Whisper worker process
+_worker_pipeline = None
+
+
+def _init_whisper_worker(model_size: str, threads: int):
+    """Load the Whisper model in a worker process."""
+    global _worker_pipeline
+    import torch
+    from transformers import pipeline
+
+    torch.set_num_threads(threads)
+    _worker_pipeline = pipeline(
+        "automatic-speech-recognition",
+        model=f"openai/whisper-{model_size}",
+        device="cpu"
+    )
+
+
+WINDOW_SECONDS = 30
+
+
+def _transcribe_audio(path: str, batch_size: int) -> List[Dict]:
+    """Transcribe an audio file into ``{start, text}`` segments (runs in a worker process).
+
+    ffmpeg decodes the file to 16 kHz mono PCM on a pipe, which is read
+    ``batch_size`` 30 second windows at a time, so memory use does not grow
+    with the length of the audio.
+    """
+    window_samples = WINDOW_SECONDS * SAMPLE_RATE
+    segments = []
+    offset = 0.0
+    for samples in decode_pcm(path, window_samples * batch_size):
+        windows = [samples[i:i + window_samples] for i in range(0, len(samples), window_samples)]
+        outputs = _worker_pipeline(
+            [{"raw": window, "sampling_rate": SAMPLE_RATE} for window in windows],
+            batch_size=batch_size,
+            return_timestamps=True
+        )
+        for i, output in enumerate(outputs):
+            for chunk in output.get("chunks", []):
+                text = chunk["text"].strip()
+                if text:
+                    start = chunk["timestamp"][0] or 0.0
+                    segments.append({"start": offset + i * WINDOW_SECONDS + float(start), "text": text})
+        offset += len(windows) * WINDOW_SECONDS
+    return segments
+
+
+class _CappedWriter:
+    """File wrapper that refuses to grow past ``max_bytes``."""
+
+    def __init__(self, file: IO[bytes], max_bytes: int):
+        self.file = file
+        self.max_bytes = max_bytes
+        self.written = 0
+
+    def write(self, data: bytes) -> int:
+        self.written += len(data)
+        if self.written > self.max_bytes:
+            raise ValueError(f"Audio exceeds the {settings.MAX_DOWNLOAD_SIZE_MB} MB download limit")
+        return self.file.write(data)
+
+
+class LocalWhisperEngine:
+    """Runs Whisper speech-to-text on CPU in a pool of worker processes."""
+
+    def __init__(
+        self,
+        model_size: Optional[str] = None,
+        workers: Optional[int] = None,
+        threads: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.model_size = model_size or settings.WHISPER_MODEL_SIZE
+        self.batch_size = batch_size or settings.WHISPER_BATCH_SIZE
+        # Workers start on first use and keep their model loaded
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers or settings.WHISPER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_whisper_worker,
+            initargs=(self.model_size, threads or settings.WHISPER_THREADS)
+        )
+
+    async def transcribe(self, path: str) -> List[Dict]:
+        # Workers read the audio from disk instead of receiving it pickled
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _transcribe_audio, path, self.batch_size)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
 class TranscriptionService:
     def __init__(self):
-        self._ensure_replicate_token()
+        self.retry_policy = RetryPolicy()
+        self.engines = self._select_engines()
+        self.local_engine = LocalWhisperEngine() if "local" in self.engines else None
+        if "replicate" in self.engines:
+            # Set for replicate package
+            os.environ["REPLICATE_API_TOKEN"] = settings.REPLICATE_API_TOKEN
 
-    def _ensure_replicate_token(self):
-        """Ensure REPLICATE_API_TOKEN is set"""
-        if not settings.has_replicate_token:
-            raise ValueError(
-                "REPLICATE_API_TOKEN environment variable is not set. "
-                "Please set it in your .env file or environment variables."
-            )
-        # Set for replicate package
-        os.environ["REPLICATE_API_TOKEN"] = settings.REPLICATE_API_TOKEN
+    @staticmethod
+    def _select_engines() -> List[str]:
+        """Engines to try in order, from ``settings.TRANSCRIPTION_ENGINE``.
+
+        ``auto`` uses Replicate when a token is configured and falls back to
+        local Whisper if it fails; without a token only local Whisper is used.
+        """
+        engine = settings.TRANSCRIPTION_ENGINE
+        if engine == "local":
+            return ["local"]
+        if engine == "replicate":
+            if not settings.has_replicate_token:
+                logger.warning("TRANSCRIPTION_ENGINE is replicate but REPLICATE_API_TOKEN is not set")
+            return ["replicate"]
+        return ["replicate", "local"] if settings.has_replicate_token else ["local"]
+
+    def close(self):
+        """Shut down the local Whisper workers."""
+        if self.local_engine:
+            self.local_engine.close()
 
     async def transcribe_video(self, video_id: str) -> List[Dict]:
         """Main method to transcribe a YouTube video."""
-        if not settings.has_replicate_token:
-            raise ValueError("Replicate API token not configured")
-        
         try:
             start_time = time.time()
             
-            # Get video audio
-            buffer = await self._get_audio_buffer(video_id)
-            
-            # Get transcription
-            transcription = await self._get_transcription(buffer)
-            
-            # Format transcription
-            formatted_transcription = self._format_transcription(transcription)
+            # Get video audio; segmenting and the engines read it from disk
+            audio_path = await self._get_audio_file(video_id)
+            try:
+                formatted_transcription = await self._transcribe_segmented(audio_path, video_id)
+            finally:
+                os.remove(audio_path)
             
             end_time = time.time()
             logger.info(f"Transcription completed in {end_time - start_time:.2f} seconds")
@@ -54,31 +160,87 @@ class TranscriptionService:
             logger.error(f"Error transcribing video {video_id}: {str(e)}")
             raise
 
-    async def _get_audio_buffer(self, video_id: str) -> BytesIO:
-        """Download YouTube video audio into memory buffer."""
+    async def _transcribe_segmented(self, path: str, video_id: str) -> List[Dict]:
+        """Split long audio at quiet points and transcribe the segments concurrently.
+
+        Each segment's timestamps are shifted by its offset and the segments
+        are merged back in order, in the ``_format_transcription`` shape.
+        """
+        with tempfile.TemporaryDirectory(dir=settings.DOWNLOAD_DIR) as segment_dir:
+            segments = await asyncio.to_thread(
+                split_audio,
+                path,
+                segment_dir,
+                settings.TRANSCRIPTION_SEGMENT_MINUTES * 60,
+                settings.TRANSCRIPTION_SPLIT_SEARCH_SECONDS
+            )
+            semaphore = asyncio.Semaphore(settings.TRANSCRIPTION_SEGMENT_CONCURRENCY)
+
+            async def transcribe_segment(index: int, offset: float, segment_path: str) -> List[Dict]:
+                async with semaphore:
+                    transcript = await self._transcribe_file(segment_path, f"{video_id} segment {index}")
+                return [{"start": s["start"] + offset, "text": s["text"]} for s in transcript]
+
+            results = await asyncio.gather(*[
+                transcribe_segment(i, offset, segment_path)
+                for i, (offset, segment_path) in enumerate(segments)
+            ])
+        return [segment for result in results for segment in result]
+
+    async def _transcribe_file(self, path: str, description: str) -> List[Dict]:
+        """Transcribe one audio file, trying each configured engine in turn."""
+        for i, engine in enumerate(self.engines):
+            try:
+                if engine == "replicate":
+                    if not settings.has_replicate_token:
+                        raise ValueError("Replicate API token not configured")
+                    with open(path, "rb") as audio:
+                        transcription = await self._get_transcription(audio)
+                    return self._format_transcription(transcription)
+                return await self.local_engine.transcribe(path)
+            except Exception as e:
+                if i == len(self.engines) - 1:
+                    raise
+                logger.warning(f"{engine} transcription failed for {description}, trying {self.engines[i + 1]}: {str(e)}")
+
+    async def _get_audio_file(self, video_id: str) -> str:
+        """Stream YouTube video audio into a temporary file in ``DOWNLOAD_DIR``.
+
+        Downloads larger than ``MAX_DOWNLOAD_SIZE_MB`` are aborted. Returns the
+        file's path; the caller removes the file.
+        """
         try:
-            yt = YouTube(f"https://www.youtube.com/watch?v={video_id}")
-            
-            # Get best audio stream
-            audio_streams = yt.streams.filter(only_audio=True)
-            itag = self._get_webm_itag(audio_streams)
-            if not itag:
-                raise ValueError("No suitable audio stream found")
-                
-            stream = yt.streams.get_by_itag(itag)
-            
-            # Download to buffer
-            buffer = BytesIO()
-            stream.stream_to_buffer(buffer)
-            buffer.name = "audio.webm"
-            buffer.seek(0)
-            
-            return buffer
-            
+            return await asyncio.to_thread(self._download_audio, video_id)
         except Exception as e:
             logger.error(f"Error downloading audio for video {video_id}: {str(e)}")
             raise
 
+    def _download_audio(self, video_id: str) -> str:
+        yt = YouTube(f"https://www.youtube.com/watch?v={video_id}")
+        
+        # Get best audio stream
+        audio_streams = yt.streams.filter(only_audio=True)
+        itag = self._get_webm_itag(audio_streams)
+        if not itag:
+            raise ValueError("No suitable audio stream found")
+            
+        stream = yt.streams.get_by_itag(itag)
+        max_bytes = settings.MAX_DOWNLOAD_SIZE_MB * 1024 * 1024
+        if stream.filesize and stream.filesize > max_bytes:
+            raise ValueError(
+                f"Audio is {stream.filesize / 1024 / 1024:.0f} MB, "
+                f"over the {settings.MAX_DOWNLOAD_SIZE_MB} MB download limit"
+            )
+        
+        fd, path = tempfile.mkstemp(suffix=".webm", dir=settings.DOWNLOAD_DIR)
+        try:
+            with os.fdopen(fd, "wb") as audio:
+                stream.stream_to_buffer(_CappedWriter(audio, max_bytes))
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
     def _get_webm_itag(self, audio_streams) -> int:
         """Get itag for webm audio stream."""
         for stream in audio_streams:
@@ -86,15 +248,20 @@ class TranscriptionService:
                 return stream.itag
         return None
 
-    async def _get_transcription(self, buffer: BytesIO) -> Dict:
+    async def _get_transcription(self, audio: IO[bytes]) -> Dict:
         """Get transcription using Replicate's Whisper model."""
         try:
             loop = asyncio.get_event_loop()
             with ThreadPoolExecutor() as executor:
-                transcription = await loop.run_in_executor(
-                    executor,
-                    self._run_replicate,
-                    buffer
+                def attempt():
+                    # Each attempt re-uploads the audio from the start
+                    audio.seek(0)
+                    return loop.run_in_executor(executor, self._run_replicate, audio)
+
+                transcription = await self.retry_policy.call(
+                    attempt,
+                    breaker=get_circuit_breaker("replicate"),
+                    description="Replicate transcription"
                 )
             return transcription
             
@@ -102,12 +269,12 @@ class TranscriptionService:
             logger.error(f"Error during transcription: {str(e)}")
             raise
 
-    def _run_replicate(self, buffer: BytesIO) -> Dict:
-        """Run Replicate's Whisper model."""
+    def _run_replicate(self, audio: IO[bytes]) -> Dict:
+        """Run Replicate's Whisper model, uploading the audio from its file handle."""
         return replicate.run(
             "vaibhavs10/incredibly-fast-whisper:3ab86df6c8f54c11309d4d1f930ac292bad43ace52d10c80d87eb258b3c9f79c",
             input={
-                "audio": buffer,
+                "audio": audio,
                 "batch_size": 64
             }
         )
@@ -0,0 +1,52 @@
+# app/services/video_download.py
+import os
+import logging
+from typing import List, Tuple
+import yt_dlp
+from yt_dlp.utils import download_range_func
+
+logger = logging.getLogger(__name__)
+
+
+def section_path(output_dir: str, timestamp: float) -> str:
+    return os.path.join(output_dir, f"section_{int(timestamp)}.mp4")
+
+
+def download_sections(
+    url: str,
+    timestamps: List[float],
+    output_dir: str,
+    section_seconds: float
+) -> List[Tuple[float, str]]:
+    """Download ``section_seconds`` of video starting at each timestamp (blocking).
+
+    yt-dlp hands each range to ffmpeg, which fetches only the bytes it needs
+    with HTTP range requests. Cuts are re-encoded so every section starts
+    exactly at its timestamp. Returns ``(timestamp, section_path)`` for the
+    sections that were written; timestamps in the same second share one.
+    """
+    by_second = {int(t): t for t in sorted(timestamps, reverse=True)}
+    starts = sorted(by_second.values())
+    ydl_opts = {
+        'format': 'best[ext=mp4]',
+        'outtmpl': os.path.join(output_dir, 'section_%(section_start)d.%(ext)s'),
+        'download_ranges': download_range_func(None, [(t, t + section_seconds) for t in starts]),
+        'force_keyframes_at_cuts': True,
+        'quiet': True,
+        'no_warnings': True,
+        'nocheckcertificate': True,
+        'retries': 3,
+        'fragment_retries': 3,
+        'socket_timeout': 30,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl.download([url])
+
+    sections = []
+    for timestamp in starts:
+        path = section_path(output_dir, timestamp)
+        if os.path.exists(path):
+            sections.append((timestamp, path))
+        else:
+            logger.warning(f"Section at {timestamp:.1f}s of {url} was not downloaded")
+    return sections
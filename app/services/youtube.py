@@ -2,11 +2,14 @@
 
 import os
 import json
-import cv2
+import time
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 import asyncio
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from youtube_transcript_api import YouTubeTranscriptApi
 from fastapi import HTTPException
 import yt_dlp
@@ -14,20 +17,47 @@ from io import BytesIO
 
 from app.core.settings import settings
 from app.core.enums import ProcessingMode, ChapterSource
-from app.services.openai import OpenAIService
+from app.services.openai import OpenAIService, ParagraphCallback
+from app.services.job_stats import begin_job_stats
 from app.services.transcription import TranscriptionService
+from app.services.transcript_store import get_transcript_store
+from app.services.frames import FrameExtractor
+from app.services.video_download import download_sections
 from app.models.youtube import YouTubeResult, ProcessingStats, Chapter
 from app.services.chapters import ChaptersService
+from app.services.batch import BatchService
+from app.services.toc import HierarchicalTOCGenerator
+from app.utils.retry import RetryPolicy, get_circuit_breaker
 
 logger = logging.getLogger(__name__)
 
 class YouTubeService:
-    def __init__(self):
-        self.openai_service = OpenAIService()
-        self.transcription_service = TranscriptionService()
+    def __init__(
+        self,
+        openai_service: Optional[OpenAIService] = None,
+        transcription_service: Optional[TranscriptionService] = None,
+        frame_extractor: Optional[FrameExtractor] = None
+    ):
+        self.openai_service = openai_service or OpenAIService()
+        self.transcription_service = transcription_service or TranscriptionService()
+        self.frame_extractor = frame_extractor or FrameExtractor()
         self.chapters_service = ChaptersService()
+        self.batch_service = BatchService(self.openai_service)
+        self.toc_generator = HierarchicalTOCGenerator(self.openai_service)
+        self.transcript_retry = RetryPolicy()
+        # Bounds how many blocking transcript requests run at once
+        self.transcript_executor = ThreadPoolExecutor(
+            max_workers=settings.TRANSCRIPT_FETCH_WORKERS,
+            thread_name_prefix="transcript"
+        )
         self._ensure_directories()
 
+    def close(self):
+        """Shut down the transcript thread pool, transcription and frame workers."""
+        self.transcript_executor.shutdown(wait=False, cancel_futures=True)
+        self.transcription_service.close()
+        self.frame_extractor.close()
+
     def _ensure_directories(self):
         """Ensure all required directories exist."""
         dirs = [
@@ -39,23 +69,72 @@ class YouTubeService:
         for directory in dirs:
             os.makedirs(directory, exist_ok=True)
 
+    async def fetch_youtube_transcript(self, video_id: str, languages: List[str]) -> List[Dict[str, Any]]:
+        """Fetch captions on the transcript thread pool, without blocking the event loop.
+
+        Raises asyncio.TimeoutError if the request takes longer than
+        ``settings.TRANSCRIPT_FETCH_TIMEOUT`` seconds once a worker has picked
+        it up; time spent queued behind other fetches does not count, so a
+        busy pool is not mistaken for a failing captions service. A timed-out
+        worker thread is left to finish on its own.
+        """
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def fetch():
+            loop.call_soon_threadsafe(started.set)
+            return YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
+
+        future = loop.run_in_executor(self.transcript_executor, fetch)
+        try:
+            await started.wait()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        return await asyncio.wait_for(future, timeout=settings.TRANSCRIPT_FETCH_TIMEOUT)
+
     async def get_transcript(self, video_id: str, languages: List[str] = ["en"]) -> List[Dict[str, Any]]:
-        """Fetch transcript from YouTube video."""
+        """Fetch transcript from YouTube video.
+
+        Transcripts are kept in the transcript store, so processing a video
+        again (in any mode) skips fetching and transcription.
+        """
+        # The store is SQLite, so reads and writes run in a thread
+        store = get_transcript_store()
+        if store:
+            stored = await asyncio.to_thread(store.get, video_id, languages)
+            if stored:
+                transcript, source = stored
+                logger.info(f"Using stored {source} transcript for {video_id}")
+                return transcript
+
         try:
             # Try YouTube API first
-            transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
-            return [{'start': s['start'], 'text': s['text']} for s in transcript]
+            async def fetch():
+                return await self.fetch_youtube_transcript(video_id, languages)
+
+            transcript = await self.transcript_retry.call(
+                fetch,
+                breaker=get_circuit_breaker("youtube_transcript"),
+                description=f"Transcript fetch for {video_id}"
+            )
+            transcript = [{'start': s['start'], 'text': s['text']} for s in transcript]
+            if store:
+                await asyncio.to_thread(store.put, video_id, languages, transcript, "captions")
+            return transcript
         except Exception as e:
-            logger.warning(f"Failed to get YouTube transcript, falling back to Replicate: {str(e)}")
+            logger.warning(f"Failed to get YouTube transcript, falling back to transcription: {str(e)}")
             try:
-                # Fallback to Replicate transcription
+                # Fallback to Whisper transcription (Replicate or local)
                 transcript = await self.transcription_service.transcribe_video(video_id)
+                if store:
+                    await asyncio.to_thread(store.put, video_id, languages, transcript, "whisper")
                 return transcript
             except Exception as e2:
                 logger.error(f"Both transcript methods failed: {str(e2)}")
                 raise HTTPException(
                     status_code=500,
-                    detail="Failed to get transcript from both YouTube and Replicate"
+                    detail="Failed to get transcript from both YouTube captions and transcription"
                 )
 
     async def get_cached_result(self, video_id: str, cache_type: str) -> Optional[Dict]:
@@ -105,15 +184,34 @@ class YouTubeService:
             logger.error(f"Error saving cache file for {video_id}: {str(e)}")
             raise
 
-    async def process_simple(self, video_id: str) -> Tuple[List[Dict], int, int, float]:
+    async def process_simple(
+        self,
+        video_id: str,
+        paragraph_callback: Optional[ParagraphCallback] = None
+    ) -> Tuple[List[Dict], int, int, float]:
         """Process transcript in simple mode (no chunking)."""
         transcript = await self.get_transcript(video_id)
         
         # Combine all text into one string
         full_text = " ".join([t["text"] for t in transcript])
         
+        # Stream paragraphs to the caller while the single response is generated
+        on_paragraph = None
+        if paragraph_callback:
+            position = 0
+            start_time = float(transcript[0]["start"])
+
+            async def on_paragraph(text: str):
+                nonlocal position
+                await paragraph_callback(0, position, {"paragraph_text": text, "start_time": start_time})
+                position += 1
+        
         # Process with OpenAI in one go
-        response = await self.openai_service.process_chunk(full_text)
+        response = await self.openai_service.process_chunk(
+            full_text,
+            on_paragraph=on_paragraph,
+            operation="simple"
+        )
         
         # Create single paragraph with full content
         processed_text = [{
@@ -129,13 +227,20 @@ class YouTubeService:
         
         return processed_text, input_tokens, output_tokens, price
 
-    async def process_detailed(self, video_id: str) -> Tuple[List[Dict], int, int, float]:
+    async def process_detailed(
+        self,
+        video_id: str,
+        paragraph_callback: Optional[ParagraphCallback] = None,
+        progress_callback: Optional[Callable[[float, str], Awaitable[None]]] = None
+    ) -> Tuple[List[Dict], int, int, float]:
         """Process transcript in detailed mode (with chunking)."""
         transcript = await self.get_transcript(video_id)
         
         # Process with chunking
         processed_chunks, input_tokens, output_tokens, price = await self.openai_service.transcript_to_paragraphs(
-            transcript
+            transcript,
+            progress_callback=progress_callback,
+            paragraph_callback=paragraph_callback
         )
         
         # Ensure each chunk has a start_time
@@ -147,6 +252,16 @@ class YouTubeService:
         
         return processed_chunks, input_tokens, output_tokens, price
 
+    async def submit_batch(self, video_ids: List[str]) -> str:
+        """Fetch transcripts and submit all their chunks as one offline batch."""
+        transcripts = await asyncio.gather(*[self.get_transcript(video_id) for video_id in video_ids])
+        return await self.batch_service.submit_transcripts(dict(zip(video_ids, transcripts)))
+
+    async def process_batch(self, video_id: str, batch_id: str) -> Tuple[List[Dict], int, int, float]:
+        """Wait for a submitted batch and return the video's paragraphs."""
+        await self.batch_service.wait_for_completion(batch_id)
+        return await self.batch_service.get_paragraphs(batch_id, video_id)
+
     async def download_video(self, video_id: str) -> str:
         """Download video from YouTube using yt-dlp."""
         output_path = os.path.join(settings.DOWNLOAD_DIR, f"{video_id}.mp4")
@@ -205,14 +320,70 @@ class YouTubeService:
                     pass
             raise ValueError(f"Failed to download video: {str(e)}")
 
+    def uses_segment_downloads(self) -> bool:
+        """Whether screenshots come from short downloaded sections instead of the whole video.
+
+        Scene detection has to scan the whole video, so it always downloads it.
+        """
+        return settings.VIDEO_DOWNLOAD_MODE == "segments" and settings.SCREENSHOT_SELECTION != "scene"
+
+    async def download_video_segments(
+        self,
+        video_id: str,
+        timestamps: List[float],
+        output_dir: str,
+        url: Optional[str] = None
+    ) -> List[Tuple[float, str]]:
+        """Download only a few seconds of video at each timestamp into ``output_dir``."""
+        url = url or f"https://www.youtube.com/watch?v={video_id}"
+        try:
+            sections = await asyncio.wait_for(
+                asyncio.to_thread(
+                    download_sections,
+                    url,
+                    timestamps,
+                    output_dir,
+                    settings.SEGMENT_DOWNLOAD_SECONDS
+                ),
+                timeout=300
+            )
+            size = sum(os.path.getsize(path) for _, path in sections)
+            logger.info(f"Downloaded {len(sections)} sections of video {video_id} ({size / 1024 / 1024:.1f} MB)")
+            return sections
+        except Exception as e:
+            logger.error(f"Error downloading sections of video {video_id}: {str(e)}")
+            raise ValueError(f"Failed to download video sections: {str(e)}")
+
     async def process_detailed_with_screenshots(
         self,
         video_id: str,
-        screenshot_interval: int = 60
+        screenshot_interval: int = 60,
+        paragraph_callback: Optional[ParagraphCallback] = None,
+        progress_callback: Optional[Callable[[float, str], Awaitable[None]]] = None
     ) -> Tuple[List[Dict], List[str], int, int, float]:
-        """Process transcript in detailed mode with screenshots."""
-        # Get transcript and process text
-        processed_text, input_tokens, output_tokens, price = await self.process_detailed(video_id)
+        """Process transcript in detailed mode with screenshots.
+
+        The video is downloaded (and scanned for scene changes) while the
+        transcript is fetched and cleaned up, so a job takes about as long as
+        the slower of the two rather than their sum.
+        """
+        video_task = asyncio.create_task(self._prepare_video(video_id))
+        try:
+            # Get transcript and process text
+            processed_text, input_tokens, output_tokens, price = await self.process_detailed(
+                video_id,
+                paragraph_callback,
+                progress_callback
+            )
+        except BaseException:
+            video_task.cancel()
+            raise
+
+        try:
+            scene_timestamps = await video_task
+        except Exception as e:
+            logger.error(f"Continuing without screenshots for {video_id}: {str(e)}")
+            return processed_text, [], input_tokens, output_tokens, price
         
         # Verify all paragraphs have start_time
         for para in processed_text:
@@ -221,11 +392,12 @@ class YouTubeService:
                 raise ValueError("Paragraph processing failed: missing timestamp data")
         
         # Determine screenshot timestamps
-        timestamps = []
-        for para in processed_text:
-            current_time = float(para["start_time"])
-            if len(timestamps) == 0 or current_time - timestamps[-1] >= screenshot_interval:
-                timestamps.append(current_time)
+        timestamps = list(scene_timestamps)
+        if not timestamps:
+            for para in processed_text:
+                current_time = float(para["start_time"])
+                if len(timestamps) == 0 or current_time - timestamps[-1] >= screenshot_interval:
+                    timestamps.append(current_time)
         
         # Limit number of screenshots
         if len(timestamps) > settings.MAX_SCREENSHOTS_PER_VIDEO:
@@ -234,59 +406,112 @@ class YouTubeService:
         
         # Capture frames
         screenshots = await self.capture_video_frames(video_id, timestamps)
+        replacements = {}
+        if settings.SCREENSHOT_DEDUP_ENABLED and len(screenshots) > 1:
+            try:
+                mapping = await self.frame_extractor.dedupe(screenshots)
+                screenshots = [s for s in screenshots if mapping[s] == s]
+                replacements = {
+                    os.path.basename(path): os.path.basename(kept)
+                    for path, kept in mapping.items()
+                }
+            except Exception as e:
+                logger.error(f"Error deduplicating screenshots for {video_id}: {str(e)}")
         
         # Add screenshot references to processed text
         for para in processed_text:
-            nearest_timestamp = min(timestamps, key=lambda x: abs(x - float(para["start_time"])))
-            para["screenshot"] = f"{video_id}_{int(nearest_timestamp)}.jpg"
+            start_time = float(para["start_time"])
+            if settings.SCREENSHOT_SELECTION == "scene":
+                # The scene on screen is the last one that started before the paragraph
+                shown = [t for t in timestamps if t <= start_time]
+                timestamp = shown[-1] if shown else timestamps[0]
+            else:
+                timestamp = min(timestamps, key=lambda x: abs(x - start_time))
+            screenshot = f"{video_id}_{int(timestamp)}.jpg"
+            para["screenshot"] = replacements.get(screenshot, screenshot)
         
         return processed_text, screenshots, input_tokens, output_tokens, price
 
+    async def _prepare_video(self, video_id: str) -> List[float]:
+        """Download the video and, for scene-based selection, find its scene changes.
+
+        With segment downloads nothing is fetched up front; the sections are
+        downloaded once the screenshot timestamps are known.
+        """
+        if self.uses_segment_downloads():
+            return []
+        await self.download_video(video_id)
+        if settings.SCREENSHOT_SELECTION == "scene":
+            return await self.detect_scene_timestamps(video_id)
+        return []
+
+    async def detect_scene_timestamps(self, video_id: str) -> List[float]:
+        """Timestamps where the picture changes, for scene-based screenshot selection.
+
+        Returns an empty list if detection fails, so callers can fall back to
+        fixed-interval screenshots.
+        """
+        try:
+            video_path = await self.download_video(video_id)
+            timestamps = await self.frame_extractor.detect_scenes(video_path, settings.MAX_SCREENSHOTS_PER_VIDEO)
+            logger.info(f"Detected {len(timestamps)} scene changes in {video_id}")
+            return timestamps
+        except Exception as e:
+            logger.error(f"Error detecting scene changes for {video_id}: {str(e)}")
+            return []
+
     async def capture_video_frames(
         self,
         video_id: str,
         timestamps: List[float]
     ) -> List[str]:
-        """Capture frames from video at specified timestamps."""
-        try:
-            # First ensure we have the video
-            video_path = await self.download_video(video_id)
+        """Capture frames from video at specified timestamps.
 
+        In segments mode, timestamps whose section could not be downloaded or
+        read (e.g. a format yt-dlp cannot cut by range) are captured from a
+        full download instead.
+        """
+        try:
             frames = []
-            cap = cv2.VideoCapture(video_path)
-            
-            try:
-                if not cap.isOpened():
-                    raise ValueError(f"Failed to open video file: {video_path}")
-
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                logger.debug(f"Video FPS: {fps}")
+            missing = timestamps
+            if self.uses_segment_downloads():
+                frames = await self._capture_from_sections(video_id, timestamps)
+                captured = {os.path.basename(path) for path in frames}
+                missing = [t for t in timestamps if f"{video_id}_{int(t)}.jpg" not in captured]
+                if not missing:
+                    logger.debug(f"Captured {len(frames)} of {len(timestamps)} frames for {video_id}")
+                    return frames
+                logger.warning(
+                    f"{len(missing)} of {len(timestamps)} sections of {video_id} failed, "
+                    "capturing them from the full video"
+                )
 
-                for timestamp in timestamps:
-                    frame_num = int(timestamp * fps)
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-                    ret, frame = cap.read()
-                    
-                    if ret:
-                        frame_path = os.path.join(
-                            settings.SCREENSHOTS_DIR,
-                            f"{video_id}_{int(timestamp)}.jpg"
-                        )
-                        cv2.imwrite(frame_path, frame)
-                        frames.append(frame_path)
-                        logger.debug(f"Captured frame at timestamp {timestamp}")
-                    else:
-                        logger.warning(f"Failed to capture frame at timestamp {timestamp}")
+            # First ensure we have the video
+            video_path = await self.download_video(video_id)
 
-                return frames
-                
-            finally:
-                cap.release()
+            # Decoded in a single forward pass on a worker process
+            frames += await self.frame_extractor.extract(video_path, video_id, missing)
+            order = {f"{video_id}_{int(t)}.jpg": i for i, t in enumerate(timestamps)}
+            frames.sort(key=lambda path: order[os.path.basename(path)])
+            logger.debug(f"Captured {len(frames)} of {len(timestamps)} frames for {video_id}")
+            return frames
 
         except Exception as e:
             logger.error(f"Error capturing video frames: {str(e)}")
             return []
 
+    async def _capture_from_sections(self, video_id: str, timestamps: List[float]) -> List[str]:
+        """Capture frames from short downloaded sections, or none if that fails."""
+        segment_dir = tempfile.mkdtemp(prefix=f"{video_id}_", dir=settings.DOWNLOAD_DIR)
+        try:
+            sections = await self.download_video_segments(video_id, timestamps, segment_dir)
+            return await self.frame_extractor.extract_sections(video_id, sections)
+        except Exception as e:
+            logger.warning(f"Capturing frames from sections of {video_id} failed: {str(e)}")
+            return []
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+
     async def get_chapters(
         self,
         video_id: str,
@@ -308,7 +533,7 @@ class YouTubeService:
         paragraphs: List[Dict]
     ) -> Tuple[List[Dict], int, int, float]:
         """Generate chapters using OpenAI."""
-        chapters_data, input_tokens, output_tokens, price = await self.openai_service.generate_toc(paragraphs)
+        chapters_data, input_tokens, output_tokens, price = await self.toc_generator.generate_toc(paragraphs)
         
         standardized_chapters = []
         for chapter in chapters_data:
@@ -400,18 +625,33 @@ class YouTubeProcessingJob:
         job_id: str,
         video_id: str,
         mode: ProcessingMode = ProcessingMode.DETAILED,
-        chapter_source: ChapterSource = ChapterSource.AUTO
+        chapter_source: ChapterSource = ChapterSource.AUTO,
+        batch_id: Optional[str] = None,
+        *,
+        youtube_service: Optional[YouTubeService],
+        save: bool = True
     ):
+        """Create a job that processes with the shared ``youtube_service``.
+
+        Read-only snapshots rebuilt by ``load`` never process, so they pass
+        ``youtube_service=None`` and ``save=False`` (no status file is written).
+        """
         self.job_id = job_id
         self.video_id = video_id
         self.mode = mode
         self.chapter_source = chapter_source
+        self.batch_id = batch_id
         self.status = "pending"
         self.progress = 0.0
         self.result = None
         self.error = None
-        self.youtube_service = YouTubeService()
-        self._save_status()
+        # Streamed paragraphs keyed by (chunk_index, position)
+        self.partial_paragraphs: Dict[Tuple[int, int], Dict] = {}
+        self._last_partial_save = 0.0
+        self._deferred_partial_save: Optional[asyncio.Task] = None
+        self.youtube_service = youtube_service
+        if save:
+            self._save_status()
 
     def _save_status(self):
         """Save job status to cache."""
@@ -422,9 +662,14 @@ class YouTubeProcessingJob:
                 "video_id": self.video_id,
                 "mode": self.mode.value,
                 "chapter_source": self.chapter_source.value,
+                "batch_id": self.batch_id,
                 "status": self.status,
                 "progress": self.progress,
-                "error": self.error
+                "error": self.error,
+                "partial_paragraphs": [
+                    {"chunk_index": chunk_index, "position": position, **paragraph}
+                    for (chunk_index, position), paragraph in sorted(self.partial_paragraphs.items())
+                ]
             }
             
             # Handle result serialization
@@ -445,6 +690,38 @@ class YouTubeProcessingJob:
             logger.error(f"Error saving job status: {str(e)}")
             raise
 
+    @classmethod
+    def _from_status(cls, data: Dict) -> "YouTubeProcessingJob":
+        """Rebuild a read-only job snapshot from a saved status dict."""
+        job = cls(
+            data["job_id"],
+            data["video_id"],
+            ProcessingMode(data["mode"]),
+            ChapterSource(data["chapter_source"]),
+            data.get("batch_id"),
+            youtube_service=None,
+            save=False
+        )
+        job.status = data["status"]
+        job.progress = data["progress"]
+        job.error = data["error"]
+
+        for item in data.get("partial_paragraphs", []):
+            job.partial_paragraphs[(item["chunk_index"], item["position"])] = {
+                "paragraph_text": item["paragraph_text"],
+                "start_time": item["start_time"]
+            }
+
+        # Convert result back to Pydantic model if it exists
+        if data.get("result"):
+            try:
+                job.result = YouTubeResult(**data["result"])
+            except Exception as e:
+                logger.warning(f"Could not convert result to YouTubeResult model: {e}")
+                job.result = data["result"]
+
+        return job
+
     @staticmethod
     def load(job_id: str) -> "YouTubeProcessingJob":
         """Load job status from cache."""
@@ -455,27 +732,7 @@ class YouTubeProcessingJob:
         try:
             with open(status_path) as f:
                 data = json.load(f)
-                
-            job = YouTubeProcessingJob(
-                data["job_id"],
-                data["video_id"],
-                ProcessingMode(data["mode"]),
-                ChapterSource(data["chapter_source"])
-            )
-            
-            job.status = data["status"]
-            job.progress = data["progress"]
-            job.error = data["error"]
-            
-            # Convert result back to Pydantic model if it exists
-            if data.get("result"):
-                try:
-                    job.result = YouTubeResult(**data["result"])
-                except Exception as e:
-                    logger.warning(f"Could not convert result to YouTubeResult model: {e}")
-                    job.result = data["result"]
-                    
-            return job
+            return YouTubeProcessingJob._from_status(data)
             
         except Exception as e:
             logger.error(f"Error loading job {job_id}: {str(e)}")
@@ -514,39 +771,19 @@ class YouTubeProcessingJob:
             if not matching_jobs:
                 return None
 
-            matching_jobs.sort(reverse=True)
-            latest_job_data = matching_jobs[0][1]
-
-            job = cls(
-                latest_job_data["job_id"],
-                latest_job_data["video_id"],
-                ProcessingMode(latest_job_data["mode"]),
-                ChapterSource(latest_job_data["chapter_source"])
-            )
-            job.status = latest_job_data["status"]
-            job.progress = latest_job_data["progress"]
-            job.error = latest_job_data["error"]
-            
-            if latest_job_data.get("result"):
-                try:
-                    job.result = YouTubeResult(**latest_job_data["result"])
-                except Exception as e:
-                    logger.warning(f"Could not convert result to YouTubeResult model: {e}")
-                    job.result = latest_job_data["result"]
-
-            return job
+            matching_jobs.sort(key=lambda item: item[0], reverse=True)
+            return cls._from_status(matching_jobs[0][1])
 
         except Exception as e:
             logger.error(f"Failed to get latest job for video {video_id}: {str(e)}")
             return None
 
     @classmethod
-    async def get_completed_result(cls, video_id: str) -> YouTubeResult:
+    async def get_completed_result(cls, video_id: str, youtube_service: YouTubeService) -> YouTubeResult:
         """Get the completed result for a video."""
         try:
             # First check cached final result
-            service = YouTubeService()
-            cached_result = await service.get_cached_result(video_id, "final")
+            cached_result = await youtube_service.get_cached_result(video_id, "final")
             if cached_result:
                 return YouTubeResult(**cached_result)
 
@@ -592,17 +829,59 @@ class YouTubeProcessingJob:
                 detail=f"Failed to get video result: {str(e)}"
             )
 
+    async def add_partial_paragraph(self, chunk_index: int, position: int, paragraph: Optional[Dict]):
+        """Record a streamed paragraph so it can be served before the job finishes.
+
+        Position 0 starts a new response for the chunk, so whatever an earlier
+        attempt streamed is dropped; a None paragraph only drops it.
+        """
+        if position == 0 or paragraph is None:
+            for key in [key for key in self.partial_paragraphs if key[0] == chunk_index]:
+                del self.partial_paragraphs[key]
+        if paragraph is not None:
+            self.partial_paragraphs[(chunk_index, position)] = paragraph
+        now = time.monotonic()
+        wait = self._last_partial_save + settings.PARTIAL_SAVE_INTERVAL - now
+        if wait <= 0:
+            self._last_partial_save = now
+            self._save_status()
+        elif self._deferred_partial_save is None:
+            # Throttled; save once the interval is up even if nothing else streams in
+            self._deferred_partial_save = asyncio.create_task(self._save_partial_later(wait))
+
+    async def _save_partial_later(self, delay: float):
+        """Save paragraphs that arrived while saves were throttled."""
+        await asyncio.sleep(delay)
+        self._deferred_partial_save = None
+        self._last_partial_save = time.monotonic()
+        self._save_status()
+
+    def get_partial_paragraphs(self) -> List[Dict]:
+        """Paragraphs finished so far, in transcript order (the final ones once the job is done)."""
+        if isinstance(self.result, YouTubeResult):
+            return [
+                {"paragraph_text": text, "start_time": timestamp}
+                for chapter in self.result.chapters
+                for text, timestamp in zip(chapter.paragraphs, chapter.paragraph_timestamps)
+            ]
+        return [self.partial_paragraphs[key] for key in sorted(self.partial_paragraphs)]
+
     async def update_progress(self, progress: float, description: str = ""):
         """Update job progress."""
         self.progress = progress
         logger.info(f"Job {self.job_id}: {description} - {progress:.2%}")
         self._save_status()
 
+    async def update_chunk_progress(self, progress: float, description: str = ""):
+        """Report chunk cleanup progress (0 to 0.5) between job start and 0.5."""
+        await self.update_progress(0.1 + progress * 0.8, description)
+
     async def process(self):
         """Process YouTube video based on selected mode."""
         try:
             self.status = "processing"
             self._save_status()
+            job_stats = begin_job_stats()
             
             # Check cache first
             cache_key = "final"
@@ -626,22 +905,39 @@ class YouTubeProcessingJob:
             # Process based on mode
             if self.mode == ProcessingMode.SIMPLE:
                 paragraphs, input_tokens, output_tokens, price = await self.youtube_service.process_simple(
-                    self.video_id
+                    self.video_id,
+                    self.add_partial_paragraph
                 )
                 screenshots = []
                 await self.update_progress(0.5, "Simple processing completed")
             
             elif self.mode == ProcessingMode.DETAILED:
                 paragraphs, input_tokens, output_tokens, price = await self.youtube_service.process_detailed(
-                    self.video_id
+                    self.video_id,
+                    self.add_partial_paragraph,
+                    self.update_chunk_progress
                 )
                 screenshots = []
                 await self.update_progress(0.5, "Detailed processing completed")
             
+            elif self.mode == ProcessingMode.BATCH:
+                if not self.batch_id:
+                    self.batch_id = await self.youtube_service.submit_batch([self.video_id])
+                    self._save_status()
+                await self.update_progress(0.2, f"Waiting for batch {self.batch_id}")
+                paragraphs, input_tokens, output_tokens, price = await self.youtube_service.process_batch(
+                    self.video_id,
+                    self.batch_id
+                )
+                screenshots = []
+                await self.update_progress(0.5, "Batch results collected")
+            
             else:  # DETAILED_WITH_SCREENSHOTS
                 paragraphs, screenshots, input_tokens, output_tokens, price = await self.youtube_service.process_detailed_with_screenshots(
                     self.video_id,
-                    settings.DEFAULT_SCREENSHOT_INTERVAL
+                    settings.DEFAULT_SCREENSHOT_INTERVAL,
+                    self.add_partial_paragraph,
+                    self.update_chunk_progress
                 )
                 await self.update_progress(0.6, "Processing with screenshots completed")
 
@@ -695,12 +991,15 @@ class YouTubeProcessingJob:
                 stats=ProcessingStats(
                     total_input_tokens=input_tokens,
                     total_output_tokens=output_tokens,
-                    total_price=price
+                    total_price=price,
+                    **job_stats.as_dict()
                 )
             )
+            logger.info(f"Job {self.job_id} LLM cache: {job_stats.cache.as_dict()}")
 
-            # Save result
+            # Save result; streamed paragraphs are superseded by it
             self.result = final_result
+            self.partial_paragraphs.clear()
             await self.youtube_service.save_cache(
                 self.video_id,
                 cache_key,
@@ -0,0 +1,143 @@
+# app/utils/metrics.py
+import math
+import asyncio
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _label_set(labels: Dict[str, str]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Histogram:
+    """Keeps the most recent samples of a value for percentile queries."""
+
+    def __init__(self, max_samples: int):
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile over the retained samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        summary = {
+            "count": self.count,
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": ordered[-1] if ordered else 0.0
+        }
+        for q in PERCENTILES:
+            rank = max(1, math.ceil(q / 100 * len(ordered)))
+            summary[f"p{q}"] = ordered[rank - 1] if ordered else 0.0
+        return summary
+
+
+class MetricsRegistry:
+    """In-process registry of labelled counters and percentile histograms."""
+
+    def __init__(self, max_samples: Optional[int] = None):
+        self.max_samples = max_samples or settings.METRICS_MAX_SAMPLES
+        self._counters: Dict[Tuple[str, LabelSet], float] = defaultdict(float)
+        self._histograms: Dict[Tuple[str, LabelSet], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self._counters[(name, _label_set(labels))] += value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_set(labels))
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = Histogram(self.max_samples)
+            self._histograms[key].observe(value)
+
+    def percentile(self, name: str, q: float, **labels) -> Optional[float]:
+        """Percentile of a histogram, or None if it has no samples yet."""
+        with self._lock:
+            histogram = self._histograms.get((name, _label_set(labels)))
+            return histogram.percentile(q) if histogram else None
+
+    def sample_count(self, name: str, **labels) -> int:
+        with self._lock:
+            histogram = self._histograms.get((name, _label_set(labels)))
+            return len(histogram.samples) if histogram else 0
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """All counters and histogram summaries, for the metrics endpoint."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": round(value, 6)}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {"name": name, "labels": dict(labels), **histogram.summary()}
+                for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0])
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes up a periodic sleeper.
+
+    Lag well above zero means something is blocking the loop, such as
+    synchronous I/O or CPU-bound work inside a coroutine. Samples go to the
+    ``event_loop_lag_seconds`` histogram.
+    """
+
+    def __init__(self, interval: Optional[float] = None, registry: Optional[MetricsRegistry] = None):
+        self.interval = interval or settings.LOOP_LAG_INTERVAL
+        self.registry = registry or metrics
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.registry.observe("event_loop_lag_seconds", lag)
+            if lag > settings.LOOP_LAG_WARN_SECONDS:
+                logger.warning(f"Event loop was blocked for {lag:.2f}s")
@@ -0,0 +1,201 @@
+# app/utils/retry.py
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.core.settings import settings
+from app.services.rate_limiter import parse_reset_duration
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Transient network and throttling errors raised by openai, requests,
+# httpx and youtube_transcript_api, matched by name to avoid hard imports
+RETRYABLE_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "ConnectionError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "Timeout",
+    "ChunkedEncodingError",
+    "RemoteProtocolError",
+    "TooManyRequests",
+    "YouTubeRequestFailed",
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """HTTP status carried by an API error, if any."""
+    for attribute in ("status_code", "status"):
+        status = getattr(error, attribute, None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait, from a ``Retry-After`` header."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    return parse_reset_duration(headers.get("retry-after"))
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Classify an error as transient (retry) or fatal (fail immediately)."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    status = get_status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    """Stops calling a dependency after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    every call fails fast with CircuitOpenError. Once ``reset_timeout``
+    seconds have passed a single trial call is let through (half-open); its
+    outcome closes the breaker or opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or settings.CIRCUIT_BREAKER_RESET_SECONDS
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+
+    def before_call(self):
+        """Raise CircuitOpenError if calls are currently not allowed."""
+        if self.state == "closed":
+            return
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._trial_in_flight = False
+        if self.state == "half_open":
+            # A trial that never reported back (e.g. was cancelled) expires
+            trial_expired = time.monotonic() - self._trial_started >= self.reset_timeout
+            if not self._trial_in_flight or trial_expired:
+                self._trial_in_flight = True
+                self._trial_started = time.monotonic()
+                return
+        raise CircuitOpenError(f"Circuit breaker '{self.name}' is open, failing fast")
+
+    def record_success(self):
+        if self.state != "closed":
+            logger.info(f"Circuit breaker '{self.name}' closed")
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit breaker '{self.name}' opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for a dependency."""
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
+
+
+class RetryPolicy:
+    """Retries transient failures with exponential backoff and full jitter.
+
+    The delay before attempt ``n`` is uniform in ``[0, base_delay * backoff**n]``
+    capped at ``max_delay``; a server-provided Retry-After takes precedence.
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        backoff: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        retryable: Callable[[BaseException], bool] = is_retryable
+    ):
+        self.max_attempts = max_attempts or settings.MAX_RETRIES
+        self.base_delay = settings.RETRY_DELAY if base_delay is None else base_delay
+        self.backoff = backoff or settings.RETRY_BACKOFF
+        self.max_delay = max_delay or settings.RETRY_MAX_DELAY
+        self.retryable = retryable
+
+    def compute_delay(self, attempt: int, error: BaseException) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (0-based)."""
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * self.backoff ** attempt)
+        return random.uniform(0, ceiling)
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        breaker: Optional[CircuitBreaker] = None,
+        description: str = "call",
+        on_retry: Optional[Callable[[BaseException], None]] = None
+    ) -> Any:
+        """Await ``func()`` until it succeeds, fails fatally or attempts run out.
+
+        ``on_retry`` is called with the error before each retry.
+        """
+        for attempt in range(self.max_attempts):
+            if breaker:
+                breaker.before_call()
+            try:
+                result = await func()
+            except Exception as e:
+                retryable = self.retryable(e)
+                if breaker:
+                    # Throttling is handled by the rate limiter, and a fatal
+                    # error still means the dependency answered
+                    if retryable and get_status_code(e) != 429:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+
+                if not retryable or attempt == self.max_attempts - 1:
+                    logger.error(f"{description} failed after {attempt + 1} attempt(s): {str(e)}")
+                    raise
+
+                delay = self.compute_delay(attempt, e)
+                logger.warning(
+                    f"{description} failed (attempt {attempt + 1}/{self.max_attempts}), "
+                    f"retrying in {delay:.2f}s: {str(e)}"
+                )
+                if on_retry:
+                    on_retry(e)
+                await asyncio.sleep(delay)
+            else:
+                if breaker:
+                    breaker.record_success()
+                return result
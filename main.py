@@ -2,8 +2,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.settings import settings
-from app.api.routes import youtube, pdf
+from app.api.routes import youtube, pdf, metrics
 from app.utils.cache_cleanup import cleanup_old_cache_files
+from app.services.container import ServiceContainer
 import logging
 from contextlib import asynccontextmanager
 import sys
@@ -37,8 +38,11 @@ async def lifespan(app: FastAPI):
         logger.info("Beginning cache cleanup...")
         cleanup_old_cache_files()
         logger.info("Cache cleanup completed")
+        app.state.services = ServiceContainer()
+        await app.state.services.start()
         yield
         logger.info("Shutting down Video Processing API")
+        await app.state.services.close()
     except Exception as e:
         logger.error(f"Error during application lifecycle: {str(e)}", exc_info=True)
         sys.exit(1)  # Exit if there's a critical error
@@ -79,6 +83,11 @@ def create_application() -> FastAPI:
         prefix="/api/v1",
         tags=["PDF Processing"]
     )
+    application.include_router(
+        metrics.router,
+        prefix="/api/v1",
+        tags=["Metrics"]
+    )
 
     logger.info("Application created successfully")
     return application
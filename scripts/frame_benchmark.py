@@ -0,0 +1,93 @@
+# scripts/frame_benchmark.py
+"""Compare screenshot extraction strategies on a local video file.
+
+Times the old seek-per-frame capture against the single-pass extractor
+(with and without keyframe snapping) for evenly spaced timestamps:
+
+    python -m scripts.frame_benchmark video.mp4 --frames 50
+    python -m scripts.frame_benchmark --generate sample.mp4 --minutes 60
+
+``--generate`` first encodes a synthetic test video with ffmpeg, so the
+benchmark can run without downloading anything.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before the app settings are imported
+os.environ.setdefault("LLM_BACKEND", "mock")
+
+from app.services.frames import extract_frames, seek_per_frame  # noqa: E402
+
+
+def generate_video(path: str, minutes: int):
+    """Encode a 720p 30 fps H.264 test pattern with YouTube-like 2 second keyframes."""
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=30:duration={minutes * 60}",
+            "-c:v", "libx264", "-preset", "ultrafast", "-g", "60", "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart", path
+        ],
+        check=True
+    )
+
+
+def video_duration(path: str) -> float:
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(result.stdout.strip())
+
+
+def run(name: str, func, *args):
+    start = time.perf_counter()
+    written = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed:8.2f}s  {len(written)} frames")
+
+
+def main(args):
+    if args.generate:
+        print(f"Generating {args.minutes} minute test video at {args.generate}")
+        generate_video(args.generate, args.minutes)
+    video_path = args.generate or args.video
+
+    duration = video_duration(video_path)
+    # Offset from the grid so timestamps rarely fall on keyframes by chance
+    timestamps = [duration * (i + 0.37) / args.frames for i in range(args.frames)]
+    print(f"{video_path}: {duration / 60:.1f} minutes, {args.frames} frames")
+
+    output_dir = tempfile.mkdtemp(prefix="frame_benchmark_")
+    try:
+        def targets(prefix):
+            return [(t, os.path.join(output_dir, f"{prefix}_{int(t)}.jpg")) for t in timestamps]
+
+        run("seek per frame", seek_per_frame, video_path, targets("seek"))
+        run("single pass", extract_frames, video_path, targets("pass"), 0.0, args.seek_gap)
+        run("single pass, keyframe snap", extract_frames, video_path, targets("snap"), args.snap, args.seek_gap)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", nargs="?", help="Local video file")
+    parser.add_argument("--generate", help="Encode a synthetic test video to this path and use it")
+    parser.add_argument("--minutes", type=int, default=60, help="Length of the generated video")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--snap", type=float, default=2.0, help="Keyframe snap tolerance in seconds")
+    parser.add_argument("--seek-gap", type=float, default=1.0, help="Seek over gaps longer than this when keyframes are unknown")
+    args = parser.parse_args()
+    if not args.video and not args.generate:
+        parser.error("a video path or --generate is required")
+    main(args)
@@ -0,0 +1,175 @@
+# scripts/load_test.py
+"""Measure end-to-end job throughput against the in-process mock LLM backend.
+
+Runs concurrent YouTubeProcessingJob (with synthetic transcripts) and,
+optionally, PDF ProcessingJob instances without touching the network:
+
+    python -m scripts.load_test --jobs 20 --minutes 60
+    python -m scripts.load_test --jobs 10 --pdf sample.pdf --error-rate 0.05
+    python -m scripts.load_test --jobs 20 --latency-sigma 1.0 --hedge
+    python -m scripts.load_test --jobs 20 --transcript-latency 2.0
+
+Transcripts come from a stand-in for YouTubeTranscriptApi that blocks for
+``--transcript-latency`` seconds like the real network call; the event loop
+lag printed at the end shows whether anything stalled the loop.
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import statistics
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before the app settings are imported
+os.environ.setdefault("LLM_BACKEND", "mock")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("TRANSCRIPT_CACHE_ENABLED", "false")
+
+from app.core.settings import settings  # noqa: E402
+from app.core.enums import ProcessingMode, ChapterSource  # noqa: E402
+from app.services.llm_backends import MockLLMBackend, set_llm_backend  # noqa: E402
+from app.services import youtube as youtube_module  # noqa: E402
+from app.services.youtube import YouTubeProcessingJob  # noqa: E402
+from app.services.pdf import ProcessingJob  # noqa: E402
+from app.services.container import ServiceContainer  # noqa: E402
+from app.utils.metrics import metrics  # noqa: E402
+
+WORDS = (
+    "so the model basically learns a mapping from inputs to outputs and um "
+    "we can think about gradients loss functions data pipelines and you know "
+    "evaluation metrics that actually matter in production systems"
+).split()
+
+
+class SyntheticTranscriptApi:
+    """Stands in for YouTubeTranscriptApi, blocking like the real network call."""
+
+    latency = 0.0
+    transcripts: Dict[str, List[Dict]] = {}
+
+    @classmethod
+    def get_transcript(cls, video_id: str, languages: List[str] = ["en"]) -> List[Dict]:
+        time.sleep(cls.latency)
+        return cls.transcripts[video_id]
+
+
+def synthetic_transcript(minutes: int, seed: int) -> List[Dict]:
+    """Caption-like segments of roughly three seconds each."""
+    rng = random.Random(seed)
+    segments = []
+    for i in range(minutes * 20):
+        words = rng.choices(WORDS, k=rng.randint(6, 14))
+        segments.append({"start": i * 3.0, "text": " ".join(words) + rng.choice([".", ",", "?", ""])})
+    return segments
+
+
+async def run_youtube_job(
+    index: int,
+    args,
+    services: ServiceContainer,
+    durations: List[float]
+):
+    video_id = f"loadtest{int(time.time())}_{index}"
+    SyntheticTranscriptApi.transcripts[video_id] = synthetic_transcript(args.minutes, index)
+    job = YouTubeProcessingJob(
+        f"yt_job_{time.strftime('%Y%m%d_%H%M%S')}_{video_id}",
+        video_id,
+        ProcessingMode.DETAILED,
+        ChapterSource.AUTO,
+        youtube_service=services.youtube_service
+    )
+
+    started = time.monotonic()
+    await job.process()
+    durations.append(time.monotonic() - started)
+    await job.cleanup()
+
+
+async def run_pdf_job(index: int, filename: str, services: ServiceContainer, durations: List[float]):
+    job = ProcessingJob(f"job_loadtest_{index}_{int(time.time())}", filename, services.pdf_service)
+    started = time.monotonic()
+    await job.process()
+    durations.append(time.monotonic() - started)
+
+
+def report(label: str, durations: List[float], wall_clock: float):
+    if not durations:
+        return
+    durations = sorted(durations)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+    print(
+        f"{label}: {len(durations)} jobs in {wall_clock:.1f}s "
+        f"({len(durations) / wall_clock * 60:.1f} jobs/min), "
+        f"p50 {statistics.median(durations):.1f}s, p95 {p95:.1f}s, p99 {p99:.1f}s"
+    )
+
+
+async def main(args):
+    settings.HEDGE_ENABLED = args.hedge
+    backend = MockLLMBackend(
+        latency_median=args.latency,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    )
+    set_llm_backend(backend)
+    # Synthetic captions instead of YouTube, so only the LLM path is measured
+    SyntheticTranscriptApi.latency = args.transcript_latency
+    youtube_module.YouTubeTranscriptApi = SyntheticTranscriptApi
+
+    services = ServiceContainer()
+    await services.start()
+
+    youtube_durations: List[float] = []
+    pdf_durations: List[float] = []
+    tasks = [run_youtube_job(i, args, services, youtube_durations) for i in range(args.jobs)]
+
+    if args.pdf:
+        filename = os.path.basename(args.pdf)
+        shutil.copyfile(args.pdf, os.path.join(settings.UPLOAD_DIR, filename))
+        tasks += [run_pdf_job(i, filename, services, pdf_durations) for i in range(args.jobs)]
+
+    started = time.monotonic()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    wall_clock = time.monotonic() - started
+    await services.close()
+
+    failures = [r for r in results if isinstance(r, Exception)]
+    report("YouTube", youtube_durations, wall_clock)
+    report("PDF", pdf_durations, wall_clock)
+    print(f"Failed jobs: {len(failures)}")
+    print(f"Mock backend: {backend.stats()}")
+    for histogram in metrics.snapshot()["histograms"]:
+        if histogram["name"] == "event_loop_lag_seconds":
+            print(
+                f"Event loop lag: n={histogram['count']} p50 {histogram['p50']:.3f}s "
+                f"p99 {histogram['p99']:.3f}s max {histogram['max']:.3f}s"
+            )
+        elif histogram["name"] in ("llm_latency_seconds", "llm_queue_wait_seconds"):
+            print(
+                f"{histogram['name']} {histogram['labels']['operation']}: "
+                f"n={histogram['count']} p50 {histogram['p50']:.2f}s "
+                f"p95 {histogram['p95']:.2f}s p99 {histogram['p99']:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10, help="Concurrent jobs per job type")
+    parser.add_argument("--minutes", type=int, default=30, help="Length of each synthetic video")
+    parser.add_argument("--pdf", help="PDF to process alongside the YouTube jobs")
+    parser.add_argument("--latency", type=float, default=settings.MOCK_LLM_LATENCY_MEDIAN)
+    parser.add_argument("--latency-sigma", type=float, default=settings.MOCK_LLM_LATENCY_SIGMA)
+    parser.add_argument("--transcript-latency", type=float, default=0.5, help="Seconds each transcript fetch blocks")
+    parser.add_argument("--hedge", action="store_true", help="Hedge slow chunk requests")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,132 @@
+# scripts/segment_download_check.py
+"""Check segment-only downloads against a local HTTP server with range support.
+
+Serves a local MP4 over HTTP (honouring Range requests, like a CDN), runs
+the section downloader used in ``VIDEO_DOWNLOAD_MODE=segments`` against it
+and reports how many bytes were transferred and written compared with the
+whole file:
+
+    python -m scripts.segment_download_check video.mp4 --frames 50
+
+Needs ffmpeg on the PATH, as yt-dlp cuts the sections with it. Use
+``python -m scripts.frame_benchmark --generate sample.mp4`` to make a test
+video; it has to have its index at the front (``-movflags +faststart``)
+for ffmpeg to seek without reading the whole file.
+"""
+import os
+import re
+import sys
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.video_download import download_sections  # noqa: E402
+
+RANGE_HEADER = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler that serves single byte ranges and counts bytes sent."""
+
+    bytes_sent = 0
+    requests = 0
+    lock = threading.Lock()
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        match = RANGE_HEADER.match(self.headers.get("Range", ""))
+        if not match or not os.path.isfile(path):
+            return super().send_head()
+
+        size = os.path.getsize(path)
+        first, last = match.groups()
+        if first:
+            start, end = int(first), min(int(last) if last else size - 1, size - 1)
+        else:
+            start, end = max(size - int(last), 0), size - 1
+        if start >= size:
+            self.send_error(416, "Requested range not satisfiable")
+            return None
+
+        file = open(path, "rb")
+        file.seek(start)
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.remaining = end - start + 1
+        return file
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, "remaining", None)
+        sent = 0
+        try:
+            while remaining is None or sent < remaining:
+                block = source.read(64 * 1024 if remaining is None else min(64 * 1024, remaining - sent))
+                if not block:
+                    break
+                outputfile.write(block)
+                sent += len(block)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg drops connections once it has what it needs
+        finally:
+            with self.lock:
+                RangeRequestHandler.bytes_sent += sent
+                RangeRequestHandler.requests += 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def video_duration(path: str) -> float:
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(result.stdout.strip())
+
+
+def main(args):
+    video_path = os.path.abspath(args.video)
+    file_size = os.path.getsize(video_path)
+    duration = video_duration(video_path)
+    timestamps = [duration * (i + 0.5) / args.frames for i in range(args.frames)]
+
+    handler = lambda *a, **kw: RangeRequestHandler(*a, directory=os.path.dirname(video_path), **kw)  # noqa: E731
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/{os.path.basename(video_path)}"
+
+    output_dir = tempfile.mkdtemp(prefix="segment_check_")
+    try:
+        sections = download_sections(url, timestamps, output_dir, args.seconds)
+        written = sum(os.path.getsize(path) for _, path in sections)
+    finally:
+        server.shutdown()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    print(f"{video_path}: {file_size / 1024 / 1024:.1f} MB, {duration / 60:.1f} minutes")
+    print(f"Sections downloaded: {len(sections)} of {len(timestamps)}")
+    print(f"HTTP requests:       {RangeRequestHandler.requests}")
+    print(
+        f"Bytes transferred:   {RangeRequestHandler.bytes_sent / 1024 / 1024:.1f} MB "
+        f"({RangeRequestHandler.bytes_sent / file_size:.1%} of the file)"
+    )
+    print(f"Bytes written:       {written / 1024 / 1024:.1f} MB ({written / file_size:.1%} of the file)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", help="Local MP4 file to serve")
+    parser.add_argument("--frames", type=int, default=50, help="Number of screenshot timestamps")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Length of each section")
+    main(parser.parse_args())
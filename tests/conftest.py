@@ -0,0 +1,29 @@
+# tests/conftest.py
+import os
+import tempfile
+import pytest
+
+# Must be set before the app settings are imported
+_data_dir = tempfile.mkdtemp(prefix="ssrebirth_tests_")
+os.environ.setdefault("LLM_BACKEND", "mock")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("TRANSCRIPT_CACHE_ENABLED", "false")
+for name in ("CACHE_DIR", "DOWNLOAD_DIR", "UPLOAD_DIR", "OUTPUT_DIR", "SCREENSHOTS_DIR", "BATCH_DIR"):
+    os.environ.setdefault(name, os.path.join(_data_dir, name.lower()))
+
+
+@pytest.fixture
+def mock_backend(monkeypatch):
+    """A fast, error-free mock LLM backend installed for the duration of a test."""
+    from app.services import llm_backends
+
+    backend = llm_backends.MockLLMBackend(
+        latency_median=0.001,
+        latency_sigma=0.0,
+        tokens_per_second=100000,
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        seed=1
+    )
+    monkeypatch.setattr(llm_backends, "_backend", backend)
+    return backend
@@ -0,0 +1,42 @@
+# tests/test_audio_segments.py
+import numpy as np
+from app.services.audio_segments import find_split_points
+
+FRAME_SECONDS = 0.1
+
+
+def envelope(seconds: float, quiet=()):
+    """Constant loudness with silent ``(start, end)`` stretches."""
+    values = np.ones(int(seconds / FRAME_SECONDS), dtype=np.float32)
+    for start, end in quiet:
+        values[int(start / FRAME_SECONDS):int(end / FRAME_SECONDS)] = 0.0
+    return values
+
+
+def test_cuts_land_in_the_pause_nearest_each_target():
+    points = find_split_points(envelope(300, quiet=[(95, 97), (212, 214)]), FRAME_SECONDS, 100, 20)
+
+    assert len(points) == 2
+    assert 95 <= points[0] <= 97
+    assert 212 <= points[1] <= 214
+
+
+def test_targets_follow_the_previous_cut():
+    # The second target is 100 s after the first cut at 85 s, not at 200 s
+    points = find_split_points(envelope(300, quiet=[(84, 86), (184, 186), (204, 206)]), FRAME_SECONDS, 100, 20)
+
+    assert 84 <= points[0] <= 86
+    assert 184 <= points[1] <= 186
+
+
+def test_short_audio_is_not_split():
+    assert find_split_points(envelope(140), FRAME_SECONDS, 100, 20) == []
+    assert find_split_points(np.zeros(0, dtype=np.float32), FRAME_SECONDS, 100, 20) == []
+
+
+def test_no_short_final_segment():
+    # The pause at 215 s is in the search window but would leave only 35 s
+    points = find_split_points(envelope(250, quiet=[(98, 100), (215, 217)]), FRAME_SECONDS, 100, 20)
+
+    assert len(points) == 2
+    assert 250 - points[-1] >= 50
@@ -0,0 +1,50 @@
+# tests/test_batch.py
+import asyncio
+import json
+import pytest
+from app.core.settings import settings
+from app.services.batch import BatchBackend, BatchService, LocalBatchBackend, parse_batch_output
+from app.services.openai import OpenAIService
+
+
+def test_batch_backend_cannot_be_instantiated_without_its_methods():
+    class Incomplete(BatchBackend):
+        async def submit(self, input_path: str) -> str:
+            return "batch"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_parse_batch_output_marks_failed_requests():
+    content = "\n".join(json.dumps(record) for record in [
+        {"custom_id": "a:0", "response": {"status_code": 200, "body": {"id": "ok"}}, "error": None},
+        {"custom_id": "a:1", "response": {"status_code": 500, "body": {}}, "error": None},
+        {"custom_id": "a:2", "response": None, "error": {"message": "expired"}},
+    ]) + "\n\n"
+
+    assert parse_batch_output(content) == {"a:0": {"id": "ok"}, "a:1": None, "a:2": None}
+
+
+def test_local_batch_round_trip(tmp_path, mock_backend, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_DIR", str(tmp_path))
+    service = BatchService(OpenAIService(), LocalBatchBackend(str(tmp_path / "local")))
+    transcripts = {
+        "video1": [{"start": 0.0, "text": "first video text"}, {"start": 4.0, "text": "more of it"}],
+        "video2": [{"start": 10.0, "text": "second video"}],
+    }
+
+    async def run():
+        batch_id = await service.submit_transcripts(transcripts)
+        await service.wait_for_completion(batch_id)
+        return (
+            await service.get_paragraphs(batch_id, "video1"),
+            await service.get_paragraphs(batch_id, "video2"),
+        )
+
+    (video1, *_), (video2, *_) = asyncio.run(run())
+
+    assert " ".join(p["paragraph_text"] for p in video1) == "first video text more of it"
+    assert video1[0]["start_time"] == 0.0
+    assert " ".join(p["paragraph_text"] for p in video2) == "second video"
+    assert video2[0]["start_time"] == 10.0
@@ -0,0 +1,62 @@
+# tests/test_chunking.py
+import pytest
+from app.core.settings import settings
+from app.services import chunking
+from app.services.chunking import chunk_text, chunk_transcript, output_token_budget
+
+
+@pytest.fixture
+def word_tokens(monkeypatch):
+    """Count one token per word so chunk boundaries are exact."""
+    monkeypatch.setattr(chunking, "count_tokens", lambda text, model=None: len(text.split()))
+
+
+def test_chunk_text_packs_words_up_to_the_budget(word_tokens):
+    chunks = chunk_text("one two three four five six seven", token_budget=3)
+
+    assert [c["text"] for c in chunks] == ["one two three", "four five six", "seven"]
+    assert [c["tokens"] for c in chunks] == [3, 3, 1]
+
+
+def test_chunk_transcript_keeps_segments_whole_and_records_start_times(word_tokens):
+    transcript = [
+        {"start": 0.0, "text": "a b"},
+        {"start": 2.0, "text": "c d"},
+        {"start": 4.0, "text": "  "},
+        {"start": 5.0, "text": "e f g"},
+    ]
+
+    chunks = chunk_transcript(transcript, token_budget=4)
+
+    assert chunks == [
+        {"text": "a b c d", "start_time": 0.0, "tokens": 4},
+        {"text": "e f g", "start_time": 5.0, "tokens": 3},
+    ]
+
+
+def test_chunk_transcript_splits_oversized_segments_on_words(word_tokens):
+    transcript = [{"start": 0.0, "text": "a"}, {"start": 1.0, "text": "b c d e f"}]
+
+    chunks = chunk_transcript(transcript, token_budget=2)
+
+    assert [(c["text"], c["start_time"]) for c in chunks] == [
+        ("a", 0.0),
+        ("b c", 1.0),
+        ("d e", 1.0),
+        ("f", 1.0),
+    ]
+
+
+def test_chunks_respect_budget_with_the_real_tokenizer():
+    text = " ".join(f"word{i} and some filler text," for i in range(500))
+
+    chunks = chunk_text(text, token_budget=100)
+
+    assert len(chunks) > 1
+    assert all(c["tokens"] <= 100 for c in chunks)
+    assert " ".join(c["text"] for c in chunks) == text
+
+
+def test_output_token_budget_scales_with_input_and_is_capped():
+    assert output_token_budget(100) == int(100 * settings.OUTPUT_TOKEN_RATIO) + settings.OUTPUT_TOKEN_MARGIN
+    assert output_token_budget(10 ** 7) == settings.MAX_TOKENS
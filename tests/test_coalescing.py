@@ -0,0 +1,88 @@
+# tests/test_coalescing.py
+import asyncio
+import httpx
+import pytest
+from openai import APIConnectionError
+from app.services.openai import OpenAIService
+
+SYSTEM = "Clean up the text."
+
+
+@pytest.fixture
+def gated_backend(mock_backend, monkeypatch):
+    """Requests wait on a gate before answering, so identical callers overlap."""
+    create = mock_backend.create
+    gate = {"event": None, "error": None}
+
+    async def create_after_gate(request, stream=False):
+        await gate["event"].wait()
+        if gate["error"]:
+            raise gate["error"]
+        return await create(request, stream)
+
+    monkeypatch.setattr(mock_backend, "create", create_after_gate)
+    monkeypatch.setattr(OpenAIService, "_in_flight", {})
+    return gate
+
+
+def completion(service):
+    return service._create_completion(SYSTEM, "hello world", 50)
+
+
+def test_identical_concurrent_calls_send_one_request(gated_backend, mock_backend):
+    service = OpenAIService()
+
+    async def run():
+        gated_backend["event"] = asyncio.Event()
+        tasks = [asyncio.create_task(completion(service)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        gated_backend["event"].set()
+        return await asyncio.gather(*tasks)
+
+    responses = asyncio.run(run())
+
+    assert mock_backend.requests == 1
+    assert len({r.choices[0].message.content for r in responses}) == 1
+    # Only the leader's response carries usage; followers were not billed
+    assert sorted(r.usage.prompt_tokens > 0 for r in responses) == [False] * 4 + [True]
+    assert OpenAIService._in_flight == {}
+
+
+def test_follower_takes_over_when_the_leader_is_cancelled(gated_backend, mock_backend):
+    service = OpenAIService()
+
+    async def run():
+        gated_backend["event"] = asyncio.Event()
+        leader = asyncio.create_task(completion(service))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(completion(service))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        await asyncio.sleep(0.01)
+        gated_backend["event"].set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    response = asyncio.run(run())
+
+    assert response.usage.prompt_tokens > 0
+    assert mock_backend.requests == 1
+
+
+def test_leader_error_reaches_every_waiter(gated_backend):
+    service = OpenAIService()
+    error = APIConnectionError(request=httpx.Request("POST", "http://mock-llm/v1/chat/completions"))
+
+    async def run():
+        gated_backend["event"] = asyncio.Event()
+        gated_backend["error"] = error
+        tasks = [asyncio.create_task(completion(service)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        gated_backend["event"].set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert results == [error] * 3
+    assert OpenAIService._in_flight == {}
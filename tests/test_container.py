@@ -0,0 +1,58 @@
+# tests/test_container.py
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.routes import youtube as youtube_routes
+from app.core.settings import settings
+from app.services import llm_backends
+from app.services.container import ServiceContainer
+from app.services.youtube import YouTubeProcessingJob
+
+
+def test_openai_backend_uses_the_pooled_client(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BACKEND", "openai")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(llm_backends, "_backend", None)
+    services = ServiceContainer()
+
+    async def run():
+        await services.start()
+        http_client = services.http_client
+        backend = llm_backends.get_llm_backend()
+        assert backend.client._client is http_client
+        assert services.openai_service.backend is backend
+        assert services.youtube_service.openai_service is services.openai_service
+        assert services.pdf_service.openai_service is services.openai_service
+        await services.close()
+        return http_client
+
+    http_client = asyncio.run(run())
+
+    assert http_client.is_closed and services.http_client is None
+
+
+def test_jobs_are_given_the_containers_service(mock_backend, monkeypatch):
+    services = ServiceContainer()
+
+    @asynccontextmanager
+    async def lifespan(application):
+        await services.start()
+        application.state.services = services
+        yield
+        await services.close()
+
+    application = FastAPI(lifespan=lifespan)
+    application.include_router(youtube_routes.router, prefix="/api/v1")
+    used = []
+
+    async def process(job):
+        used.append(job.youtube_service)
+
+    monkeypatch.setattr(YouTubeProcessingJob, "process", process)
+
+    with TestClient(application) as client:
+        for video_id in ("first", "second"):
+            assert client.post(f"/api/v1/youtube/process/{video_id}").status_code == 200
+
+    assert used == [services.youtube_service] * 2
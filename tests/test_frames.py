@@ -0,0 +1,144 @@
+# tests/test_frames.py
+import os
+import subprocess
+import cv2
+import numpy as np
+import pytest
+from app.services import frames
+from app.services.frames import (
+    dedupe_images,
+    detect_scene_changes,
+    extract_frames,
+    difference_hashes,
+    hamming_distances,
+    scene_change_scores,
+    select_scene_changes
+)
+
+
+@pytest.fixture(scope="module")
+def scene_video(tmp_path_factory):
+    """Three 4 second shots at 25 fps: black, white, then a test pattern."""
+    path = str(tmp_path_factory.mktemp("frames") / "scenes.mp4")
+    shots = ["color=c=black:", "color=c=white:", "testsrc="]
+    command = ["ffmpeg", "-nostdin", "-loglevel", "error", "-y"]
+    for shot in shots:
+        command += ["-f", "lavfi", "-i", f"{shot}size=320x180:rate=25:duration=4"]
+    command += [
+        "-filter_complex", "[0][1][2]concat=n=3:v=1",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", "50", "-pix_fmt", "yuv420p", path
+    ]
+    subprocess.run(command, check=True)
+    return path
+
+
+def test_scores_are_high_for_cuts_and_low_for_identical_frames():
+    black = np.zeros((1, 90, 160), dtype=np.uint8)
+    white = np.full((1, 90, 160), 255, dtype=np.uint8)
+
+    scores = scene_change_scores(np.concatenate([black, black, white]))
+
+    assert scores.tolist() == [1.0, 0.0, 1.0]
+    assert scene_change_scores(white, previous=white[0]).tolist() == [0.0]
+
+
+def test_select_keeps_the_strongest_change_of_a_transition():
+    times = np.array([0.0, 3.0, 3.5, 4.0, 8.0])
+    scores = np.array([1.0, 0.5, 0.9, 0.6, 0.1])
+
+    assert select_scene_changes(times, scores, 0.3, 2.0, 10) == [0.0, 3.5]
+    assert select_scene_changes(times, scores, 0.3, 2.0, 1) == [0.0]
+
+
+@pytest.mark.parametrize("keyframe_max_gap", [0.0, 2.5])
+def test_detects_cuts_in_a_video(scene_video, keyframe_max_gap):
+    changes = detect_scene_changes(scene_video, 2.0, 0.3, 1.0, 10, keyframe_max_gap)
+
+    assert len(changes) == 3
+    assert changes[0] == 0.0
+    assert abs(changes[1] - 4.0) <= 0.5
+    assert abs(changes[2] - 8.0) <= 0.5
+
+
+@pytest.mark.parametrize("keyframe_max_gap, keyframes_only", [(0.0, False), (1.0, False), (2.5, True)])
+def test_only_keyframes_are_decoded_when_they_are_close_enough(scene_video, monkeypatch, keyframe_max_gap, keyframes_only):
+    modes = []
+    sample_gray_frames = frames.sample_gray_frames
+
+    def record(video_path, sample_fps, keyframes_only, batch_size):
+        modes.append(keyframes_only)
+        return sample_gray_frames(video_path, sample_fps, keyframes_only, batch_size)
+
+    monkeypatch.setattr(frames, "sample_gray_frames", record)
+    detect_scene_changes(scene_video, 2.0, 0.3, 1.0, 10, keyframe_max_gap)
+
+    assert modes == [keyframes_only]
+
+
+@pytest.mark.parametrize("keyframes_known", [True, False])
+def test_extract_frames_writes_the_frame_at_each_timestamp(scene_video, tmp_path, monkeypatch, keyframes_known):
+    if not keyframes_known:
+        def unreadable(path):
+            raise OSError("ffprobe not found")
+        monkeypatch.setattr(frames, "keyframe_times", unreadable)
+    targets = [(t, str(tmp_path / f"{t}.jpg")) for t in (9.0, 1.0, 1.2, 5.0)]
+
+    written = extract_frames(scene_video, targets, 0.0, 1.0)
+
+    assert [t for t, _ in written] == [1.0, 1.2, 5.0, 9.0]
+    brightness = [cv2.imread(path, cv2.IMREAD_GRAYSCALE).mean() for _, path in written]
+    assert brightness[0] < 20 and brightness[1] < 20  # black shot
+    assert brightness[2] > 235  # white shot
+    assert 20 < brightness[3] < 235  # test pattern
+
+
+def test_unreadable_video_raises(tmp_path):
+    path = tmp_path / "broken.mp4"
+    path.write_bytes(b"not a video")
+
+    with pytest.raises(ValueError):
+        detect_scene_changes(str(path), 2.0, 0.3, 1.0, 10)
+
+
+def write_screenshot(path, seed: int, quality: int = 90, brightness: int = 0) -> str:
+    """Save a 320x180 JPEG of random 8x8 blocks, so different seeds look unrelated."""
+    blocks = np.random.default_rng(seed).integers(0, 200, size=(9, 16), dtype=np.uint8)
+    image = cv2.resize(blocks, (320, 180), interpolation=cv2.INTER_NEAREST) + np.uint8(brightness)
+    cv2.imwrite(str(path), image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return str(path)
+
+
+def test_difference_hash_sets_a_bit_where_brightness_rises():
+    rising = np.tile(np.arange(9, dtype=np.uint8), (8, 1))[np.newaxis]
+    falling = rising[:, :, ::-1]
+
+    hashes = difference_hashes(np.concatenate([rising, falling]))
+
+    assert hashes.tolist() == [2 ** 64 - 1, 0]
+    assert hamming_distances(hashes, hashes[0]).tolist() == [0, 64]
+    assert hamming_distances(np.array([0b1011], dtype=np.uint64), np.uint64(0b0001)).tolist() == [2]
+
+
+def test_dedupe_removes_recompressed_and_returning_shots(tmp_path):
+    first = write_screenshot(tmp_path / "0.jpg", seed=1)
+    recompressed = write_screenshot(tmp_path / "1.jpg", seed=1, quality=40, brightness=10)
+    other = write_screenshot(tmp_path / "2.jpg", seed=2)
+    returning = write_screenshot(tmp_path / "3.jpg", seed=1, quality=70)
+    removed_size = os.path.getsize(recompressed) + os.path.getsize(returning)
+
+    mapping, bytes_saved = dedupe_images([first, recompressed, other, returning], threshold=6)
+
+    assert mapping == {first: first, recompressed: first, other: other, returning: first}
+    assert bytes_saved == removed_size
+    assert sorted(os.listdir(tmp_path)) == ["0.jpg", "2.jpg"]
+
+
+def test_dedupe_keeps_unreadable_files(tmp_path):
+    broken = tmp_path / "broken.jpg"
+    broken.write_bytes(b"not an image")
+    image = write_screenshot(tmp_path / "0.jpg", seed=1)
+
+    mapping, bytes_saved = dedupe_images([str(broken), image], threshold=6)
+
+    assert mapping == {str(broken): str(broken), image: image}
+    assert bytes_saved == 0 and broken.exists()
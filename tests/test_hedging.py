@@ -0,0 +1,86 @@
+# tests/test_hedging.py
+import asyncio
+import pytest
+from app.core.settings import settings
+from app.services import llm_cache
+from app.services import openai as openai_service
+from app.services.job_stats import begin_job_stats
+from app.services.llm_cache import LLMCache
+from app.services.openai import OpenAIService
+
+SYSTEM = "Clean up the text."
+
+
+@pytest.fixture
+def slow_primary(mock_backend, monkeypatch):
+    """The first request hangs for a second, later ones answer at once; cancellations are recorded."""
+    monkeypatch.setattr(settings, "HEDGE_ENABLED", True)
+    monkeypatch.setattr(openai_service, "hedge_delay", lambda operation, model: 0.01)
+    create = mock_backend.create
+    calls = {"sent": 0, "cancelled": 0}
+
+    async def create_with_delays(request, stream=False):
+        calls["sent"] += 1
+        if calls["sent"] == 1:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                calls["cancelled"] += 1
+                raise
+        return await create(request, stream)
+
+    monkeypatch.setattr(mock_backend, "create", create_with_delays)
+    return calls
+
+
+def hedged(service, text="hello world"):
+    return service._hedged_completion(SYSTEM, text, 50, lambda: None, "chunk_cleanup")
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled(slow_primary):
+    service = OpenAIService()
+
+    async def run():
+        stats = begin_job_stats()
+        response = await asyncio.wait_for(hedged(service), timeout=0.5)
+        await asyncio.sleep(0)  # Let the cancelled primary unwind
+        return stats, response
+
+    stats, response = asyncio.run(run())
+
+    assert response.choices[0].message.content
+    assert stats.hedging.hedged_requests == 1 and stats.hedging.hedge_wins == 1
+    assert slow_primary == {"sent": 2, "cancelled": 1}
+
+
+def test_no_hedge_once_the_budget_is_spent(slow_primary):
+    service = OpenAIService()
+
+    async def run():
+        stats = begin_job_stats()
+        stats.hedging.max_tokens = 0
+        await hedged(service)
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats.hedging.hedged_requests == 0
+    assert slow_primary == {"sent": 1, "cancelled": 0}
+
+
+def test_winning_hedge_is_cached(slow_primary, mock_backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(path=str(tmp_path / "responses.sqlite3")))
+    service = OpenAIService()
+
+    async def run():
+        begin_job_stats()
+        first = await hedged(service)
+        second = await service._create_completion(SYSTEM, "hello world", 50)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert slow_primary["sent"] == 2
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert second.usage.prompt_tokens == 0
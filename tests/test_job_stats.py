@@ -0,0 +1,33 @@
+# tests/test_job_stats.py
+import asyncio
+from app.models.youtube import ProcessingStats
+from app.services.job_stats import begin_job_stats, get_job_stats
+
+
+def test_sections_merge_into_processing_stats():
+    stats = begin_job_stats()
+    stats.cache.record_hit({"prompt_tokens": 10, "completion_tokens": 5, "latency_seconds": 0.5})
+    stats.hedging.reserve(100)
+    stats.routes.record("gpt-4o-mini", "escalated", 10, 5, 0.001, 1.0)
+    stats.screenshots.record(2, 2048)
+
+    result = ProcessingStats(total_input_tokens=10, total_output_tokens=5, total_price=0.001, **stats.as_dict())
+
+    assert result.cache_hits == 1 and result.cache_saved_tokens == 15
+    assert result.hedged_requests == 1 and result.hedge_tokens == 100
+    assert result.model_routes["gpt-4o-mini"].escalated == 1
+    assert result.screenshots_removed == 2 and result.screenshot_bytes_saved == 2048
+
+
+def test_each_job_task_collects_its_own_stats():
+    async def job(misses: int):
+        stats = begin_job_stats()
+        for _ in range(misses):
+            await asyncio.sleep(0)
+            get_job_stats().cache.record_miss()
+        return stats.cache.misses
+
+    async def main():
+        return await asyncio.gather(job(1), job(3))
+
+    assert asyncio.run(main()) == [1, 3]
@@ -0,0 +1,136 @@
+# tests/test_llm_backends.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from openai import InternalServerError, RateLimitError
+from app.services import llm_backends
+from app.services.llm_backends import LLMBackend, LocalLLMBackend, MockLLMBackend
+from app.services.openai import OpenAIService
+
+
+def request(text: str, **extra) -> dict:
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "system", "content": "Clean up."}, {"role": "user", "content": text}],
+        "max_tokens": 500,
+        **extra
+    }
+
+
+def fast_mock(**kwargs) -> MockLLMBackend:
+    options = dict(latency_median=0.001, latency_sigma=0.0, tokens_per_second=100000,
+                   error_rate=0.0, rate_limit_rate=0.0, seed=1)
+    options.update(kwargs)
+    return MockLLMBackend(**options)
+
+
+def test_backend_without_create_cannot_be_instantiated():
+    class Incomplete(LLMBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_mock_echoes_text_as_paragraphs_with_usage_and_headers():
+    backend = fast_mock()
+    text = "One. Two. Three. Four. Five."
+
+    response, headers = asyncio.run(backend.create(request(text)))
+
+    assert response.choices[0].message.content == "One. Two. Three. Four.\n\nFive."
+    assert response.usage.prompt_tokens > 0
+    assert response.usage.completion_tokens > 0
+    assert "x-ratelimit-limit-requests" in headers
+    assert backend.stats()["requests"] == 1
+
+
+def test_mock_stream_reassembles_to_the_full_answer_and_ends_with_usage():
+    backend = fast_mock()
+
+    async def run():
+        stream, _ = await backend.create(request("Hello there. General remarks."), stream=True)
+        return [chunk async for chunk in stream]
+
+    chunks = asyncio.run(run())
+
+    assert "".join(c.choices[0].delta.content or "" for c in chunks) == "Hello there. General remarks."
+    assert chunks[-1].choices[0].finish_reason == "stop"
+    assert chunks[-1].usage.completion_tokens > 0
+
+
+def test_mock_json_requests_return_a_chapter_per_window():
+    response, _ = asyncio.run(fast_mock().create(
+        request("[7] first paragraph\n\n[8] second", response_format={"type": "json_object"})
+    ))
+    assert '"start_paragraph_number": 7' in response.choices[0].message.content
+
+
+@pytest.mark.parametrize("options, error", [
+    ({"rate_limit_rate": 1.0}, RateLimitError),
+    ({"error_rate": 1.0}, InternalServerError),
+])
+def test_mock_injects_errors(options, error):
+    backend = fast_mock(**options)
+    with pytest.raises(error):
+        asyncio.run(backend.create(request("text")))
+    assert backend.stats()["failures"] == 1
+
+
+@pytest.fixture
+def generated_batches():
+    return []
+
+
+@pytest.fixture
+def local_backend(generated_batches, monkeypatch):
+    """A local backend whose batches run on a thread and echo the user text."""
+    def generate_batch(requests):
+        generated_batches.append([r["messages"][-1]["content"] for r in requests])
+        return [
+            {"content": r["messages"][-1]["content"], "finish_reason": "stop", "prompt_tokens": 5, "completion_tokens": 3}
+            for r in requests
+        ]
+
+    monkeypatch.setattr(llm_backends, "_generate_batch", generate_batch)
+    backend = LocalLLMBackend(workers=1, batch_size=3, batch_wait=0.05)
+    backend.executor.shutdown()
+    backend.executor = ThreadPoolExecutor(max_workers=1)
+    yield backend
+    backend.close()
+
+
+def test_local_requests_are_batched_up_to_the_batch_size(local_backend, generated_batches):
+    async def run():
+        return await asyncio.gather(*[local_backend.create(request(f"text {i}")) for i in range(5)])
+
+    responses = asyncio.run(run())
+
+    assert [r.choices[0].message.content for r, _ in responses] == [f"text {i}" for i in range(5)]
+    assert sorted(len(batch) for batch in generated_batches) == [2, 3]
+    assert not local_backend._batches
+
+
+def test_local_batches_are_split_by_temperature(local_backend, generated_batches):
+    async def run():
+        await asyncio.gather(
+            local_backend.create(request("cold", temperature=0)),
+            local_backend.create(request("warm", temperature=0.7)),
+            local_backend.create(request("cold too", temperature=0))
+        )
+
+    asyncio.run(run())
+
+    assert sorted(generated_batches) == [["cold", "cold too"], ["warm"]]
+
+
+def test_local_backend_skips_the_rate_limiter(local_backend, monkeypatch):
+    def no_limiter():
+        raise AssertionError("local calls must not wait for the API rate limiter")
+
+    monkeypatch.setattr(llm_backends, "_backend", local_backend)
+    monkeypatch.setattr("app.services.openai.get_rate_limiter", no_limiter)
+
+    response = asyncio.run(OpenAIService()._create_completion("Clean up.", "hello", 50))
+
+    assert response.choices[0].message.content == "hello"
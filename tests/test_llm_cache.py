@@ -0,0 +1,86 @@
+# tests/test_llm_cache.py
+import asyncio
+import itertools
+import pytest
+from app.core.settings import settings
+from app.services import llm_cache
+from app.services.job_stats import begin_job_stats
+from app.services.llm_cache import LLMCache
+from app.services.openai import OpenAIService
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing time so last_access ordering is deterministic."""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(llm_cache.time, "time", lambda: float(next(ticks)))
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return LLMCache(path=str(tmp_path / "responses.sqlite3"))
+
+
+def test_make_key_is_stable_and_covers_every_field():
+    key = LLMCache.make_key("gpt-4o-mini", "system", 0.0, "text")
+    assert key == LLMCache.make_key("gpt-4o-mini", "system", 0.0, "text")
+    assert len({
+        key,
+        LLMCache.make_key("gpt-4o", "system", 0.0, "text"),
+        LLMCache.make_key("gpt-4o-mini", "other", 0.0, "text"),
+        LLMCache.make_key("gpt-4o-mini", "system", 0.7, "text"),
+        LLMCache.make_key("gpt-4o-mini", "system", 0.0, "other"),
+    }) == 5
+
+
+def test_get_returns_stored_entry_and_counts_hits_and_misses(cache):
+    stats = begin_job_stats()
+    cache.put("key", '{"id": 1}', 120, 80, 1.5)
+
+    assert cache.get("missing") is None
+    entry = cache.get("key")
+
+    assert entry == {"response": '{"id": 1}', "prompt_tokens": 120, "completion_tokens": 80, "latency_seconds": 1.5}
+    assert stats.cache.as_dict() == {
+        "cache_hits": 1,
+        "cache_misses": 1,
+        "cache_saved_tokens": 200,
+        "cache_saved_seconds": 1.5
+    }
+
+
+def test_put_evicts_least_recently_used_entries(cache):
+    cache.max_size_bytes = 250
+    cache.put("a", "x" * 100, 1, 1, 0.1)
+    cache.put("b", "x" * 100, 1, 1, 0.1)
+    cache.get("a")  # a is now more recent than b
+
+    cache.put("c", "x" * 100, 1, 1, 0.1)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_cache_persists_across_instances(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite3")
+    LLMCache(path=path).put("key", "response", 1, 2, 0.5)
+
+    assert LLMCache(path=path).get("key")["response"] == "response"
+
+
+def test_repeated_completion_is_served_from_cache(cache, mock_backend, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    service = OpenAIService()
+
+    async def run():
+        first = await service._create_completion("Clean up the text.", "hello world", 50)
+        second = await service._create_completion("Clean up the text.", "hello world", 50)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert mock_backend.requests == 1
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert second.usage.prompt_tokens == 0
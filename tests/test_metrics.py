@@ -0,0 +1,37 @@
+# tests/test_metrics.py
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.routes import metrics
+from app.services.openai import OpenAIService
+
+
+def make_client() -> TestClient:
+    application = FastAPI()
+    application.include_router(metrics.router, prefix="/api/v1")
+    return TestClient(application)
+
+
+def llm_calls(snapshot: dict) -> float:
+    return sum(
+        counter["value"] for counter in snapshot["counters"]
+        if counter["name"] == "llm_calls_total" and counter["labels"]["operation"] == "chunk_cleanup"
+    )
+
+
+def test_metrics_endpoint_reports_counters_that_grow_with_calls(mock_backend):
+    client = make_client()
+    before = client.get("/api/v1/metrics/", params={"name": "llm_"})
+    assert before.status_code == 200
+
+    service = OpenAIService()
+    asyncio.run(service._create_completion("Clean up.", "first text", 50))
+    asyncio.run(service._create_completion("Clean up.", "second text", 50))
+
+    after = client.get("/api/v1/metrics/", params={"name": "llm_"}).json()
+
+    assert set(after) == {"counters", "histograms"}
+    assert all(entry["name"].startswith("llm_") for kind in after.values() for entry in kind)
+    assert llm_calls(after) == llm_calls(before.json()) + 2
+    latency = next(h for h in after["histograms"] if h["name"] == "llm_latency_seconds")
+    assert latency["count"] >= 2
@@ -0,0 +1,71 @@
+# tests/test_paragraphs.py
+import asyncio
+import pytest
+from app.core.settings import settings
+from app.services import chunking
+from app.services.openai import OpenAIService
+from app.services.youtube import YouTubeService
+
+TRANSCRIPT = [{"start": float(i * 10), "text": f"segment {i}"} for i in range(6)]
+
+
+@pytest.fixture
+def reversed_chunks(mock_backend, monkeypatch):
+    """One chunk per segment; later chunks finish first. Records peak concurrency."""
+    monkeypatch.setattr(chunking, "count_tokens", lambda text, model=None: settings.CHUNK_TOKEN_BUDGET)
+    state = {"running": 0, "peak": 0, "finished": []}
+
+    async def process_chunk(self, index, chunk, paragraph_callback=None):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01 * (len(TRANSCRIPT) - index))
+        state["running"] -= 1
+        state["finished"].append(index)
+        return [chunk["text"].upper()], 1, 1, 0.0
+
+    monkeypatch.setattr(OpenAIService, "_process_transcript_chunk", process_chunk)
+    return state
+
+
+def test_paragraphs_keep_transcript_order_when_chunks_finish_out_of_order(reversed_chunks):
+    service = OpenAIService()
+    progress = []
+
+    async def on_progress(value, description):
+        progress.append(value)
+
+    paragraphs, input_tokens, _, _ = asyncio.run(
+        service.transcript_to_paragraphs(TRANSCRIPT, progress_callback=on_progress, max_concurrency=6)
+    )
+
+    assert reversed_chunks["finished"] == [5, 4, 3, 2, 1, 0]
+    assert [p["paragraph_text"] for p in paragraphs] == [f"SEGMENT {i}" for i in range(6)]
+    assert [p["start_time"] for p in paragraphs] == [s["start"] for s in TRANSCRIPT]
+    assert [p["paragraph_number"] for p in paragraphs] == list(range(6))
+    assert input_tokens == 6
+    assert progress == pytest.approx([i / 6 * 0.5 for i in range(1, 7)])
+
+
+def test_max_concurrency_is_respected(reversed_chunks):
+    asyncio.run(OpenAIService().transcript_to_paragraphs(TRANSCRIPT, max_concurrency=2))
+
+    assert reversed_chunks["peak"] == 2
+
+
+def test_process_detailed_reports_chunk_progress(reversed_chunks, monkeypatch):
+    service = YouTubeService()
+    progress = []
+
+    async def get_transcript(video_id):
+        return TRANSCRIPT
+
+    async def on_progress(value, description):
+        progress.append(value)
+
+    monkeypatch.setattr(service, "get_transcript", get_transcript)
+    try:
+        asyncio.run(service.process_detailed("video", progress_callback=on_progress))
+    finally:
+        service.close()
+
+    assert len(progress) == len(TRANSCRIPT) and progress[-1] == 0.5
@@ -0,0 +1,110 @@
+# tests/test_partial_paragraphs.py
+import asyncio
+from app.core.enums import ProcessingMode, ChapterSource
+from app.core.settings import settings
+from app.models.youtube import Chapter, ProcessingStats, YouTubeResult
+from app.services import openai as openai_module
+from app.services.openai import OpenAIService
+from app.services.youtube import YouTubeProcessingJob
+
+
+def make_job() -> YouTubeProcessingJob:
+    return YouTubeProcessingJob(
+        "yt_job_test",
+        "video",
+        ProcessingMode.DETAILED,
+        ChapterSource.AUTO,
+        youtube_service=None,
+        save=False
+    )
+
+
+def paragraph(text: str) -> dict:
+    return {"paragraph_text": text, "start_time": 0.0}
+
+
+def test_new_response_replaces_a_chunks_earlier_paragraphs():
+    job = make_job()
+
+    async def run():
+        for position, text in enumerate(["a1", "a2", "a3"]):
+            await job.add_partial_paragraph(1, position, paragraph(text))
+        await job.add_partial_paragraph(2, 0, paragraph("b1"))
+        # A retry of chunk 1 returns fewer paragraphs
+        await job.add_partial_paragraph(1, 0, paragraph("retry"))
+
+    asyncio.run(run())
+    assert [p["paragraph_text"] for p in job.get_partial_paragraphs()] == ["retry", "b1"]
+
+
+def test_none_paragraph_discards_a_chunks_output():
+    job = make_job()
+
+    async def run():
+        await job.add_partial_paragraph(0, 0, paragraph("rejected"))
+        await job.add_partial_paragraph(0, 1, paragraph("rejected too"))
+        await job.add_partial_paragraph(0, 0, None)
+
+    asyncio.run(run())
+    assert job.get_partial_paragraphs() == []
+
+
+def test_final_result_replaces_streamed_paragraphs():
+    job = make_job()
+    asyncio.run(job.add_partial_paragraph(0, 0, paragraph("draft")))
+    job.result = YouTubeResult(
+        video_id="video",
+        chapters=[Chapter(
+            num_chapter=0,
+            title="Complete Content",
+            start_paragraph_number=0,
+            end_paragraph_number=1,
+            start_time=0.0,
+            end_time=1.0,
+            paragraphs=["final"],
+            paragraph_timestamps=[0.0]
+        )],
+        stats=ProcessingStats(total_input_tokens=0, total_output_tokens=0, total_price=0.0)
+    )
+
+    assert job.get_partial_paragraphs() == [{"paragraph_text": "final", "start_time": 0.0}]
+
+
+def test_escalation_clears_rejected_streamed_text(mock_backend, monkeypatch):
+    monkeypatch.setattr(settings, "CASCADE_MODELS", ["cheap-model", "strong-model"])
+    monkeypatch.setattr(
+        openai_module,
+        "check_cleanup_output",
+        lambda source_text, paragraphs, finish_reason: "rejected for the test"
+    )
+    job = make_job()
+    events = []
+
+    async def callback(chunk_index, position, item):
+        events.append((position, item is None))
+        await job.add_partial_paragraph(chunk_index, position, item)
+
+    chunk = {"text": "some transcript text to clean up", "tokens": 8, "start_time": 12.0}
+    result = asyncio.run(OpenAIService()._process_transcript_chunk(3, chunk, callback))
+
+    paragraphs = result[0]
+    assert (0, True) in events
+    assert [p["paragraph_text"] for p in job.get_partial_paragraphs()] == paragraphs
+    assert all(p["start_time"] == 12.0 for p in job.get_partial_paragraphs())
+
+
+def test_throttled_paragraphs_are_saved_when_the_interval_ends(monkeypatch):
+    monkeypatch.setattr(settings, "PARTIAL_SAVE_INTERVAL", 0.05)
+    job = make_job()
+    saved = []
+    monkeypatch.setattr(job, "_save_status", lambda: saved.append(len(job.partial_paragraphs)))
+
+    async def run():
+        for position, text in enumerate(["a1", "a2", "a3"]):
+            await job.add_partial_paragraph(0, position, paragraph(text))
+        throttled = list(saved)
+        await asyncio.sleep(0.1)
+        return throttled
+
+    assert asyncio.run(run()) == [1]
+    assert saved == [1, 3]
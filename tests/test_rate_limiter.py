@@ -0,0 +1,133 @@
+# tests/test_rate_limiter.py
+import asyncio
+import pytest
+from app.services import rate_limiter
+from app.services.rate_limiter import RateLimiter, TokenBucket, parse_reset_duration
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("1s", 1.0),
+    ("6m0s", 360.0),
+    ("20ms", 0.02),
+    ("1h2m3.5s", 3723.5),
+    ("2.5", 2.5),
+])
+def test_parse_reset_duration(value, seconds):
+    assert parse_reset_duration(value) == pytest.approx(seconds)
+
+
+@pytest.mark.parametrize("value", ["", None, "soon"])
+def test_parse_reset_duration_rejects_unknown_values(value):
+    assert parse_reset_duration(value) is None
+
+
+def test_bucket_refills_continuously_up_to_capacity(clock):
+    bucket = TokenBucket(60)  # one unit per second
+    bucket.consume(60)
+    assert bucket.wait_time(10) == pytest.approx(10.0)
+
+    clock.now += 4
+    assert bucket.wait_time(10) == pytest.approx(6.0)
+
+    clock.now += 1000
+    bucket.consume(0)
+    assert bucket.level == 60
+
+
+def test_oversized_requests_wait_for_a_full_bucket_only(clock):
+    bucket = TokenBucket(60)
+    bucket.consume(30)
+    assert bucket.wait_time(500) == pytest.approx(30.0)
+
+
+def test_refund_and_sync_adjust_the_level(clock):
+    bucket = TokenBucket(100)
+    bucket.consume(50)
+    bucket.refund(20)
+    assert bucket.level == 70
+    bucket.refund(-30)  # the request used more than estimated
+    assert bucket.level == 40
+    bucket.sync(10)
+    assert bucket.level == 10
+    bucket.sync(90)  # never raised by the server's report
+    assert bucket.level == 10
+
+
+def test_acquire_waits_for_token_capacity(clock):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)  # 10 tokens/s
+
+    async def run():
+        first = await limiter.acquire(600)
+        second = await limiter.acquire(100)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == 0
+    assert second == pytest.approx(10.0)
+
+
+def test_acquire_admits_requests_in_arrival_order(clock):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=10 ** 6)
+    limiter.requests.consume(60)
+    order = []
+
+    async def request(name):
+        await limiter.acquire(1)
+        order.append(name)
+
+    async def run():
+        await asyncio.gather(*[request(i) for i in range(5)])
+
+    asyncio.run(run())
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_back_off_pauses_every_caller(clock):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=10 ** 6)
+    limiter.back_off(7.5)
+
+    waited = asyncio.run(limiter.acquire(1))
+    assert waited == pytest.approx(7.5)
+
+
+def test_headers_shrink_limits_and_sync_remaining(clock):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=10 ** 6)
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "500",
+        "x-ratelimit-remaining-requests": "42",
+        "x-ratelimit-limit-tokens": "2000000",  # larger limits are ignored
+        "x-ratelimit-remaining-tokens": "not a number",
+    })
+
+    assert limiter.requests.capacity == 500
+    assert limiter.requests.level == 42
+    assert limiter.tokens.capacity == 10 ** 6
+
+
+def test_record_usage_refunds_overestimates(clock):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=1000)
+    limiter.tokens.consume(800)
+    limiter.record_usage(estimated_tokens=800, actual_tokens=300)
+    assert limiter.tokens.level == 700
@@ -0,0 +1,141 @@
+# tests/test_retry.py
+import asyncio
+import httpx
+import pytest
+from openai import BadRequestError, RateLimitError
+from app.utils import retry
+from app.utils.retry import CircuitBreaker, CircuitOpenError, RetryPolicy, is_retryable
+
+
+def api_error(cls, status: int, headers=None):
+    request = httpx.Request("POST", "http://api/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return cls("error", response=response, body=None)
+
+
+class ReadTimeout(Exception):
+    """Matched by name, like the httpx and requests timeouts."""
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(retry.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+
+    async def sleep(seconds):
+        delays.append(seconds)
+
+    monkeypatch.setattr(retry.asyncio, "sleep", sleep)
+    return delays
+
+
+@pytest.mark.parametrize("error, expected", [
+    (api_error(RateLimitError, 429), True),
+    (api_error(BadRequestError, 400), False),
+    (asyncio.TimeoutError(), True),
+    (ConnectionResetError(), True),
+    (ReadTimeout(), True),
+    (ValueError("bad input"), False),
+    (CircuitOpenError("open"), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_retry_after_header_takes_precedence():
+    policy = RetryPolicy(base_delay=100, max_delay=30)
+    assert policy.compute_delay(0, api_error(RateLimitError, 429, {"retry-after": "2"})) == 2
+    assert policy.compute_delay(0, api_error(RateLimitError, 429, {"retry-after": "5m"})) == 30
+
+
+def test_backoff_delay_is_jittered_below_the_exponential_ceiling():
+    policy = RetryPolicy(base_delay=1, backoff=2, max_delay=5)
+    for attempt, ceiling in [(0, 1), (1, 2), (2, 4), (5, 5)]:
+        delays = [policy.compute_delay(attempt, ValueError()) for _ in range(50)]
+        assert all(0 <= d <= ceiling for d in delays)
+
+
+def test_call_retries_transient_errors_until_success(no_sleep):
+    attempts = []
+    retried = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionResetError("reset")
+        return "ok"
+
+    policy = RetryPolicy(max_attempts=5, base_delay=0)
+    assert asyncio.run(policy.call(flaky, on_retry=retried.append)) == "ok"
+    assert len(attempts) == 3
+    assert len(retried) == 2 and len(no_sleep) == 2
+
+
+def test_call_fails_fast_on_fatal_errors_and_gives_up_after_max_attempts(no_sleep):
+    async def fatal():
+        raise ValueError("bad input")
+
+    async def transient():
+        raise ConnectionResetError("reset")
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    with pytest.raises(ValueError):
+        asyncio.run(policy.call(fatal))
+    assert no_sleep == []
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(policy.call(transient))
+    assert len(no_sleep) == 2
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock[0] = 10
+    breaker.before_call()  # the single trial call
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_trial_reopens_the_breaker(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock[0] = 10
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_rate_limits_and_fatal_errors_do_not_trip_the_breaker(no_sleep):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+    policy = RetryPolicy(max_attempts=2, base_delay=0)
+
+    async def throttled():
+        raise api_error(RateLimitError, 429)
+
+    async def rejected():
+        raise api_error(BadRequestError, 400)
+
+    for func in (throttled, rejected):
+        with pytest.raises(Exception):
+            asyncio.run(policy.call(func, breaker=breaker))
+    assert breaker.state == "closed"
@@ -0,0 +1,69 @@
+# tests/test_routing.py
+import asyncio
+import httpx
+import pytest
+from openai import InternalServerError
+from app.core.settings import settings
+from app.services.openai import OpenAIService
+from app.services.routing import check_cleanup_output
+from app.utils import retry
+from app.utils.retry import RetryPolicy, get_circuit_breaker
+
+SOURCE = " ".join(f"word{i}" for i in range(100))
+
+
+@pytest.mark.parametrize("paragraphs, finish_reason, reason", [
+    ([SOURCE], "length", "output truncated"),
+    ([], "stop", "empty output"),
+    ([" ".join(SOURCE.split()[:20])], "stop", "lost content"),
+    ([SOURCE, SOURCE], "stop", "output longer than input"),
+    (["Here is the cleaned transcript: " + SOURCE], "stop", "malformed paragraph"),
+])
+def test_bad_cleanup_output_is_escalated(paragraphs, finish_reason, reason):
+    assert check_cleanup_output(SOURCE, paragraphs, finish_reason).startswith(reason)
+
+
+def test_good_cleanup_output_is_accepted():
+    half = len(SOURCE.split()) // 2
+    paragraphs = [" ".join(SOURCE.split()[:half]), " ".join(SOURCE.split()[half:])]
+    assert check_cleanup_output(SOURCE, paragraphs, "stop") is None
+
+
+def test_each_model_is_priced_at_its_configured_rate(mock_backend, monkeypatch):
+    monkeypatch.setitem(settings.TOKEN_PRICES, "cheap", {"input": 1 / 1000000, "output": 2 / 1000000})
+    service = OpenAIService()
+
+    assert service.calculate_price(1000000, 1000000, "cheap") == 3.0
+    assert service.calculate_price(1000000, 1000000, "gpt-4o-mini") == 0.75
+    assert service.calculate_price(1, 1, "unknown-model") == round(
+        settings.DEFAULT_TOKEN_PRICE["input"] + settings.DEFAULT_TOKEN_PRICE["output"], 6
+    )
+
+
+def test_failing_cheap_model_does_not_block_escalation(mock_backend, monkeypatch):
+    monkeypatch.setattr(settings, "CASCADE_MODELS", ["cheap", "strong"])
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(retry, "_breakers", {})
+    create = mock_backend.create
+
+    async def cheap_model_down(request, stream=False):
+        if request["model"] == "cheap":
+            response = httpx.Response(500, request=httpx.Request("POST", "http://mock-llm/v1/chat/completions"))
+            raise InternalServerError("Mock server error", response=response, body=None)
+        return await create(request, stream)
+
+    monkeypatch.setattr(mock_backend, "create", cheap_model_down)
+    service = OpenAIService()
+    service.retry_policy = RetryPolicy(max_attempts=2, base_delay=0)
+
+    async def run():
+        return [
+            await service._process_transcript_chunk(i, {"text": f"Chunk {i} text.", "tokens": 5, "start_time": 0.0})
+            for i in range(4)
+        ]
+
+    results = asyncio.run(run())
+
+    assert all(result is not None for result in results)
+    assert get_circuit_breaker("openai:cheap").state == "open"
+    assert get_circuit_breaker("openai:strong").state == "closed"
@@ -0,0 +1,100 @@
+# tests/test_screenshot_mode.py
+import asyncio
+import pytest
+from app.core.settings import settings
+from app.services.youtube import YouTubeService
+
+PARAGRAPHS = [
+    {"paragraph_number": 0, "paragraph_text": "intro", "start_time": 0.0},
+    {"paragraph_number": 1, "paragraph_text": "middle", "start_time": 70.0},
+]
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def service(events, mock_backend, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENSHOT_DEDUP_ENABLED", False)
+    service = YouTubeService()
+
+    async def capture_video_frames(video_id, timestamps):
+        events.append("capture")
+        return [f"{video_id}_{int(t)}.jpg" for t in timestamps]
+
+    monkeypatch.setattr(service, "capture_video_frames", capture_video_frames)
+    yield service
+    service.close()
+
+
+def test_video_is_prepared_while_the_transcript_is_processed(service, events, monkeypatch):
+    video_started = asyncio.Event()
+
+    async def prepare_video(video_id):
+        events.append("video started")
+        video_started.set()
+        await asyncio.sleep(0.01)
+        events.append("video ready")
+        return []
+
+    async def process_detailed(video_id, paragraph_callback=None, progress_callback=None):
+        # Only finishes if the download is already running alongside it
+        await asyncio.wait_for(video_started.wait(), timeout=1)
+        events.append("transcript ready")
+        return [dict(p) for p in PARAGRAPHS], 10, 5, 0.01
+
+    monkeypatch.setattr(service, "_prepare_video", prepare_video)
+    monkeypatch.setattr(service, "process_detailed", process_detailed)
+
+    paragraphs, screenshots, *_ = asyncio.run(service.process_detailed_with_screenshots("video", 60))
+
+    assert events == ["video started", "transcript ready", "video ready", "capture"]
+    assert screenshots == ["video_0.jpg", "video_70.jpg"]
+    assert [p["screenshot"] for p in paragraphs] == screenshots
+
+
+def test_failed_download_still_returns_the_paragraphs(service, events, monkeypatch):
+    async def prepare_video(video_id):
+        raise ValueError("download failed")
+
+    async def process_detailed(video_id, paragraph_callback=None, progress_callback=None):
+        await asyncio.sleep(0.01)
+        return [dict(p) for p in PARAGRAPHS], 10, 5, 0.01
+
+    monkeypatch.setattr(service, "_prepare_video", prepare_video)
+    monkeypatch.setattr(service, "process_detailed", process_detailed)
+
+    paragraphs, screenshots, input_tokens, _, _ = asyncio.run(service.process_detailed_with_screenshots("video", 60))
+
+    assert screenshots == [] and "capture" not in events
+    assert [p["paragraph_text"] for p in paragraphs] == ["intro", "middle"]
+    assert input_tokens == 10
+
+
+def test_download_is_cancelled_when_transcript_processing_fails(service, monkeypatch):
+    cancelled = []
+
+    async def prepare_video(video_id):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(video_id)
+            raise
+
+    async def process_detailed(video_id, paragraph_callback=None, progress_callback=None):
+        await asyncio.sleep(0.01)
+        raise ValueError("no transcript")
+
+    monkeypatch.setattr(service, "_prepare_video", prepare_video)
+    monkeypatch.setattr(service, "process_detailed", process_detailed)
+
+    async def run():
+        with pytest.raises(ValueError):
+            await service.process_detailed_with_screenshots("video", 60)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert cancelled == ["video"]
@@ -0,0 +1,94 @@
+# tests/test_toc.py
+import asyncio
+import re
+import pytest
+from app.core.settings import settings
+from app.services import toc
+from app.services.toc import MERGE_PROMPT, WINDOW_PROMPT, HierarchicalTOCGenerator
+
+
+def word_count(text: str, model=None) -> int:
+    return len(text.split())
+
+
+class ScriptedOpenAIService:
+    """Answers TOC requests from the bracketed numbers in the prompt text."""
+
+    def __init__(self, merge_returns_nothing: bool = False):
+        self.merge_returns_nothing = merge_returns_nothing
+        self.calls = []
+
+    async def generate_toc(self, paragraphs):
+        self.calls.append(("direct", None))
+        return [{"start_paragraph_number": 0, "title": "Direct"}], 1, 1, 0.1
+
+    async def complete_json(self, system_prompt, text, max_tokens, operation="json"):
+        numbers = [int(n) for n in re.findall(r"^\[(\d+)\]", text, re.MULTILINE)]
+        if system_prompt == WINDOW_PROMPT:
+            kind = "window"
+            chapters = [{"start_paragraph_number": numbers[0], "title": f"Window {numbers[0]}", "summary": "s"}]
+        else:
+            kind = "merge"
+            chapters = [] if self.merge_returns_nothing else [
+                {"start_paragraph_number": n, "title": f"Merged {n}"} for n in numbers[::3]
+            ]
+        self.calls.append((kind, text))
+        return {"chapters": chapters}, 10, 5, 0.01
+
+
+@pytest.fixture
+def small_windows(monkeypatch):
+    monkeypatch.setattr(toc, "count_tokens", word_count)
+    monkeypatch.setattr(settings, "TOC_DIRECT_TOKEN_LIMIT", 50)
+    monkeypatch.setattr(settings, "TOC_WINDOW_TOKENS", 40)
+
+
+def paragraphs(count: int):
+    return [
+        {"paragraph_text": f"paragraph {i} talks about topic {i // 5} in some detail", "start_time": float(i)}
+        for i in range(count)
+    ]
+
+
+def test_short_content_uses_a_single_direct_call(small_windows):
+    service = ScriptedOpenAIService()
+    chapters, *_ = asyncio.run(HierarchicalTOCGenerator(service).generate_toc(paragraphs(3)))
+
+    assert chapters == [{"start_paragraph_number": 0, "title": "Direct"}]
+    assert service.calls == [("direct", None)]
+
+
+def test_long_content_is_mapped_and_reduced_within_the_window_budget(small_windows):
+    service = ScriptedOpenAIService()
+    chapters, input_tokens, output_tokens, price = asyncio.run(
+        HierarchicalTOCGenerator(service).generate_toc(paragraphs(120))
+    )
+
+    kinds = [kind for kind, _ in service.calls]
+    assert kinds.count("window") > 1
+    assert kinds.count("merge") > 1  # at least one intermediate level plus the final call
+    assert all(word_count(text) <= settings.TOC_WINDOW_TOKENS for _, text in service.calls)
+
+    starts = [c["start_paragraph_number"] for c in chapters]
+    assert starts[0] == 0
+    assert starts == sorted(set(starts))
+    assert all(set(c) == {"start_paragraph_number", "title"} for c in chapters)
+    assert (input_tokens, output_tokens) == (10 * len(service.calls), 5 * len(service.calls))
+    assert price == pytest.approx(0.01 * len(service.calls))
+
+
+def test_reduce_makes_progress_when_the_model_returns_nothing(small_windows):
+    service = ScriptedOpenAIService(merge_returns_nothing=True)
+    candidates = [{"start_paragraph_number": i, "title": f"Candidate {i}"} for i in range(0, 400, 2)]
+
+    result = asyncio.run(HierarchicalTOCGenerator(service)._reduce(candidates, 400, [0, 0, 0.0]))
+
+    assert 0 < len(result) < len(candidates)
+    assert {c["start_paragraph_number"] for c in result} <= {c["start_paragraph_number"] for c in candidates}
+    # The final call's prompt fits in one window
+    assert word_count(service.calls[-1][1]) <= settings.TOC_WINDOW_TOKENS
+
+
+def test_windows_group_consecutive_items_by_budget(small_windows):
+    items = ["a b c", "d e", "f g h i", "j"]
+    assert HierarchicalTOCGenerator._windows(items, 5) == [[0, 1], [2, 3]]
@@ -0,0 +1,110 @@
+# tests/test_transcript_store.py
+import asyncio
+import itertools
+import threading
+import pytest
+from app.core.settings import settings
+from app.services import transcript_store
+from app.services import youtube
+from app.services.transcript_store import TranscriptStore, decode_segments, encode_segments
+from app.services.youtube import YouTubeService
+
+SEGMENTS = [{"start": 0.0, "text": "hello"}, {"start": 3.25, "text": "wörld"}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing time, one day per tick, so age and access order are deterministic."""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(transcript_store.time, "time", lambda: next(ticks) * 86400.0)
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return TranscriptStore(path=str(tmp_path / "transcripts.sqlite3"), ttl_days=30)
+
+
+def test_segments_round_trip_through_compression():
+    assert decode_segments(encode_segments(SEGMENTS)) == SEGMENTS
+
+
+def test_get_returns_stored_transcript_and_source(store):
+    store.put("video", ["en", "de"], SEGMENTS, "whisper")
+
+    assert store.get("video", ["en", "de"]) == (SEGMENTS, "whisper")
+    assert store.get("video", ["de", "en"]) is None
+    assert store.get("other", ["en", "de"]) is None
+
+
+def test_put_rejects_unknown_sources(store):
+    with pytest.raises(ValueError):
+        store.put("video", ["en"], SEGMENTS, "guesswork")
+
+
+def test_expired_transcripts_are_dropped(store):
+    store.put("video", ["en"], SEGMENTS, "captions")
+    assert store.get("video", ["en"]) is not None
+
+    store.ttl_seconds = 86400
+    assert store.get("video", ["en"]) is None
+    store.ttl_seconds = 30 * 86400
+    assert store.get("video", ["en"]) is None
+
+
+def test_put_evicts_least_recently_used_transcripts(store):
+    size = len(encode_segments(SEGMENTS))
+    store.max_size_bytes = size * 2
+    store.put("a", ["en"], SEGMENTS, "captions")
+    store.put("b", ["en"], SEGMENTS, "captions")
+    store.get("a", ["en"])  # a is now more recent than b
+
+    store.put("c", ["en"], SEGMENTS, "captions")
+
+    assert store.get("a", ["en"]) is not None
+    assert store.get("b", ["en"]) is None
+    assert store.get("c", ["en"]) is not None
+
+
+def test_get_transcript_reads_the_store_off_the_event_loop(store, mock_backend, monkeypatch):
+    store.put("video", ["en"], SEGMENTS, "captions")
+    threads = []
+    store_get = store.get
+
+    def get(*args):
+        threads.append(threading.current_thread())
+        return store_get(*args)
+
+    async def fetch(*args):
+        raise AssertionError("stored transcripts must not be fetched again")
+
+    monkeypatch.setattr(store, "get", get)
+    monkeypatch.setattr(youtube, "get_transcript_store", lambda: store)
+    service = YouTubeService()
+    monkeypatch.setattr(service, "fetch_youtube_transcript", fetch)
+    try:
+        assert asyncio.run(service.get_transcript("video")) == SEGMENTS
+    finally:
+        service.close()
+
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_fetch_timeout_does_not_count_time_queued_for_a_worker(mock_backend, monkeypatch):
+    monkeypatch.setattr(settings, "TRANSCRIPT_FETCH_WORKERS", 1)
+    monkeypatch.setattr(settings, "TRANSCRIPT_FETCH_TIMEOUT", 0.2)
+
+    def get_transcript(video_id, languages):
+        threading.Event().wait(0.15)
+        return SEGMENTS
+
+    monkeypatch.setattr(youtube.YouTubeTranscriptApi, "get_transcript", get_transcript, raising=False)
+    service = YouTubeService()
+
+    async def run():
+        # Three fetches on one worker: the last waits 0.3s before it starts
+        return await asyncio.gather(*[service.fetch_youtube_transcript(v, ["en"]) for v in "abc"])
+
+    try:
+        assert asyncio.run(run()) == [SEGMENTS] * 3
+    finally:
+        service.close()
@@ -0,0 +1,193 @@
+# tests/test_transcription.py
+import asyncio
+import os
+import shutil
+import tempfile
+import wave
+import numpy as np
+import pytest
+from app.core.settings import settings
+from app.services import transcription
+from app.services.audio_segments import SAMPLE_RATE, decode_pcm
+from app.services.transcription import TranscriptionService
+
+
+class FakeStream:
+    itag = 251
+    mime_type = "audio/webm"
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.filesize = None
+
+    def stream_to_buffer(self, buffer):
+        for chunk in self.chunks:
+            buffer.write(chunk)
+
+
+class FakeStreams(list):
+    def filter(self, only_audio=False):
+        return self
+
+    def get_by_itag(self, itag):
+        return self[0]
+
+
+@pytest.fixture
+def service():
+    os.makedirs(settings.DOWNLOAD_DIR, exist_ok=True)
+    service = TranscriptionService()
+    yield service
+    service.close()
+
+
+def fake_youtube(monkeypatch, chunks):
+    streams = FakeStreams([FakeStream(chunks)])
+    monkeypatch.setattr(transcription, "YouTube", lambda url: type("YouTube", (), {"streams": streams}))
+
+
+def test_audio_is_written_to_a_real_file_and_removed_afterwards(service, monkeypatch):
+    fake_youtube(monkeypatch, [b"abc", b"def"])
+    seen = {}
+
+    async def transcribe_segmented(path, video_id):
+        with open(path, "rb") as f:
+            seen[path] = f.read()
+        return [{"start": 0.0, "text": "hello"}]
+
+    monkeypatch.setattr(service, "_transcribe_segmented", transcribe_segmented)
+
+    assert asyncio.run(service.transcribe_video("video")) == [{"start": 0.0, "text": "hello"}]
+    [(path, data)] = seen.items()
+    assert data == b"abcdef"
+    assert os.path.dirname(path) == settings.DOWNLOAD_DIR
+    assert not os.path.exists(path)
+
+
+def test_audio_file_is_removed_when_transcription_fails(service, monkeypatch):
+    fake_youtube(monkeypatch, [b"abc"])
+    paths = []
+
+    async def transcribe_segmented(path, video_id):
+        paths.append(path)
+        raise RuntimeError("engine failed")
+
+    monkeypatch.setattr(service, "_transcribe_segmented", transcribe_segmented)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.transcribe_video("video"))
+    assert paths and not os.path.exists(paths[0])
+
+
+def test_oversized_download_is_aborted_and_removed(service, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_DOWNLOAD_SIZE_MB", 1)
+    fake_youtube(monkeypatch, [b"x" * 1024 * 1024, b"x"])
+    before = set(os.listdir(settings.DOWNLOAD_DIR))
+
+    with pytest.raises(ValueError, match="download limit"):
+        service._download_audio("video")
+    assert set(os.listdir(settings.DOWNLOAD_DIR)) == before
+
+
+def write_tone(path: str, seconds: float, quiet=()):
+    """Write a 16 kHz mono WAV of a 440 Hz tone with silent ``(start, end)`` stretches."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    samples = 0.5 * np.sin(2 * np.pi * 440 * t)
+    for start, end in quiet:
+        samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] = 0.0
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+
+def transcribe_generated_audio(service, monkeypatch, tmp_path, seconds, quiet=()):
+    """Run transcribe_video on a generated WAV, recording what each engine call receives."""
+    source = str(tmp_path / "source.wav")
+    write_tone(source, seconds, quiet)
+
+    def download_audio(video_id):
+        fd, path = tempfile.mkstemp(suffix=".wav", dir=settings.DOWNLOAD_DIR)
+        os.close(fd)
+        shutil.copyfile(source, path)
+        return path
+
+    received = []
+
+    async def transcribe_file(path, description):
+        seconds = sum(len(block) for block in decode_pcm(path, SAMPLE_RATE * 10)) / SAMPLE_RATE
+        received.append((path, seconds))
+        return [{"start": 1.0, "text": f"segment {len(received) - 1}"}]
+
+    monkeypatch.setattr(settings, "TRANSCRIPTION_SEGMENT_MINUTES", 10 / 60)
+    monkeypatch.setattr(settings, "TRANSCRIPTION_SPLIT_SEARCH_SECONDS", 3)
+    monkeypatch.setattr(settings, "TRANSCRIPTION_SEGMENT_CONCURRENCY", 1)
+    monkeypatch.setattr(service, "_download_audio", download_audio)
+    monkeypatch.setattr(service, "_transcribe_file", transcribe_file)
+    return asyncio.run(service.transcribe_video("video")), received
+
+
+def test_long_audio_is_split_in_pauses_and_offsets_applied(service, monkeypatch, tmp_path):
+    transcript, received = transcribe_generated_audio(
+        service, monkeypatch, tmp_path, 26, quiet=[(9.5, 10.5), (19.8, 20.8)]
+    )
+
+    assert [round(seconds) for _, seconds in received] == [10, 10, 6]
+    offsets = [segment["start"] - 1.0 for segment in transcript]
+    assert offsets[0] == 0.0
+    assert 9.5 <= offsets[1] <= 10.5
+    assert 19.8 <= offsets[2] <= 20.8
+    assert [segment["text"] for segment in transcript] == ["segment 0", "segment 1", "segment 2"]
+    assert not any(os.path.exists(path) for path, _ in received)
+
+
+def test_short_audio_is_transcribed_from_the_downloaded_file(service, monkeypatch, tmp_path):
+    transcript, received = transcribe_generated_audio(service, monkeypatch, tmp_path, 12)
+
+    [(path, seconds)] = received
+    assert os.path.dirname(path) == settings.DOWNLOAD_DIR
+    assert round(seconds) == 12
+    assert transcript == [{"start": 1.0, "text": "segment 0"}]
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("engine, token, engines", [
+    ("auto", "token", ["replicate", "local"]),
+    ("auto", None, ["local"]),
+    ("local", "token", ["local"]),
+    ("replicate", "token", ["replicate"]),
+])
+def test_engines_are_selected_from_settings(monkeypatch, engine, token, engines):
+    monkeypatch.setattr(settings, "TRANSCRIPTION_ENGINE", engine)
+    monkeypatch.setattr(settings, "REPLICATE_API_TOKEN", token)
+
+    assert TranscriptionService._select_engines() == engines
+
+
+def test_local_whisper_takes_over_when_replicate_fails(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "TRANSCRIPTION_ENGINE", "auto")
+    monkeypatch.setattr(settings, "REPLICATE_API_TOKEN", "token")
+    monkeypatch.delenv("REPLICATE_API_TOKEN", raising=False)
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"audio")
+    service = TranscriptionService()
+    calls = []
+
+    async def replicate(audio):
+        calls.append("replicate")
+        raise RuntimeError("Replicate is down")
+
+    async def local(audio_path):
+        calls.append("local")
+        return [{"start": 0.0, "text": "hello"}]
+
+    monkeypatch.setattr(service, "_get_transcription", replicate)
+    monkeypatch.setattr(service.local_engine, "transcribe", local)
+    try:
+        transcript = asyncio.run(service._transcribe_file(str(path), "video"))
+    finally:
+        service.close()
+
+    assert transcript == [{"start": 0.0, "text": "hello"}]
+    assert calls == ["replicate", "local"]
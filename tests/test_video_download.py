@@ -0,0 +1,117 @@
+# tests/test_video_download.py
+import asyncio
+import os
+import subprocess
+import threading
+from http.server import ThreadingHTTPServer
+import pytest
+from app.core.settings import settings
+from app.services.frames import keyframe_times
+from app.services.video_download import download_sections
+from app.services.youtube import YouTubeService
+from scripts.segment_download_check import RangeRequestHandler
+
+TIMESTAMPS = [3.0, 9.5, 16.0]
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    """A 20 second 320x180 MP4 with its index at the front, like YouTube's progressive formats."""
+    path = str(tmp_path_factory.mktemp("video") / "video.mp4")
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", "testsrc2=size=320x180:rate=25:duration=20",
+            "-c:v", "libx264", "-preset", "ultrafast", "-g", "50", "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart", path
+        ],
+        check=True
+    )
+    return path
+
+
+@pytest.fixture(scope="module")
+def video_url(video):
+    """Serve the video over HTTP with byte range support."""
+    def handler(*args, **kwargs):
+        return RangeRequestHandler(*args, directory=os.path.dirname(video), **kwargs)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/{os.path.basename(video)}"
+    server.shutdown()
+
+
+@pytest.fixture
+def service(monkeypatch, video):
+    monkeypatch.setattr(settings, "VIDEO_DOWNLOAD_MODE", "segments")
+    monkeypatch.setattr(settings, "SCREENSHOT_SELECTION", "interval")
+    service = YouTubeService()
+    downloads = []
+
+    async def download_video(video_id):
+        downloads.append(video_id)
+        return video
+
+    monkeypatch.setattr(service, "download_video", download_video)
+    service.full_downloads = downloads
+    yield service
+    service.close()
+
+
+def test_download_sections_cuts_each_timestamp_over_range_requests(video_url, tmp_path):
+    sections = download_sections(video_url, TIMESTAMPS + [3.4], str(tmp_path), 2.0)
+
+    assert [timestamp for timestamp, _ in sections] == TIMESTAMPS
+    for _, path in sections:
+        # Each section is cut to length and starts on a keyframe, so its first frame decodes
+        duration = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        assert 1.5 <= float(duration) <= 2.5
+        assert keyframe_times(path)[0] < 0.1
+
+
+def capture(service, video_id="video"):
+    return asyncio.run(service.capture_video_frames(video_id, TIMESTAMPS))
+
+
+def expected_frames(video_id="video"):
+    return [os.path.join(settings.SCREENSHOTS_DIR, f"{video_id}_{int(t)}.jpg") for t in TIMESTAMPS]
+
+
+def test_sections_are_used_when_every_one_downloads(service, monkeypatch, video_url):
+    download_video_segments = service.download_video_segments
+
+    async def download_local(video_id, timestamps, output_dir):
+        return await download_video_segments(video_id, timestamps, output_dir, url=video_url)
+
+    monkeypatch.setattr(service, "download_video_segments", download_local)
+
+    assert capture(service, "sections") == expected_frames("sections")
+    assert service.full_downloads == []
+
+
+def test_failed_section_download_falls_back_to_the_full_video(service, monkeypatch):
+    async def unsupported(video_id, timestamps, output_dir):
+        raise ValueError("Failed to download video sections: requested format is not available")
+
+    monkeypatch.setattr(service, "download_video_segments", unsupported)
+
+    assert capture(service, "fallback") == expected_frames("fallback")
+    assert service.full_downloads == ["fallback"]
+
+
+def test_missing_sections_are_captured_from_the_full_video(service, monkeypatch, video_url):
+    download_video_segments = service.download_video_segments
+
+    async def middle_only(video_id, timestamps, output_dir):
+        return await download_video_segments(video_id, timestamps[1:2], output_dir, url=video_url)
+
+    monkeypatch.setattr(service, "download_video_segments", middle_only)
+
+    assert capture(service, "partial") == expected_frames("partial")
+    assert service.full_downloads == ["partial"]